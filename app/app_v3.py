@@ -464,7 +464,7 @@ def api_info():
             "GET /api/system-info": "Get system information",
             "GET /api/agents": "Get information about all validation agents",
             "GET /api/test-validation": "Test the validation system",
-            "GET /api/reports/<user_id>": "Get all reports for a user (JSON)",
+            "GET /api/reports/<user_id>": "Get a page of reports for a user (JSON, ?limit=&offset=)",
             "GET /api/report/<report_id>": "Get specific report by ID (JSON)",
             "GET /api/report/<report_id>/download": "Download report as PDF",
             "GET /report/<report_id>": "Get report data for UI display (JSON)",
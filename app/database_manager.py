@@ -16,6 +16,18 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Fields needed to render a report list; keeps the heavy per-agent
+# evaluation data out of list queries
+REPORT_LIST_PROJECTION = {
+    "_id": 1,
+    "title": 1,
+    "idea_name": 1,
+    "created_at": 1,
+    "overall_score": 1,
+    "validation_outcome": 1,
+    "source_type": 1
+}
+
 
 class DatabaseManager:
     """Manages MongoDB operations for validation reports"""
@@ -649,22 +661,23 @@ class DatabaseManager:
         
         return flattened
     
-    def get_user_reports(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get all reports for a user"""
+    def get_user_reports(self, user_id: str, limit: int = 10, offset: int = 0,
+                         projection: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Get a page of reports for a user, newest first
+        
+        Args:
+            user_id: Owner of the reports
+            limit: Page size
+            offset: Number of reports to skip
+            projection: Fields to return (defaults to REPORT_LIST_PROJECTION)
+        """
         try:
             collection = self.db.validation_reports
             reports = list(collection.find(
                 {"user_id": user_id},
-                {
-                    "_id": 1,
-                    "title": 1,
-                    "idea_name": 1,
-                    "created_at": 1,
-                    "overall_score": 1,
-                    "validation_outcome": 1,
-                    "source_type": 1
-                }
-            ).sort("created_at", -1).limit(limit))
+                projection or REPORT_LIST_PROJECTION
+            ).sort("created_at", -1).skip(offset).limit(limit))
             
             # Convert ObjectId to string
             for report in reports:
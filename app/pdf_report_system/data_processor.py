@@ -3,30 +3,165 @@ Data Processor - Extracts insights from agent conversations
 Processes raw validation data into structured report data
 """
 
-from typing import Dict, List, Any
+from typing import Callable, Dict, Iterator, List, Any, Tuple
+from io import BytesIO
+from functools import lru_cache
+import json
 import logging
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 logger = logging.getLogger(__name__)
 
+# Output field -> accepted source keys (first match wins), whether it is a list field
+_FIELD_KEYS = (
+    ('explanation', ('explanation', 'Explanation'), False),
+    ('strengths', ('strengths', 'Strengths'), True),
+    ('weaknesses', ('weaknesses', 'Weaknesses'), True),
+    ('key_insights', ('key_insights', 'keyInsights', 'insights'), True),
+    ('recommendations', ('recommendations', 'Recommendations'), True),
+    ('risk_factors', ('risk_factors', 'riskFactors'), True),
+    ('assumptions', ('assumptions', 'Assumptions'), True),
+    ('agent_id', ('agent_id', 'agentId'), False),
+)
+_SCORE_KEYS = ('assigned_score', 'assignedScore', 'score')
+
+
+def _resolve_key(keys, candidates: tuple) -> str:
+    """Pick the key variant present in `keys` (defaults to the first candidate)"""
+    for key in candidates:
+        if key in keys:
+            return key
+    return candidates[0]
+
+
+@lru_cache(maxsize=64)
+def _extractor_for_keys(keys: frozenset) -> Callable:
+    """
+    Extractor with the field names resolved for one evaluation key set
+    
+    Payloads use a handful of key sets, so the naming variants are probed
+    once per key set instead of once per field and row.
+    """
+    score_key = _resolve_key(keys, _SCORE_KEYS)
+    fields = tuple((field, _resolve_key(keys, candidates), many) for field, candidates, many in _FIELD_KEYS)
+    
+    def extract(evaluation, cluster, param, sub):
+        score = evaluation.get(score_key, 0)
+        try:
+            score = float(score) if score else 0
+        except (ValueError, TypeError):
+            score = 0
+        
+        conversation = {
+            'cluster': cluster,
+            'parameter': param,
+            'sub_parameter': sub,
+            'score': score,
+        }
+        for field, key, many in fields:
+            conversation[field] = (evaluation.get(key) or []) if many else evaluation.get(key, '')
+        return conversation
+    
+    return extract
+
+
+def _get_extractor(evaluation: Dict[str, Any]) -> Callable:
+    """Return the extractor for this evaluation's key set"""
+    return _extractor_for_keys(frozenset(evaluation))
+
+
+def _normalize_text(text: Any) -> str:
+    """Normalize agent-written text for duplicate detection"""
+    return str(text).strip().lower()
+
+
+def _unique_top(items: List[Any], limit: int) -> List[Any]:
+    """Return the first `limit` items, skipping duplicate texts"""
+    seen = set()
+    result = []
+    for item in items:
+        key = _normalize_text(item)
+        if key in seen:
+            continue
+        seen.add(key)
+        result.append(item)
+        if len(result) == limit:
+            break
+    return result
+
+
+def _stream_evaluated_clusters(raw_json) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream (cluster_name, parameters) pairs out of a raw JSON validation result
+    
+    With ijson only one cluster is materialized at a time, so peak memory is
+    bounded by the largest cluster rather than the whole payload. A malformed
+    payload raises (after the clusters before the error were yielded) rather
+    than silently ending the stream early.
+    """
+    data = raw_json.encode('utf-8') if isinstance(raw_json, str) else raw_json
+    
+    try:
+        if ijson is None:
+            parsed = json.loads(data)
+            evaluated = parsed.get('evaluated_data') or parsed.get('evaluatedData') or {}
+            yield from evaluated.items()
+            return
+        
+        for prefix in ('evaluated_data', 'evaluatedData'):
+            found = False
+            for item in ijson.kvitems(BytesIO(data), prefix, use_float=True):
+                found = True
+                yield item
+            if found:
+                return
+    except Exception as e:
+        logger.error("Failed to parse raw validation result JSON: %s", e)
+        raise
+
 
 class AgentDataProcessor:
     """Process agent evaluation data into structured report format"""
     
     def __init__(self, report_data: Dict[str, Any]):
         self.report_data = report_data
+        
+        # Raw JSON payloads are stream-parsed during extraction instead of
+        # being decoded into one large dict up front
+        raw_result = report_data.get('raw_validation_result') or {}
+        self._raw_json = None
+        if isinstance(raw_result, (bytes, str)):
+            self._raw_json = raw_result
+            raw_result = {}
+        
         # Try to get evaluated_data from multiple possible locations
         self.evaluated_data = (
             report_data.get('evaluated_data') or 
-            report_data.get('raw_validation_result', {}).get('evaluated_data') or
-            report_data.get('raw_validation_result', {}).get('evaluatedData') or
+            raw_result.get('evaluated_data') or
+            raw_result.get('evaluatedData') or
             report_data.get('validation_result', {}).get('evaluated_data') or
             report_data.get('detailed_analysis', {}).get('evaluated_data') or
             {}
         )
         
-        logger.info(f"Evaluated data found: {bool(self.evaluated_data)}")
+        logger.info("Evaluated data found: %s", bool(self.evaluated_data))
+        if self.evaluated_data:
+            # Skip building the key preview when INFO logging is off
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Evaluated data keys: %s...", list(self.evaluated_data)[:5])
+        elif self._raw_json is not None:
+            logger.info("Raw validation result is JSON (%d bytes), will stream-parse", len(self._raw_json))
+    
+    def _iter_evaluated_clusters(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (cluster_name, parameters) pairs from evaluated_data"""
         if self.evaluated_data:
-            logger.info(f"Evaluated data keys: {list(self.evaluated_data.keys())[:5]}...")
+            yield from self.evaluated_data.items()
+        elif self._raw_json is not None:
+            yield from _stream_evaluated_clusters(self._raw_json)
         
     def extract_all_agent_conversations(self) -> List[Dict[str, Any]]:
         """
@@ -36,18 +171,14 @@ class AgentDataProcessor:
         """
         conversations = []
         
-        if not self.evaluated_data or not isinstance(self.evaluated_data, dict):
+        if not isinstance(self.evaluated_data, dict) or not (self.evaluated_data or self._raw_json):
             logger.warning("No evaluated_data found or invalid format")
             return conversations
         
-        # Helper to get value with multiple key options
-        def get_value(obj, *keys, default=None):
-            for key in keys:
-                if obj and key in obj:
-                    return obj[key]
-            return default
+        num_clusters = 0
         
-        for cluster_name, parameters in self.evaluated_data.items():
+        for cluster_name, parameters in self._iter_evaluated_clusters():
+            num_clusters += 1
             if not isinstance(parameters, dict):
                 continue
                 
@@ -60,29 +191,10 @@ class AgentDataProcessor:
                         continue
                     
                     # Handle both camelCase and snake_case
-                    score = get_value(evaluation, 'assigned_score', 'assignedScore', 'score', default=0)
-                    try:
-                        score = float(score) if score else 0
-                    except (ValueError, TypeError):
-                        score = 0
-                    
-                    conversation = {
-                        'cluster': cluster_name,
-                        'parameter': param_name,
-                        'sub_parameter': sub_param_name,
-                        'score': score,
-                        'explanation': get_value(evaluation, 'explanation', 'Explanation', default=''),
-                        'strengths': get_value(evaluation, 'strengths', 'Strengths', default=[]) or [],
-                        'weaknesses': get_value(evaluation, 'weaknesses', 'Weaknesses', default=[]) or [],
-                        'key_insights': get_value(evaluation, 'key_insights', 'keyInsights', 'insights', default=[]) or [],
-                        'recommendations': get_value(evaluation, 'recommendations', 'Recommendations', default=[]) or [],
-                        'risk_factors': get_value(evaluation, 'risk_factors', 'riskFactors', default=[]) or [],
-                        'assumptions': get_value(evaluation, 'assumptions', 'Assumptions', default=[]) or [],
-                        'agent_id': get_value(evaluation, 'agent_id', 'agentId', default='')
-                    }
-                    conversations.append(conversation)
+                    extract = _get_extractor(evaluation)
+                    conversations.append(extract(evaluation, cluster_name, param_name, sub_param_name))
         
-        logger.info(f"Extracted {len(conversations)} agent conversations from {len(self.evaluated_data)} clusters")
+        logger.info("Extracted %d agent conversations from %d clusters", len(conversations), num_clusters)
         return conversations
     
     def group_by_cluster(self, conversations: List[Dict]) -> Dict[str, List[Dict]]:
@@ -129,31 +241,50 @@ class AgentDataProcessor:
         return cluster_scores
     
     def extract_strengths_and_weaknesses(self, conversations: List[Dict]) -> Dict[str, List[str]]:
-        """Extract all strengths and weaknesses from agent conversations"""
+        """
+        Extract all strengths and weaknesses from agent conversations
+        Duplicate texts are collapsed, keeping the most extreme score
+        """
         all_strengths = []
         all_weaknesses = []
+        strength_index = {}  # normalized text -> position in all_strengths
+        weakness_index = {}
         
         for conv in conversations:
             # High-scoring items are strengths
             if conv['score'] >= 70:
                 for strength in conv['strengths']:
-                    all_strengths.append({
+                    item = {
                         'text': strength,
                         'cluster': conv['cluster'],
                         'parameter': conv['sub_parameter'],
                         'score': conv['score']
-                    })
+                    }
+                    key = _normalize_text(strength)
+                    idx = strength_index.get(key)
+                    if idx is None:
+                        strength_index[key] = len(all_strengths)
+                        all_strengths.append(item)
+                    elif item['score'] > all_strengths[idx]['score']:
+                        all_strengths[idx] = item
             
             # Low-scoring items are weaknesses
             if conv['score'] < 60:
                 for weakness in conv['weaknesses']:
-                    all_weaknesses.append({
+                    item = {
                         'text': weakness,
                         'cluster': conv['cluster'],
                         'parameter': conv['sub_parameter'],
                         'score': conv['score'],
                         'severity': self._get_severity(conv['score'])
-                    })
+                    }
+                    key = _normalize_text(weakness)
+                    idx = weakness_index.get(key)
+                    if idx is None:
+                        weakness_index[key] = len(all_weaknesses)
+                        all_weaknesses.append(item)
+                    elif item['score'] < all_weaknesses[idx]['score']:
+                        all_weaknesses[idx] = item
         
         return {
             'strengths': sorted(all_strengths, key=lambda x: x['score'], reverse=True),
@@ -170,20 +301,32 @@ class AgentDataProcessor:
             return 'Moderate'
     
     def extract_recommendations(self, conversations: List[Dict]) -> List[Dict[str, Any]]:
-        """Extract all recommendations from agents"""
+        """
+        Extract all recommendations from agents
+        Duplicate texts are collapsed, keeping the highest-priority occurrence
+        """
         all_recommendations = []
+        seen = {}  # normalized text -> position in all_recommendations
+        priority_order = {'High': 0, 'Medium': 1, 'Low': 2}
         
         for conv in conversations:
+            priority = 'High' if conv['score'] < 50 else 'Medium' if conv['score'] < 70 else 'Low'
             for rec in conv['recommendations']:
-                all_recommendations.append({
+                item = {
                     'text': rec,
                     'cluster': conv['cluster'],
                     'parameter': conv['sub_parameter'],
-                    'priority': 'High' if conv['score'] < 50 else 'Medium' if conv['score'] < 70 else 'Low'
-                })
+                    'priority': priority
+                }
+                key = _normalize_text(rec)
+                idx = seen.get(key)
+                if idx is None:
+                    seen[key] = len(all_recommendations)
+                    all_recommendations.append(item)
+                elif priority_order[priority] < priority_order[all_recommendations[idx]['priority']]:
+                    all_recommendations[idx] = item
         
         # Sort by priority
-        priority_order = {'High': 0, 'Medium': 1, 'Low': 2}
         all_recommendations.sort(key=lambda x: priority_order[x['priority']])
         
         return all_recommendations
@@ -218,9 +361,9 @@ class AgentDataProcessor:
             'overall_score': avg_score,
             'status': self._get_status(avg_score),
             'num_parameters': len(cluster_convs),
-            'strengths': strengths[:5],  # Top 5
-            'weaknesses': weaknesses[:5],  # Top 5
-            'key_insights': all_insights[:5],  # Top 5
+            'strengths': _unique_top(strengths, 5),  # Top 5
+            'weaknesses': _unique_top(weaknesses, 5),  # Top 5
+            'key_insights': _unique_top(all_insights, 5),  # Top 5
             'parameters': cluster_convs
         }
     
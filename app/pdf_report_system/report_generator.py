@@ -78,11 +78,9 @@ def generate_validation_report(report_data: Dict[str, Any], progress_callback=No
         return pdf_buffer
         
     except Exception as e:
-        logger.error(f"❌ Error generating PDF: {e}")
+        logger.exception("❌ Error generating PDF")
         if progress_callback:
             progress_callback(f"❌ Error: {str(e)}", 0)
-        import traceback
-        traceback.print_exc()
         return _create_error_pdf(f"Error: {str(e)}")
 
 
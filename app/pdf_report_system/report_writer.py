@@ -3,158 +3,179 @@ AI Report Writer
 Reads all agent conversations and writes a comprehensive 20-page report
 """
 
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Callable, Dict, List, Any
+from collections import defaultdict
+from dataclasses import dataclass
+from statistics import fmean
+import asyncio
+import bisect
+import copy
+import hashlib
+import io
 import json
 import logging
-from langchain_openai import ChatOpenAI
+import re
+import string
+import threading
+import time
 import os
 
-logger = logging.getLogger(__name__)
-
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 
-class AIReportWriter:
-    """
-    AI that reads agent conversations and writes comprehensive reports
-    Acts as a senior analyst synthesizing expert opinions
-    """
-    
-    def __init__(self, progress_callback=None):
-        """
-        Initialize AI Report Writer
-        
-        Args:
-            progress_callback: Optional function to call with progress updates
-                              Signature: callback(message: str, progress: float)
-        """
-        self.llm = ChatOpenAI(
-            temperature=0.3,
-            model="gpt-4.1-mini",  # Using gpt-4.1-mini for comprehensive report generation
-            max_tokens=4000,
-            timeout=120
-        )
-        self.progress_callback = progress_callback
-    
-    def _update_progress(self, message: str, progress: float):
-        """Send progress update if callback is provided"""
-        if self.progress_callback:
-            self.progress_callback(message, progress)
-    
-    def write_comprehensive_report(self, agent_conversations: List[Dict], metadata: Dict) -> Dict[str, Any]:
-        """
-        Main method: Read all agent conversations and write comprehensive 20-30 page report
-        
-        Args:
-            agent_conversations: List of all agent evaluations with their insights
-            metadata: Report metadata (title, score, etc.)
-        
-        Returns:
-            Comprehensive report with all sections: TAM/SAM/SOM, TRL, clusters, conclusion
-        """
-        total_steps = 7 + len(set(c.get('cluster', 'Unknown') for c in agent_conversations))
-        current_step = 0
-        
-        logger.info(f"AI Report Writer analyzing {len(agent_conversations)} agent conversations...")
-        self._update_progress("📊 Analyzing agent conversations...", 0)
-        
-        # Group conversations by cluster
-        clustered_data = self._group_by_cluster(agent_conversations)
-        current_step += 1
-        self._update_progress(f"📋 Grouped conversations into {len(clustered_data)} clusters", 
-                            current_step / total_steps * 100)
-        
-        # Write report for each cluster (detailed)
-        cluster_reports = {}
-        for idx, (cluster_name, conversations) in enumerate(clustered_data.items(), 1):
-            logger.info(f"Writing detailed analysis for {cluster_name}...")
-            self._update_progress(f"✍️ Writing {cluster_name} analysis ({idx}/{len(clustered_data)})...", 
-                                (current_step / total_steps) * 100)
-            cluster_reports[cluster_name] = self._write_cluster_report(
-                cluster_name, conversations, metadata
-            )
-            current_step += 1
-        
-        # Write executive summary
-        self._update_progress("📝 Writing Executive Summary...", (current_step / total_steps) * 100)
-        executive_summary = self._write_executive_summary(
-            cluster_reports, agent_conversations, metadata
-        )
-        current_step += 1
-        
-        # Write TAM/SAM/SOM analysis
-        self._update_progress("📊 Analyzing Market Size (TAM/SAM/SOM)...", (current_step / total_steps) * 100)
-        market_analysis = self._write_market_analysis(
-            agent_conversations, metadata
-        )
-        current_step += 1
-        
-        # Write TRL analysis
-        self._update_progress("🔬 Analyzing Technology Readiness (TRL)...", (current_step / total_steps) * 100)
-        trl_analysis = self._write_trl_analysis(
-            agent_conversations, metadata
-        )
-        current_step += 1
-        
-        # Write comprehensive pros and cons
-        self._update_progress("⚖️ Analyzing Pros and Cons...", (current_step / total_steps) * 100)
-        pros_cons = self._write_pros_cons_analysis(
-            agent_conversations, metadata
-        )
-        current_step += 1
-        
-        # Write detailed weaknesses analysis
-        self._update_progress("🔍 Analyzing Weaknesses...", (current_step / total_steps) * 100)
-        weaknesses_analysis = self._write_weaknesses_analysis(
-            agent_conversations, metadata
-        )
-        current_step += 1
-        
-        # Write conclusion
-        self._update_progress("📋 Writing Conclusion...", (current_step / total_steps) * 100)
-        conclusion = self._write_conclusion(
-            cluster_reports, metadata, market_analysis, trl_analysis
-        )
-        current_step += 1
-        
-        self._update_progress("✅ Report writing complete!", 100)
-        
-        return {
-            'executive_summary': executive_summary,
-            'cluster_reports': cluster_reports,
-            'market_analysis': market_analysis,
-            'trl_analysis': trl_analysis,
-            'pros_cons': pros_cons,
-            'weaknesses_analysis': weaknesses_analysis,
-            'conclusion': conclusion,
-            'metadata': metadata
-        }
-    
-    def _group_by_cluster(self, conversations: List[Dict]) -> Dict[str, List[Dict]]:
-        """Group conversations by cluster"""
-        grouped = {}
-        for conv in conversations:
-            cluster = conv.get('cluster', 'Unknown')
-            if cluster not in grouped:
-                grouped[cluster] = []
-            grouped[cluster].append(conv)
-        return grouped
-    
-    def _write_cluster_report(self, cluster_name: str, conversations: List[Dict], metadata: Dict) -> Dict[str, Any]:
-        """
-        Write comprehensive analysis for a single cluster
-        Based on reading all expert conversations
-        """
-        
-        # Prepare context for AI
-        context = self._prepare_cluster_context(cluster_name, conversations)
-        
-        prompt = f"""You are a senior business analyst writing a comprehensive validation report. You have access to detailed evaluations from {len(conversations)} expert agents who analyzed the "{metadata['title']}" startup idea.
+from .semantic_cache import SemanticCache
 
-**Your Task**: Write a detailed, professional analysis of the **{cluster_name}** category based on the expert discussions below.
+if TYPE_CHECKING:
+    from langchain_core.messages import AIMessage
 
-**Expert Agent Conversations**:
-{context}
+logger = logging.getLogger(__name__)
 
-**Write a comprehensive analysis with the following structure**:
+# Every section prompt asks for a JSON object, so the model runs in JSON
+# mode and returns it raw. Fenced output (older cache entries, models
+# without JSON mode) is still unwrapped by _parse_json.
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+
+# Output token budget per section. Latency and cost scale with output
+# length, so each call is capped at what its JSON actually needs. The
+# cluster budget is per cluster and is multiplied by the batch size; the
+# combined budget covers the summary, pros/cons and weaknesses together.
+_SECTION_MAX_TOKENS = {
+    'cluster_report': 1500,
+    'combined_analysis': 4700,
+    'market_analysis': 1800,
+    'trl_analysis': 2000,
+    'conclusion': 1200
+}
+
+# Sections whose output is close to templated run on the cheaper model;
+# everything else (clusters, market, TRL, summary) stays on the main model.
+_CHEAP_SECTIONS = frozenset({'conclusion'})
+_MAIN_MODEL = "gpt-4.1-mini"
+_CHEAP_MODEL = "gpt-4o-mini"
+
+# Investment decision bands: a score at or above _DECISION_THRESHOLDS[i]
+# (ascending) earns _DECISIONS[i + 1]; below the first threshold is a no.
+_DECISION_THRESHOLDS = (50, 65, 75)
+_DECISIONS = (
+    "NO - NOT RECOMMENDED - Fundamental issues present",
+    "MAYBE - Significant concerns to address",
+    "YES WITH CONDITIONS - Proceed with improvements",
+    "STRONG YES - Recommended for investment"
+)
+
+# Fallback sections used when the LLM call fails. They do not depend on the
+# report, so they are built once; callers get a deep copy they may mutate.
+_FALLBACK_MARKET_ANALYSIS = {
+    'tam': {
+        'definition': 'Total Addressable Market - Global market size',
+        'size': 'To be determined based on market research',
+        'growth_rate': 'N/A',
+        'assumptions': ['Market size requires detailed research', 'Growth rate depends on industry trends'],
+        'trends': ['Market trends to be analyzed']
+    },
+    'sam': {
+        'definition': 'Serviceable Available Market - Addressable market segment',
+        'size': 'To be determined',
+        'geographic_focus': 'Primary markets to be identified',
+        'accessibility_factors': ['Market accessibility requires analysis'],
+        'demographics': ['Target demographics to be defined']
+    },
+    'som': {
+        'definition': 'Serviceable Obtainable Market - Realistic market share',
+        'size': 'To be determined',
+        'market_share': 'Target market share to be calculated',
+        'competitive_landscape': ['Competitive analysis required'],
+        'capture_strategy': ['Market capture strategy to be developed']
+    },
+    'opportunity_summary': ['Market analysis requires detailed research and validation']
+}
+
+_FALLBACK_TRL_ANALYSIS = {
+    'current_trl': {
+        'level': 3,
+        'justification': ['Technology readiness requires technical assessment'],
+        'components_status': ['Component status to be evaluated']
+    },
+    'timeline': {
+        'trl_1_3': {
+            'timeframe': 'To be determined',
+            'milestones': ['Initial milestones to be defined']
+        },
+        'trl_4_6': {
+            'timeframe': 'To be determined',
+            'milestones': ['Development milestones to be planned']
+        },
+        'trl_7_9': {
+            'timeframe': 'To be determined',
+            'milestones': ['Market readiness milestones to be established']
+        },
+        'time_to_market': 'To be determined based on TRL progression'
+    },
+    'risks': ['Technology risks require detailed assessment'],
+    'strengths': ['Technology strengths to be identified'],
+    'recommendations': ['TRL advancement recommendations require technical review']
+}
+
+_FALLBACK_CONCLUSION = {
+    'path_forward': ["Review detailed recommendations in each category"],
+    'success_factors': ["Address identified weaknesses", "Leverage existing strengths"],
+    'risk_mitigation': ["Monitor areas scoring below 50/100"],
+    'market_assessment': ["Review market analysis section for detailed TAM/SAM/SOM"]
+}
+
+
+def _parse_json(content: str) -> Any:
+    """Parse an LLM JSON response, unwrapping a ``` code fence if present"""
+    match = _JSON_FENCE_RE.search(content)
+    return json.loads(match.group(1) if match else content)
+
+
+# Exact-match prompt cache shared by every writer in the process, opened on
+# first use. One diskcache.Cache per writer would leave a SQLite connection
+# open for each report generated.
+_prompt_cache = None
+_prompt_cache_lock = threading.Lock()
+
+
+def _get_prompt_cache():
+    """The shared prompt cache in REPORT_CACHE_DIR, or None if that is unset or diskcache is missing"""
+    global _prompt_cache
+    cache_dir = os.getenv('REPORT_CACHE_DIR')
+    if not cache_dir or diskcache is None:
+        return None
+    with _prompt_cache_lock:
+        if _prompt_cache is None:
+            try:
+                _prompt_cache = diskcache.Cache(cache_dir)
+            except Exception as e:
+                logger.warning(f"⚠️ Prompt cache disabled: {e}")
+                return None
+        return _prompt_cache
+
+
+def _is_cluster_report(report: Any) -> bool:
+    """Whether a cluster analysis from the LLM has the structure the report needs"""
+    return isinstance(report, dict) and isinstance(report.get('parameters'), list)
+
+
+# Sections written by the combined analysis call
+_COMBINED_SECTIONS = ('executive_summary', 'pros_cons', 'weaknesses_analysis')
+
+
+# Prompts put the static instructions and JSON schema first and the
+# per-report data last, so the provider's automatic prefix caching
+# can reuse the shared part across calls and reports. They are compiled
+# into string.Template objects once at import time; each call only
+# substitutes the per-report fields.
+
+_CLUSTER_PROMPT_PREFIX = """You are a senior business analyst writing a comprehensive validation report. You have access to detailed evaluations from expert agents who analyzed a startup idea.
+
+**Your Task**: For EACH category (cluster) listed at the end of this prompt, write a detailed, professional analysis based on the expert agent conversations provided for that category.
+
+**For each category, write a comprehensive analysis with the following structure**:
 
 1. **Overview** (2-3 bullet points summarizing the cluster)
 2. **Detailed Parameter Analysis** (for EACH parameter, write):
@@ -168,169 +189,35 @@ class AIReportWriter:
 
 **Important Guidelines**:
 - Use ONLY bullet points, NO long paragraphs
-- Base everything on the expert conversations provided
+- Base everything on the expert conversations provided for that category
 - Include specific scores mentioned by experts
 - Highlight both positive and negative aspects
 - Be objective and analytical
 - Each bullet point should be ONE clear statement
 - Use professional business language
 
-Return ONLY a JSON object with this structure:
-{{
-  "overview": ["bullet point 1", "bullet point 2", "bullet point 3"],
-  "parameters": [
-    {{
-      "name": "parameter name",
-      "score": 75.0,
-      "findings": ["finding 1", "finding 2"],
-      "strengths": ["strength 1", "strength 2"],
-      "weaknesses": ["weakness 1", "weakness 2"],
-      "recommendations": ["recommendation 1", "recommendation 2"]
-    }}
-  ],
-  "cluster_summary": ["summary point 1", "summary point 2", "summary point 3"]
-}}"""
-
-        try:
-            response = self.llm.invoke(prompt)
-            content = response.content.strip()
-            
-            # Extract JSON from response
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
-            
-            report = json.loads(content)
-            
-            # Calculate cluster score
-            scores = [p['score'] for p in report['parameters'] if 'score' in p]
-            avg_score = sum(scores) / len(scores) if scores else 0
-            report['cluster_score'] = avg_score
-            report['cluster_name'] = cluster_name
-            
-            logger.info(f"✅ Completed {cluster_name} analysis: {len(report['parameters'])} parameters")
-            return report
-            
-        except Exception as e:
-            logger.error(f"Error writing cluster report: {e}")
-            # Fallback: return structured data from conversations
-            return self._create_fallback_cluster_report(cluster_name, conversations)
-    
-    def _prepare_cluster_context(self, cluster_name: str, conversations: List[Dict]) -> str:
-        """Prepare formatted context from agent conversations"""
-        context_parts = []
-        
-        for i, conv in enumerate(conversations, 1):
-            context_parts.append(f"\n--- Expert {i}: {conv.get('sub_parameter', 'Unknown')} Specialist ---")
-            context_parts.append(f"Score: {conv.get('score', 0):.1f}/100")
-            context_parts.append(f"Assessment: {conv.get('explanation', 'No explanation provided')}")
-            
-            if conv.get('strengths'):
-                context_parts.append("Strengths:")
-                for s in conv['strengths']:
-                    context_parts.append(f"  • {s}")
-            
-            if conv.get('weaknesses'):
-                context_parts.append("Weaknesses:")
-                for w in conv['weaknesses']:
-                    context_parts.append(f"  • {w}")
-            
-            if conv.get('key_insights'):
-                context_parts.append("Key Insights:")
-                for insight in conv['key_insights']:
-                    context_parts.append(f"  • {insight}")
-            
-            if conv.get('recommendations'):
-                context_parts.append("Recommendations:")
-                for rec in conv['recommendations']:
-                    context_parts.append(f"  • {rec}")
-        
-        return "\n".join(context_parts)
-    
-    def _write_executive_summary(self, cluster_reports: Dict, conversations: List[Dict], metadata: Dict) -> Dict[str, Any]:
-        """Write executive summary based on all cluster reports"""
-        
-        # Collect all scores
-        all_scores = [conv['score'] for conv in conversations]
-        avg_score = sum(all_scores) / len(all_scores) if all_scores else 0
-        
-        # Identify top strengths and weaknesses
-        strengths = []
-        weaknesses = []
-        
-        for conv in conversations:
-            if conv['score'] >= 75:
-                for s in conv.get('strengths', []):
-                    strengths.append({'text': s, 'score': conv['score'], 'area': conv['sub_parameter']})
-            if conv['score'] < 55:
-                for w in conv.get('weaknesses', []):
-                    weaknesses.append({'text': w, 'score': conv['score'], 'area': conv['sub_parameter']})
-        
-        # Sort by score
-        strengths.sort(key=lambda x: x['score'], reverse=True)
-        weaknesses.sort(key=lambda x: x['score'])
-        
-        prompt = f"""You are writing the Executive Summary for a startup validation report for "{metadata['title']}".
-
-**Overall Score**: {avg_score:.1f}/100
-**Validation Outcome**: {metadata['validation_outcome']}
-
-**Top 10 Strengths** (from expert agents):
-{self._format_items_for_prompt(strengths[:10])}
-
-**Top 10 Critical Weaknesses** (from expert agents):
-{self._format_items_for_prompt(weaknesses[:10])}
-
-**Cluster Performance**:
-{self._format_cluster_scores(cluster_reports)}
-
-**Write an Executive Summary with**:
-1. **Key Findings** (5-7 bullet points summarizing overall assessment)
-2. **Major Strengths** (5-6 bullet points from the strengths above)
-3. **Critical Concerns** (5-6 bullet points from the weaknesses above)
-4. **Strategic Recommendations** (5-6 bullet points for immediate actions)
-
-Use ONLY bullet points. Be concise and impactful.
-
-Return JSON:
-{{
-  "key_findings": ["finding 1", "finding 2", ...],
-  "major_strengths": ["strength 1", "strength 2", ...],
-  "critical_concerns": ["concern 1", "concern 2", ...],
-  "strategic_recommendations": ["recommendation 1", "recommendation 2", ...]
-}}"""
+"""
 
-        try:
-            response = self.llm.invoke(prompt)
-            content = response.content.strip()
-            
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
-            
-            summary = json.loads(content)
-            summary['overall_score'] = avg_score
-            summary['outcome'] = metadata['validation_outcome']
-            
-            return summary
-            
-        except Exception as e:
-            logger.error(f"Error writing executive summary: {e}")
-            return self._create_fallback_summary(strengths, weaknesses, avg_score, metadata)
-    
-    def _write_market_analysis(self, conversations: List[Dict], metadata: Dict) -> Dict[str, Any]:
-        """Write comprehensive TAM/SAM/SOM analysis"""
-        
-        # Extract market-related conversations
-        market_conversations = [c for c in conversations if 'market' in c.get('cluster', '').lower() or 
-                              'market' in c.get('sub_parameter', '').lower()]
-        
-        prompt = f"""You are a market analyst writing a comprehensive market size analysis for "{metadata['title']}".
+_CLUSTER_SCHEMA_JSON = """Return ONLY a JSON object keyed by the exact cluster name (as written after "### CLUSTER:"), where each value has this structure:
+{
+  "<cluster name>": {
+    "overview": ["bullet point 1", "bullet point 2", "bullet point 3"],
+    "parameters": [
+      {
+        "name": "parameter name",
+        "score": 75.0,
+        "findings": ["finding 1", "finding 2"],
+        "strengths": ["strength 1", "strength 2"],
+        "weaknesses": ["weakness 1", "weakness 2"],
+        "recommendations": ["recommendation 1", "recommendation 2"]
+      }
+    ],
+    "cluster_summary": ["summary point 1", "summary point 2", "summary point 3"]
+  }
+}
+"""
 
-**Expert Evaluations**:
-{self._prepare_cluster_context('Market Analysis', market_conversations if market_conversations else conversations[:10])}
+_MARKET_PROMPT_PREFIX = """You are a market analyst writing a comprehensive market size analysis for a startup idea. The expert evaluations are provided at the end of this prompt.
 
 **Write a detailed market analysis with**:
 
@@ -361,61 +248,36 @@ Return JSON:
 - Be realistic and data-driven
 - All numbers should be justified
 
-Return JSON:
-{{
-  "tam": {{
+"""
+
+_MARKET_SCHEMA_JSON = """Return JSON:
+{
+  "tam": {
     "definition": "Brief definition",
     "size": "Estimated size with unit",
     "growth_rate": "Growth percentage",
     "assumptions": ["assumption 1", "assumption 2", ...],
     "trends": ["trend 1", "trend 2", ...]
-  }},
-  "sam": {{
+  },
+  "sam": {
     "definition": "Brief definition",
     "size": "Estimated size with unit",
     "geographic_focus": "Primary markets",
     "accessibility_factors": ["factor 1", "factor 2", ...],
     "demographics": ["demographic 1", "demographic 2", ...]
-  }},
-  "som": {{
+  },
+  "som": {
     "definition": "Brief definition",
     "size": "Estimated size with unit",
     "market_share": "Target market share %",
     "competitive_landscape": ["consideration 1", "consideration 2", ...],
     "capture_strategy": ["strategy 1", "strategy 2", ...]
-  }},
+  },
   "opportunity_summary": ["summary point 1", "summary point 2", ...]
-}}"""
-
-        try:
-            response = self.llm.invoke(prompt)
-            content = response.content.strip()
-            
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
-            
-            analysis = json.loads(content)
-            logger.info("✅ Market analysis (TAM/SAM/SOM) completed")
-            return analysis
-            
-        except Exception as e:
-            logger.error(f"Error writing market analysis: {e}")
-            return self._create_fallback_market_analysis(metadata)
-    
-    def _write_trl_analysis(self, conversations: List[Dict], metadata: Dict) -> Dict[str, Any]:
-        """Write Technology Readiness Level (TRL) analysis with timeline"""
-        
-        # Extract technology/execution related conversations
-        tech_conversations = [c for c in conversations if 'execution' in c.get('cluster', '').lower() or 
-                            'technology' in c.get('sub_parameter', '').lower() or
-                            'technical' in c.get('sub_parameter', '').lower()]
-        
-        prompt = f"""You are a technology analyst writing a TRL (Technology Readiness Level) analysis for "{metadata['title']}".
+}
+"""
 
-**Expert Evaluations on Technology & Execution**:
-{self._prepare_cluster_context('Technology Analysis', tech_conversations if tech_conversations else conversations[:10])}
+_TRL_PROMPT_PREFIX = """You are a technology analyst writing a TRL (Technology Readiness Level) analysis for a startup idea. The expert evaluations on technology & execution are provided at the end of this prompt.
 
 **TRL Levels (1-9)**:
 - TRL 1: Basic principles observed
@@ -453,94 +315,45 @@ Return JSON:
 - Be realistic about timelines
 - Include Indian market technology context
 
-Return JSON:
-{{
-  "current_trl": {{
+"""
+
+_TRL_SCHEMA_JSON = """Return JSON:
+{
+  "current_trl": {
     "level": 5,
     "justification": ["justification 1", "justification 2", ...],
     "components_status": ["component 1 status", "component 2 status", ...]
-  }},
-  "timeline": {{
-    "trl_1_3": {{
+  },
+  "timeline": {
+    "trl_1_3": {
       "timeframe": "X months",
       "milestones": ["milestone 1", "milestone 2", ...]
-    }},
-    "trl_4_6": {{
+    },
+    "trl_4_6": {
       "timeframe": "X months",
       "milestones": ["milestone 1", "milestone 2", ...]
-    }},
-    "trl_7_9": {{
+    },
+    "trl_7_9": {
       "timeframe": "X months",
       "milestones": ["milestone 1", "milestone 2", ...]
-    }},
+    },
     "time_to_market": "Estimated time"
-  }},
+  },
   "risks": ["risk 1", "risk 2", ...],
   "strengths": ["strength 1", "strength 2", ...],
   "recommendations": ["recommendation 1", "recommendation 2", ...]
-}}"""
-
-        try:
-            response = self.llm.invoke(prompt)
-            content = response.content.strip()
-            
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
-            
-            analysis = json.loads(content)
-            logger.info("✅ TRL analysis completed")
-            return analysis
-            
-        except Exception as e:
-            logger.error(f"Error writing TRL analysis: {e}")
-            return self._create_fallback_trl_analysis(metadata)
-    
-    def _write_pros_cons_analysis(self, conversations: List[Dict], metadata: Dict) -> Dict[str, Any]:
-        """Write comprehensive pros and cons analysis"""
-        
-        # Collect all pros (strengths) and cons (weaknesses)
-        all_pros = []
-        all_cons = []
-        
-        for conv in conversations:
-            score = conv.get('score', 0)
-            area = conv.get('sub_parameter', 'Unknown')
-            
-            # Pros from high-scoring areas
-            if score >= 70:
-                for strength in conv.get('strengths', []):
-                    all_pros.append({'text': strength, 'score': score, 'area': area})
-                if conv.get('key_insights'):
-                    for insight in conv['key_insights']:
-                        if 'strong' in insight.lower() or 'positive' in insight.lower():
-                            all_pros.append({'text': insight, 'score': score, 'area': area})
-            
-            # Cons from low-scoring areas
-            if score < 60:
-                for weakness in conv.get('weaknesses', []):
-                    all_cons.append({'text': weakness, 'score': score, 'area': area})
-                if conv.get('risk_factors'):
-                    for risk in conv['risk_factors']:
-                        all_cons.append({'text': risk, 'score': score, 'area': area})
-        
-        # Sort by score
-        all_pros.sort(key=lambda x: x['score'], reverse=True)
-        all_cons.sort(key=lambda x: x['score'])
-        
-        prompt = f"""You are an analyst synthesizing pros and cons for "{metadata['title']}".
-
-**Overall Score**: {metadata['overall_score']:.1f}/100
-
-**Top 15 Strengths** (from expert evaluations):
-{self._format_items_for_prompt(all_pros[:15])}
+}
+"""
 
-**Top 15 Weaknesses** (from expert evaluations):
-{self._format_items_for_prompt(all_cons[:15])}
+_COMBINED_PROMPT_PREFIX = """You are a senior analyst writing three sections of a startup validation report in one pass: the Executive Summary, the Pros & Cons analysis and the Weaknesses analysis. The overall score, expert strengths, weaknesses, risk factors and cluster performance are provided ONCE at the end of this prompt; use them for all three sections.
 
-**Write a comprehensive pros and cons analysis**:
+**1. Executive Summary** ("executive_summary"):
+1. **Key Findings** (5-7 bullet points summarizing overall assessment)
+2. **Major Strengths** (5-6 bullet points from the strengths provided)
+3. **Critical Concerns** (5-6 bullet points from the weaknesses provided)
+4. **Strategic Recommendations** (5-6 bullet points for immediate actions)
 
+**2. Pros and Cons** ("pros_cons"):
 1. **Major Advantages** (8-10 bullet points covering):
    - Market opportunities
    - Technology strengths
@@ -557,69 +370,7 @@ Return JSON:
 
 3. **Balanced Assessment** (4-5 bullet points weighing pros vs cons)
 
-**Important**:
-- Use ONLY bullet points
-- Be specific and actionable
-- Base on expert evaluations
-- Include Indian market context
-
-Return JSON:
-{{
-  "advantages": ["advantage 1", "advantage 2", ...],
-  "disadvantages": ["disadvantage 1", "disadvantage 2", ...],
-  "balanced_assessment": ["assessment point 1", "assessment point 2", ...]
-}}"""
-
-        try:
-            response = self.llm.invoke(prompt)
-            content = response.content.strip()
-            
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
-            
-            analysis = json.loads(content)
-            logger.info("✅ Pros and cons analysis completed")
-            return analysis
-            
-        except Exception as e:
-            logger.error(f"Error writing pros/cons analysis: {e}")
-            return self._create_fallback_pros_cons(all_pros, all_cons)
-    
-    def _write_weaknesses_analysis(self, conversations: List[Dict], metadata: Dict) -> Dict[str, Any]:
-        """Write detailed weaknesses analysis with severity and recommendations"""
-        
-        # Collect all weaknesses
-        all_weaknesses = []
-        for conv in conversations:
-            score = conv.get('score', 0)
-            area = conv.get('sub_parameter', 'Unknown')
-            cluster = conv.get('cluster', 'Unknown')
-            
-            if score < 60:
-                for weakness in conv.get('weaknesses', []):
-                    severity = "Critical" if score < 40 else "High" if score < 50 else "Moderate"
-                    all_weaknesses.append({
-                        'text': weakness,
-                        'score': score,
-                        'area': area,
-                        'cluster': cluster,
-                        'severity': severity
-                    })
-        
-        # Sort by severity and score
-        all_weaknesses.sort(key=lambda x: (x['score'], x['severity'] == 'Critical', x['severity'] == 'High'))
-        
-        prompt = f"""You are an analyst writing a detailed weaknesses analysis for "{metadata['title']}".
-
-**Overall Score**: {metadata['overall_score']:.1f}/100
-
-**All Identified Weaknesses** (from expert evaluations):
-{self._format_weaknesses_for_prompt(all_weaknesses)}
-
-**Write a comprehensive weaknesses analysis**:
-
+**3. Weaknesses Analysis** ("weaknesses_analysis"):
 1. **Critical Weaknesses** (Score < 40/100):
    - List all critical weaknesses (4-6 bullet points)
    - Impact assessment for each
@@ -641,75 +392,46 @@ Return JSON:
 
 **Important**:
 - Use ONLY bullet points
-- Be specific about each weakness
-- Include actionable remediation steps
-- Prioritize by severity
-
-Return JSON:
-{{
-  "critical": [
-    {{"weakness": "weakness text", "impact": "impact description", "action": "action required"}},
-    ...
-  ],
-  "high_priority": [
-    {{"weakness": "weakness text", "impact": "impact description", "action": "action required"}},
-    ...
-  ],
-  "moderate": [
-    {{"weakness": "weakness text", "impact": "impact description", "action": "action required"}},
-    ...
-  ],
-  "patterns": ["pattern 1", "pattern 2", ...],
-  "remediation_strategy": ["strategy 1", "strategy 2", ...]
-}}"""
+- Be concise, specific and actionable
+- Base everything on the expert evaluations
+- Include Indian market context
+- Prioritize weaknesses by severity
 
-        try:
-            response = self.llm.invoke(prompt)
-            content = response.content.strip()
-            
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
-            
-            analysis = json.loads(content)
-            logger.info("✅ Weaknesses analysis completed")
-            return analysis
-            
-        except Exception as e:
-            logger.error(f"Error writing weaknesses analysis: {e}")
-            return self._create_fallback_weaknesses(all_weaknesses)
-    
-    def _write_conclusion(self, cluster_reports: Dict, metadata: Dict, market_analysis: Dict = None, trl_analysis: Dict = None) -> Dict[str, Any]:
-        """Write final conclusion and verdict with market and TRL context"""
-        
-        score = metadata['overall_score']
-        
-        market_context = ""
-        if market_analysis:
-            market_context = f"""
-**Market Analysis Summary**:
-- TAM: {market_analysis.get('tam', {}).get('size', 'N/A')}
-- SAM: {market_analysis.get('sam', {}).get('size', 'N/A')}
-- SOM: {market_analysis.get('som', {}).get('size', 'N/A')}
 """
-        
-        trl_context = ""
-        if trl_analysis:
-            trl_context = f"""
-**Technology Readiness**:
-- Current TRL: {trl_analysis.get('current_trl', {}).get('level', 'N/A')}
-- Time to Market: {trl_analysis.get('timeline', {}).get('time_to_market', 'N/A')}
-"""
-        
-        prompt = f"""Write a comprehensive conclusion for a startup validation report for "{metadata['title']}".
 
-**Overall Score**: {score:.1f}/100
+_COMBINED_SCHEMA_JSON = """Return JSON:
+{
+  "executive_summary": {
+    "key_findings": ["finding 1", "finding 2", ...],
+    "major_strengths": ["strength 1", "strength 2", ...],
+    "critical_concerns": ["concern 1", "concern 2", ...],
+    "strategic_recommendations": ["recommendation 1", "recommendation 2", ...]
+  },
+  "pros_cons": {
+    "advantages": ["advantage 1", "advantage 2", ...],
+    "disadvantages": ["disadvantage 1", "disadvantage 2", ...],
+    "balanced_assessment": ["assessment point 1", "assessment point 2", ...]
+  },
+  "weaknesses_analysis": {
+    "critical": [
+      {"weakness": "weakness text", "impact": "impact description", "action": "action required"},
+      ...
+    ],
+    "high_priority": [
+      {"weakness": "weakness text", "impact": "impact description", "action": "action required"},
+      ...
+    ],
+    "moderate": [
+      {"weakness": "weakness text", "impact": "impact description", "action": "action required"},
+      ...
+    ],
+    "patterns": ["pattern 1", "pattern 2", ...],
+    "remediation_strategy": ["strategy 1", "strategy 2", ...]
+  }
+}
+"""
 
-**Cluster Summary**:
-{self._format_cluster_scores(cluster_reports)}
-{market_context}
-{trl_context}
+_CONCLUSION_PROMPT_PREFIX = """Write a comprehensive conclusion for a startup validation report. The overall score, cluster summary, market analysis and technology readiness are provided at the end of this prompt.
 
 **Write**:
 1. **Final Verdict** (3-4 bullet points on investment recommendation considering market size and technology readiness)
@@ -720,25 +442,865 @@ Return JSON:
 
 Use bullet points only. Be decisive and actionable. Integrate market and technology insights.
 
-Return JSON:
-{{
+"""
+
+_CONCLUSION_SCHEMA_JSON = """Return JSON:
+{
   "final_verdict": ["verdict point 1", "verdict point 2", ...],
   "path_forward": ["next step 1", "next step 2", ...],
   "success_factors": ["factor 1", "factor 2", ...],
   "risk_mitigation": ["mitigation 1", "mitigation 2", ...],
   "market_assessment": ["assessment 1", "assessment 2", ...]
-}}"""
+}
+"""
+
+_CLUSTER_PROMPT_TMPL = string.Template(_CLUSTER_PROMPT_PREFIX + _CLUSTER_SCHEMA_JSON + """
+**Startup Idea**: "$title"
+
+**Expert Agent Conversations by Category**:
+
+$contexts""")
+
+_MARKET_PROMPT_TMPL = string.Template(_MARKET_PROMPT_PREFIX + _MARKET_SCHEMA_JSON + """
+**Startup Idea**: "$title"
+
+**Expert Evaluations**:
+$context""")
+
+_TRL_PROMPT_TMPL = string.Template(_TRL_PROMPT_PREFIX + _TRL_SCHEMA_JSON + """
+**Startup Idea**: "$title"
+
+**Expert Evaluations on Technology & Execution**:
+$context""")
+
+_COMBINED_PROMPT_TMPL = string.Template(_COMBINED_PROMPT_PREFIX + _COMBINED_SCHEMA_JSON + """
+**Startup Idea**: "$title"
+**Overall Score**: $score/100
+**Validation Outcome**: $outcome
+
+**Top 15 Strengths** (from expert evaluations):
+$strengths
+
+**All Identified Weaknesses** (from expert evaluations):
+$weaknesses
+
+**Top Risk Factors** (from low-scoring areas):
+$risks
+
+**Cluster Performance**:
+$cluster_scores""")
+
+_CONCLUSION_PROMPT_TMPL = string.Template(_CONCLUSION_PROMPT_PREFIX + _CONCLUSION_SCHEMA_JSON + """
+**Startup Idea**: "$title"
+**Overall Score**: $score/100
+
+**Cluster Summary**:
+$cluster_scores
+$market_context
+$trl_context""")
+
+# Static (report-independent) head of each section prompt
+_STATIC_PROMPT_PARTS = {
+    'cluster_report': _CLUSTER_PROMPT_PREFIX + _CLUSTER_SCHEMA_JSON,
+    'market_analysis': _MARKET_PROMPT_PREFIX + _MARKET_SCHEMA_JSON,
+    'trl_analysis': _TRL_PROMPT_PREFIX + _TRL_SCHEMA_JSON,
+    'combined_analysis': _COMBINED_PROMPT_PREFIX + _COMBINED_SCHEMA_JSON,
+    'conclusion': _CONCLUSION_PROMPT_PREFIX + _CONCLUSION_SCHEMA_JSON
+}
+
+
+def _prompt_report_data(prompt: str, section: str) -> str:
+    """The per-report part of a section prompt (everything after its static head)"""
+    static = _STATIC_PROMPT_PARTS.get(section, '')
+    return prompt[len(static):] if prompt.startswith(static) else prompt
 
+
+_CONCLUSION_MARKET_TMPL = string.Template("""
+**Market Analysis Summary**:
+- TAM: $tam
+- SAM: $sam
+- SOM: $som
+""")
+
+_CONCLUSION_TRL_TMPL = string.Template("""
+**Technology Readiness**:
+- Current TRL: $trl
+- Time to Market: $time_to_market
+""")
+
+
+@dataclass(slots=True)
+class AgentConv:
+    """Normalized view of one agent conversation for the aggregation pass"""
+    score: float
+    area: str
+    cluster: str
+    strengths: List[str]
+    weaknesses: List[str]
+    key_insights: List[str]
+    risk_factors: List[str]
+    
+    @classmethod
+    def from_dict(cls, conv: Dict) -> 'AgentConv':
+        return cls(
+            score=conv.get('score', 0),
+            area=conv.get('sub_parameter', 'Unknown'),
+            cluster=conv.get('cluster', 'Unknown'),
+            strengths=conv.get('strengths') or [],
+            weaknesses=conv.get('weaknesses') or [],
+            key_insights=conv.get('key_insights') or [],
+            risk_factors=conv.get('risk_factors') or []
+        )
+
+
+class _BatchCollector:
+    """
+    Collects LLM requests issued concurrently and submits them as one
+    OpenAI Batch API job
+    
+    Requests arriving within `window` seconds of each other are grouped;
+    stragglers simply start another batch. A batch input file may only
+    target one model, so each flush submits one job per model.
+    """
+    
+    def __init__(self, submit_fn: Callable[[Dict[str, Dict]], Dict[str, str]], window: float = 1.0):
+        self._submit_fn = submit_fn
+        self._window = window
+        self._pending = {}
+        self._counter = 0
+        self._timer = None
+        # The event loop only keeps weak references to tasks
+        self._tasks = set()
+    
+    def submit(self, section: str, body: Dict) -> asyncio.Future:
+        """Queue a chat completion request body, resolved with the response text"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._counter += 1
+        self._pending[f"{section}-{self._counter}"] = (body, future)
+        
+        if self._timer:
+            self._timer.cancel()
+        self._timer = loop.call_later(self._window, self._flush)
+        return future
+    
+    def _flush(self):
+        pending, self._pending = self._pending, {}
+        self._timer = None
+        by_model = defaultdict(dict)
+        for custom_id, entry in pending.items():
+            by_model[entry[0].get('model')][custom_id] = entry
+        for group in by_model.values():
+            task = asyncio.ensure_future(self._run(group))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, pending: Dict[str, tuple]):
         try:
-            response = self.llm.invoke(prompt)
-            content = response.content.strip()
+            results = await asyncio.to_thread(
+                self._submit_fn, {custom_id: body for custom_id, (body, _) in pending.items()}
+            )
+        except Exception as e:
+            for _, future in pending.values():
+                future.set_exception(e)
+            return
+        
+        for custom_id, (_, future) in pending.items():
+            if custom_id in results:
+                future.set_result(results[custom_id])
+            else:
+                future.set_exception(RuntimeError(f"No batch result for {custom_id}"))
+
+
+class AIReportWriter:
+    """
+    AI that reads agent conversations and writes comprehensive reports
+    Acts as a senior analyst synthesizing expert opinions
+    """
+    
+    def __init__(self, progress_callback=None, progress_callback_async=None,
+                 max_concurrency: int = None, max_retries: int = 3,
+                 use_batch_api: bool = False, batch_poll_interval: float = 30.0,
+                 batch_timeout: float = None,
+                 semantic_cache: SemanticCache = None, use_prompt_cache: bool = True,
+                 cluster_batch_size: int = 4):
+        """
+        Initialize AI Report Writer
+        
+        Args:
+            progress_callback: Optional function to call with progress updates
+                              Signature: callback(message: str, progress: float)
+            progress_callback_async: Optional coroutine function receiving streamed tokens
+                              Signature: await callback(section: str, token: str, progress: float)
+            max_concurrency: Max parallel LLM calls (default: OPENAI_MAX_CONCURRENCY env or 10)
+            max_retries: Attempts per LLM call before falling back to non-AI output
+            use_batch_api: Submit section prompts through the OpenAI Batch API
+                          (~50% cheaper, but results may take minutes to hours).
+                          A report runs 2-3 batch jobs one after another (sections,
+                          then combined analysis and conclusion), so this is for
+                          offline generation only, never inside a request handler
+            batch_poll_interval: Seconds between batch status checks
+            batch_timeout: Seconds to wait for one batch job before cancelling it and
+                          falling back (default: REPORT_BATCH_TIMEOUT env or 3600)
+            semantic_cache: Optional embedding cache for section responses
+                           (default: built from REPORT_SEMANTIC_CACHE_DIR env if set)
+            use_prompt_cache: Reuse responses for byte-identical prompts from the
+                             shared disk cache (only if REPORT_CACHE_DIR is set, needs diskcache)
+            cluster_batch_size: Number of clusters analyzed per LLM prompt
+        """
+        # LLM clients are built on first use (see the llm / llm_cheap properties)
+        # so importing this module does not pull in langchain_openai
+        self._llm = None
+        self._llm_cheap = None
+        self._llm_config = {
+            'temperature': 0.3,
+            'timeout': 120,
+            # Retries are handled by _invoke_with_retry; the client's own would multiply them
+            'max_retries': 0,
+            'streaming': progress_callback_async is not None,
+            'model_kwargs': {"response_format": _JSON_RESPONSE_FORMAT}
+        }
+        self.progress_callback = progress_callback
+        self.progress_callback_async = progress_callback_async
+        self.max_concurrency = max_concurrency or int(os.getenv('OPENAI_MAX_CONCURRENCY', '10'))
+        self.max_retries = max_retries
+        self.use_batch_api = use_batch_api
+        self.cluster_batch_size = cluster_batch_size
+        self.batch_poll_interval = batch_poll_interval
+        self.batch_timeout = batch_timeout or float(os.getenv('REPORT_BATCH_TIMEOUT', '3600'))
+        self._semaphore = None
+        self._batch = None
+        
+        self.semantic_cache = semantic_cache
+        cache_dir = os.getenv('REPORT_SEMANTIC_CACHE_DIR')
+        if self.semantic_cache is None and cache_dir:
+            try:
+                self.semantic_cache = SemanticCache(cache_dir)
+            except Exception as e:
+                logger.warning(f"⚠️ Semantic cache disabled: {e}")
+        
+        self._disk_cache = _get_prompt_cache() if use_prompt_cache else None
+        self._current_step = 0
+        self._total_steps = 1
+    
+    @property
+    def llm(self):
+        """Main model, used for reasoning-heavy sections"""
+        if self._llm is None:
+            from langchain_openai import ChatOpenAI
+            self._llm = ChatOpenAI(model=_MAIN_MODEL, **self._llm_config)
+        return self._llm
+    
+    @llm.setter
+    def llm(self, value):
+        self._llm = value
+    
+    @property
+    def llm_cheap(self):
+        """Cheaper model for near-templated sections (see _CHEAP_SECTIONS)"""
+        if self._llm_cheap is None:
+            from langchain_openai import ChatOpenAI
+            self._llm_cheap = ChatOpenAI(model=_CHEAP_MODEL, **self._llm_config)
+        return self._llm_cheap
+    
+    @llm_cheap.setter
+    def llm_cheap(self, value):
+        self._llm_cheap = value
+    
+    def _update_progress(self, message: str, progress: float):
+        """Send progress update if callback is provided"""
+        if self.progress_callback:
+            self.progress_callback(message, progress)
+    
+    async def _tracked(self, coro, message: str, steps: int = 1):
+        """Await a section writer and report progress once it completes"""
+        result = await coro
+        self._current_step += steps
+        if self.progress_callback:
+            self._update_progress(message, self._current_step / self._total_steps * 100)
+        return result
+    
+    async def _ainvoke(self, prompt: str, section: str, max_tokens: int = None):
+        """Invoke the LLM under the concurrency limit (or through the Batch API)"""
+        max_tokens = max_tokens or _SECTION_MAX_TOKENS[section]
+        llm = self._llm_for(section)
+        if self.use_batch_api:
+            content = await self._batch.submit(section, {
+                "model": llm.model_name,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": llm.temperature,
+                "max_tokens": max_tokens,
+                "response_format": _JSON_RESPONSE_FORMAT
+            })
+            from langchain_core.messages import AIMessage
+            return AIMessage(content=content)
+        
+        async with self._semaphore:
+            return await self._invoke_with_retry(llm.bind(max_tokens=max_tokens), prompt, section)
+    
+    async def _invoke_with_retry(self, llm, prompt: str, section: str) -> "AIMessage":
+        """
+        Invoke the LLM, retrying rate limits, timeouts and 5xx errors with exponential backoff
+        
+        Up to `max_retries` attempts; the last error is re-raised so the
+        caller can fall back.
+        """
+        # Errors worth retrying; anything else goes straight to the section
+        # fallback. APIConnectionError covers APITimeoutError.
+        from openai import APIConnectionError, InternalServerError, RateLimitError
+        from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+        
+        def log_retry(state):
+            logger.warning(f"⚠️ {section} LLM call failed (attempt {state.attempt_number}/{self.max_retries}): "
+                           f"{state.outcome.exception()} - retrying in {state.next_action.sleep:.0f}s")
+        
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(self.max_retries),
+            wait=wait_exponential(multiplier=2, min=4, max=60),
+            retry=retry_if_exception_type((RateLimitError, APIConnectionError, InternalServerError)),
+            before_sleep=log_retry,
+            reraise=True
+        ):
+            with attempt:
+                if self.progress_callback_async:
+                    return await self._astream(llm, prompt, section)
+                return await llm.ainvoke(prompt)
+    
+    async def _astream(self, llm, prompt: str, section: str) -> "AIMessage":
+        """Stream the response, forwarding each token to the async progress callback"""
+        chunks = []
+        async for chunk in llm.astream(prompt):
+            chunks.append(chunk.content)
+            await self.progress_callback_async(
+                section, chunk.content, self._current_step / self._total_steps * 100
+            )
+        from langchain_core.messages import AIMessage
+        return AIMessage(content="".join(chunks))
+    
+    def _llm_for(self, section: str):
+        """Model tier for a section: cheap model for _CHEAP_SECTIONS, main model otherwise"""
+        return self.llm_cheap if section in _CHEAP_SECTIONS else self.llm
+    
+    def _prompt_cache_key(self, prompt: str, section: str, max_tokens: int) -> str:
+        """Exact-match cache key for a prompt under the section's model settings"""
+        model = _CHEAP_MODEL if section in _CHEAP_SECTIONS else _MAIN_MODEL
+        return hashlib.blake2b(
+            f"{prompt}{model}{self._llm_config['temperature']}{max_tokens}".encode('utf-8')
+        ).hexdigest()
+    
+    async def _cached_invoke(self, prompt: str, section: str, ttl: int = 86400, max_tokens: int = None,
+                             is_complete: Callable[[Dict], bool] = None, scope: str = None) -> Any:
+        """
+        Get the parsed JSON response for a prompt from cache if possible, otherwise from the LLM
+        
+        Lookup order: exact-match disk cache, semantic cache, LLM.
+        `max_tokens` defaults to the section budget in _SECTION_MAX_TOKENS;
+        `scope` (the idea title) limits semantic matches to the same idea.
+        A fresh response is only cached once it parses as a JSON object (and
+        passes `is_complete`, if given), so a truncated or partial answer that
+        the caller patches with fallbacks is never replayed. Raises if the
+        response does not parse.
+        """
+        max_tokens = max_tokens or _SECTION_MAX_TOKENS[section]
+        key = None
+        if self._disk_cache is not None:
+            key = self._prompt_cache_key(prompt, section, max_tokens)
+            cached = self._disk_cache.get(key)
+            if cached is not None:
+                try:
+                    parsed = _parse_json(cached)
+                    logger.info(f"⚡ Prompt cache hit for {section}")
+                    return parsed
+                except ValueError:
+                    self._disk_cache.delete(key)
+        
+        # Only the per-report part of the prompt is embedded: the long static
+        # instructions and schema would otherwise dominate the similarity
+        report_text = _prompt_report_data(prompt, section)
+        embedding = None
+        if self.semantic_cache:
+            try:
+                cached, embedding = await self.semantic_cache.lookup(report_text, section, scope=scope)
+                if cached is not None:
+                    parsed = _parse_json(cached)
+                    logger.info(f"⚡ Semantic cache hit for {section}")
+                    return parsed
+            except Exception as e:
+                logger.warning(f"⚠️ Semantic cache lookup failed for {section}: {e}")
+        
+        response = await self._ainvoke(prompt, section, max_tokens)
+        parsed = _parse_json(response.content)
+        
+        if isinstance(parsed, dict) and (is_complete is None or is_complete(parsed)):
+            if key is not None:
+                self._disk_cache.set(key, response.content, expire=ttl)
+            if embedding is not None:
+                try:
+                    await self.semantic_cache.store(report_text, section, embedding, response.content, ttl, scope=scope)
+                except Exception as e:
+                    logger.warning(f"⚠️ Semantic cache store failed for {section}: {e}")
+        return parsed
+    
+    def _run_openai_batch(self, requests: Dict[str, Dict]) -> Dict[str, str]:
+        """
+        Submit chat completion requests as an OpenAI batch and wait for it
+        
+        A batch still running after `batch_timeout` seconds is cancelled and
+        raises TimeoutError, so the sections waiting on it fall back.
+        
+        Returns:
+            Mapping of custom_id -> response text for successful requests
+        """
+        from openai import OpenAI
+        
+        client = OpenAI()
+        lines = [
+            json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+            for custom_id, body in requests.items()
+        ]
+        batch_file = client.files.create(
+            file=("report_sections.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"📦 Submitted OpenAI batch {batch.id} with {len(requests)} section prompts")
+        
+        deadline = time.monotonic() + self.batch_timeout
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.monotonic() >= deadline:
+                client.batches.cancel(batch.id)
+                raise TimeoutError(f"OpenAI batch {batch.id} still {batch.status} after {self.batch_timeout:.0f}s")
+            time.sleep(self.batch_poll_interval)
+            batch = client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"OpenAI batch {batch.id} ended with status {batch.status}")
+        
+        results = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            item = json.loads(line)
+            response = item.get('response') or {}
+            if response.get('status_code') == 200:
+                results[item['custom_id']] = response['body']['choices'][0]['message']['content']
+        
+        logger.info(f"✅ OpenAI batch {batch.id} completed: {len(results)}/{len(requests)} succeeded")
+        return results
+    
+    def write_comprehensive_report(self, agent_conversations: List[Dict], metadata: Dict) -> Dict[str, Any]:
+        """
+        Synchronous wrapper around write_comprehensive_report_async
+        (compatible with Flask request handlers and worker threads)
+        """
+        return asyncio.run(self.write_comprehensive_report_async(agent_conversations, metadata))
+    
+    async def write_comprehensive_report_async(self, agent_conversations: List[Dict], metadata: Dict) -> Dict[str, Any]:
+        """
+        Main method: Read all agent conversations and write comprehensive 20-30 page report
+        
+        Independent sections (cluster reports, market, TRL) are written
+        concurrently; the combined executive summary / pros-cons / weaknesses
+        call and the conclusion follow once the sections they depend on are done.
+        
+        Args:
+            agent_conversations: List of all agent evaluations with their insights
+            metadata: Report metadata (title, score, etc.)
+        
+        Returns:
+            Comprehensive report with all sections: TAM/SAM/SOM, TRL, clusters, conclusion
+        """
+        self._current_step = 0
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.use_batch_api:
+            self._batch = _BatchCollector(self._run_openai_batch)
+        
+        logger.info(f"AI Report Writer analyzing {len(agent_conversations)} agent conversations...")
+        self._update_progress("📊 Analyzing agent conversations...", 0)
+        
+        # Group conversations by cluster
+        clustered_data = self._group_by_cluster(agent_conversations)
+        self._total_steps = 5 + len(clustered_data)
+        stats = self._aggregate_conversations([AgentConv.from_dict(c) for c in agent_conversations])
+        self._current_step += 1
+        if self.progress_callback:
+            self._update_progress(f"📋 Grouped conversations into {len(clustered_data)} clusters", 
+                                self._current_step / self._total_steps * 100)
+        
+        # Fan out everything that only depends on the raw conversations
+        if self.progress_callback:
+            self._update_progress(f"✍️ Writing {len(clustered_data)} cluster analyses and report sections...", 
+                                self._current_step / self._total_steps * 100)
+        cluster_task = asyncio.ensure_future(self._write_cluster_reports_batched(
+            clustered_data, metadata, batch_size=self.cluster_batch_size
+        ))
+        market_task = asyncio.ensure_future(self._tracked(
+            self._write_market_analysis(agent_conversations, metadata),
+            "📊 Market Size (TAM/SAM/SOM) analyzed"
+        ))
+        trl_task = asyncio.ensure_future(self._tracked(
+            self._write_trl_analysis(agent_conversations, metadata),
+            "🔬 Technology Readiness (TRL) analyzed"
+        ))
+        
+        # Executive summary (written together with pros/cons and weaknesses) needs the cluster scores
+        cluster_reports = await cluster_task
+        combined_task = asyncio.ensure_future(self._tracked(
+            self._write_combined_analysis(cluster_reports, stats, metadata),
+            "📝 Executive Summary, Pros/Cons and Weaknesses written"
+        ))
+        
+        # Conclusion needs market and TRL results
+        market_analysis, trl_analysis = await asyncio.gather(market_task, trl_task)
+        conclusion = await self._tracked(
+            self._write_conclusion(cluster_reports, metadata, market_analysis, trl_analysis),
+            "📋 Conclusion written"
+        )
+        
+        combined = await combined_task
+        
+        self._update_progress("✅ Report writing complete!", 100)
+        
+        return {
+            'executive_summary': combined['executive_summary'],
+            'cluster_reports': cluster_reports,
+            'market_analysis': market_analysis,
+            'trl_analysis': trl_analysis,
+            'pros_cons': combined['pros_cons'],
+            'weaknesses_analysis': combined['weaknesses_analysis'],
+            'conclusion': conclusion,
+            'metadata': metadata
+        }
+    
+    async def _write_cluster_reports_batched(self, clustered_data: Dict[str, List[Dict]], metadata: Dict,
+                                             batch_size: int = 4) -> Dict[str, Any]:
+        """
+        Write all cluster reports, `batch_size` clusters per LLM prompt
+        
+        Batches run concurrently; the shared instruction preamble is paid
+        once per batch instead of once per cluster. Cluster order is preserved.
+        """
+        items = list(clustered_data.items())
+        batches = [dict(items[i:i + batch_size]) for i in range(0, len(items), batch_size)]
+        results = await asyncio.gather(*(
+            self._tracked(
+                self._write_cluster_batch(batch, metadata),
+                f"✍️ {', '.join(batch)} analysis written",
+                steps=len(batch)
+            )
+            for batch in batches
+        ))
+        
+        reports = {}
+        for batch_reports in results:
+            reports.update(batch_reports)
+        return {cluster_name: reports[cluster_name] for cluster_name in clustered_data}
+    
+    def _group_by_cluster(self, conversations: List[Dict]) -> Dict[str, List[Dict]]:
+        """Group conversations by cluster"""
+        grouped = defaultdict(list)
+        for conv in conversations:
+            grouped[conv.get('cluster', 'Unknown')].append(conv)
+        return dict(grouped)
+    
+    async def _write_cluster_batch(self, batch: Dict[str, List[Dict]], metadata: Dict) -> Dict[str, Any]:
+        """
+        Write comprehensive analyses for a batch of clusters in one LLM call
+        Based on reading all expert conversations
+        """
+        
+        # Prepare context for AI, one labelled block per cluster
+        contexts = "\n\n".join(
+            f"### CLUSTER: {cluster_name}\n"
+            f"({len(conversations)} expert agents)\n"
+            f"{self._prepare_cluster_context(cluster_name, conversations)}"
+            for cluster_name, conversations in batch.items()
+        )
+        
+        prompt = _CLUSTER_PROMPT_TMPL.substitute(title=metadata['title'], contexts=contexts)
+        
+        try:
+            written = await self._cached_invoke(
+                prompt, section='cluster_report', ttl=86400, scope=metadata['title'],
+                max_tokens=_SECTION_MAX_TOKENS['cluster_report'] * len(batch),
+                is_complete=lambda written: all(_is_cluster_report(written.get(name)) for name in batch)
+            )
+            if not isinstance(written, dict):
+                raise ValueError(f"expected a JSON object keyed by cluster, got {type(written).__name__}")
+        except Exception as e:
+            logger.error(f"Error writing cluster reports for {', '.join(batch)}: {e}")
+            written = {}
+        
+        reports = {}
+        for cluster_name, conversations in batch.items():
+            report = written.get(cluster_name)
+            if not _is_cluster_report(report):
+                if written:
+                    logger.error(f"Error writing cluster report: no valid analysis for {cluster_name}")
+                # Fallback: return structured data from conversations
+                reports[cluster_name] = self._create_fallback_cluster_report(cluster_name, conversations)
+                continue
+            
+            # Keep only well-formed parameter entries, then calculate cluster score
+            report['parameters'] = [p for p in report['parameters'] if isinstance(p, dict)]
+            total, n = 0.0, 0
+            for p in report['parameters']:
+                if isinstance(p.get('score'), (int, float)):
+                    total += p['score']
+                    n += 1
+            report['cluster_score'] = total / n if n else 0
+            report['cluster_name'] = cluster_name
+            
+            logger.info(f"✅ Completed {cluster_name} analysis: {len(report['parameters'])} parameters")
+            reports[cluster_name] = report
+        
+        return reports
+    
+    def _prepare_cluster_context(self, cluster_name: str, conversations: List[Dict]) -> str:
+        """Prepare formatted context from agent conversations"""
+        buf = io.StringIO()
+        write = buf.write
+        
+        for i, conv in enumerate(conversations, 1):
+            write(f"\n--- Expert {i}: {conv.get('sub_parameter', 'Unknown')} Specialist ---\n")
+            write(f"Score: {conv.get('score', 0):.1f}/100\n")
+            write(f"Assessment: {conv.get('explanation', 'No explanation provided')}\n")
+            
+            if conv.get('strengths'):
+                write("Strengths:\n")
+                buf.writelines(f"  • {s}\n" for s in conv['strengths'])
+            
+            if conv.get('weaknesses'):
+                write("Weaknesses:\n")
+                buf.writelines(f"  • {w}\n" for w in conv['weaknesses'])
             
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
+            if conv.get('key_insights'):
+                write("Key Insights:\n")
+                buf.writelines(f"  • {insight}\n" for insight in conv['key_insights'])
             
-            conclusion = json.loads(content)
+            if conv.get('recommendations'):
+                write("Recommendations:\n")
+                buf.writelines(f"  • {rec}\n" for rec in conv['recommendations'])
+        
+        # Every line is newline-terminated; drop the last one to match "\n".join()
+        return buf.getvalue()[:-1]
+    
+    def _aggregate_conversations(self, conversations: List[AgentConv]) -> Dict[str, Any]:
+        """
+        Bucket strengths, weaknesses and risks from all conversations in one pass
+        
+        Score thresholds are applied as numpy masks so only the conversations
+        that contribute to a bucket are visited, and those conversations are
+        visited in a stable argsort order by score. Every list therefore comes
+        out already sorted (pros best-first, everything else worst-first)
+        without any Python-level key callbacks, and is shared by the summary,
+        pros/cons and weaknesses sections and their fallbacks. Weaknesses are
+        also split into critical/high_priority/moderate as they are built.
+        """
+        import numpy as np
+        
+        scores = np.fromiter((c.score for c in conversations), dtype=float, count=len(conversations))
+        high_strengths = []
+        low_weaknesses = []
+        all_pros = []
+        all_weaknesses = []
+        all_risks = []
+        critical, high_priority, moderate = [], [], []
+        
+        # Pros from high-scoring areas, best score first
+        high = np.flatnonzero(scores >= 70)
+        for i in high[np.argsort(-scores[high], kind='stable')]:
+            conv = conversations[i]
+            for strength in conv.strengths:
+                item = {'text': strength, 'score': conv.score, 'area': conv.area}
+                all_pros.append(item)
+                if conv.score >= 75:
+                    high_strengths.append(item)
+            for insight in conv.key_insights:
+                if 'strong' in insight.lower() or 'positive' in insight.lower():
+                    all_pros.append({'text': insight, 'score': conv.score, 'area': conv.area})
+        
+        # Weaknesses and risks from low-scoring areas, worst score first
+        low = np.flatnonzero(scores < 60)
+        for i in low[np.argsort(scores[low], kind='stable')]:
+            conv = conversations[i]
+            score = conv.score
+            if score < 40:
+                severity, bucket = "Critical", critical
+            elif score < 50:
+                severity, bucket = "High", high_priority
+            else:
+                severity, bucket = "Moderate", moderate
+            for weakness in conv.weaknesses:
+                item = {
+                    'text': weakness,
+                    'score': score,
+                    'area': conv.area,
+                    'cluster': conv.cluster,
+                    'severity': severity
+                }
+                all_weaknesses.append(item)
+                bucket.append(item)
+                if score < 55:
+                    low_weaknesses.append(item)
+            for risk in conv.risk_factors:
+                all_risks.append({'text': risk, 'score': score, 'area': conv.area})
+        
+        # Cons interleave weaknesses and risks by score (weaknesses first on ties)
+        cons = all_weaknesses + all_risks
+        cons_scores = np.fromiter((x['score'] for x in cons), dtype=float, count=len(cons))
+        all_cons = [cons[i] for i in np.argsort(cons_scores, kind='stable')]
+        
+        return {
+            'avg_score': float(scores.mean()) if len(scores) else 0,
+            'high_strengths': high_strengths,
+            'low_weaknesses': low_weaknesses,
+            'all_pros': all_pros,
+            'all_weaknesses': all_weaknesses,
+            'all_risks': all_risks,
+            'all_cons': all_cons,
+            'critical': critical,
+            'high_priority': high_priority,
+            'moderate': moderate
+        }
+    
+    async def _write_combined_analysis(self, cluster_reports: Dict, stats: Dict[str, Any], metadata: Dict) -> Dict[str, Any]:
+        """
+        Write executive summary, pros/cons and weaknesses analyses with one LLM call
+        
+        The three sections draw on the same scored strengths and weaknesses
+        (see _aggregate_conversations), so that context is sent once. A
+        section missing from the response falls back on its own.
+        
+        Returns:
+            {'executive_summary': ..., 'pros_cons': ..., 'weaknesses_analysis': ...}
+        """
+        avg_score = stats['avg_score']
+        
+        prompt = _COMBINED_PROMPT_TMPL.substitute(
+            title=metadata['title'],
+            score=f"{avg_score:.1f}",
+            outcome=metadata['validation_outcome'],
+            strengths=self._format_items_for_prompt(stats['all_pros'][:15]),
+            weaknesses=self._format_weaknesses_for_prompt(stats['all_weaknesses']),
+            risks=self._format_items_for_prompt(stats['all_risks'][:10]),
+            cluster_scores=self._format_cluster_scores(cluster_reports)
+        )
+        
+        try:
+            analysis = await self._cached_invoke(
+                prompt, section='combined_analysis', ttl=86400, scope=metadata['title'],
+                is_complete=lambda analysis: all(isinstance(analysis.get(name), dict) for name in _COMBINED_SECTIONS)
+            )
+            if not isinstance(analysis, dict):
+                raise ValueError(f"expected a JSON object, got {type(analysis).__name__}")
+        except Exception as e:
+            logger.error(f"Error writing combined analysis: {e}")
+            analysis = {}
+        
+        summary = analysis.get('executive_summary')
+        if isinstance(summary, dict):
+            summary['overall_score'] = avg_score
+            summary['outcome'] = metadata['validation_outcome']
+        else:
+            summary = self._create_fallback_summary(stats['high_strengths'], stats['low_weaknesses'], avg_score, metadata)
+        
+        pros_cons = analysis.get('pros_cons')
+        if not isinstance(pros_cons, dict):
+            pros_cons = self._create_fallback_pros_cons(stats['all_pros'], stats['all_cons'])
+        
+        weaknesses_analysis = analysis.get('weaknesses_analysis')
+        if not isinstance(weaknesses_analysis, dict):
+            weaknesses_analysis = self._create_fallback_weaknesses(
+                stats['critical'], stats['high_priority'], stats['moderate']
+            )
+        
+        logger.info("✅ Executive summary, pros/cons and weaknesses analyses completed")
+        return {
+            'executive_summary': summary,
+            'pros_cons': pros_cons,
+            'weaknesses_analysis': weaknesses_analysis
+        }
+    
+    async def _write_market_analysis(self, conversations: List[Dict], metadata: Dict) -> Dict[str, Any]:
+        """Write comprehensive TAM/SAM/SOM analysis"""
+        
+        # Extract market-related conversations
+        market_conversations = [c for c in conversations if 'market' in c.get('cluster', '').lower() or 
+                              'market' in c.get('sub_parameter', '').lower()]
+        
+        prompt = _MARKET_PROMPT_TMPL.substitute(
+            title=metadata['title'],
+            context=self._prepare_cluster_context('Market Analysis', market_conversations if market_conversations else conversations[:10])
+        )
+        
+        try:
+            analysis = await self._cached_invoke(prompt, section='market_analysis', ttl=86400, scope=metadata['title'])
+            if not isinstance(analysis, dict):
+                raise ValueError("expected a JSON object")
+            logger.info("✅ Market analysis (TAM/SAM/SOM) completed")
+            return analysis
+            
+        except Exception as e:
+            logger.error(f"Error writing market analysis: {e}")
+            return self._create_fallback_market_analysis(metadata)
+    
+    async def _write_trl_analysis(self, conversations: List[Dict], metadata: Dict) -> Dict[str, Any]:
+        """Write Technology Readiness Level (TRL) analysis with timeline"""
+        
+        # Extract technology/execution related conversations
+        tech_conversations = [c for c in conversations if 'execution' in c.get('cluster', '').lower() or 
+                            'technology' in c.get('sub_parameter', '').lower() or
+                            'technical' in c.get('sub_parameter', '').lower()]
+        
+        prompt = _TRL_PROMPT_TMPL.substitute(
+            title=metadata['title'],
+            context=self._prepare_cluster_context('Technology Analysis', tech_conversations if tech_conversations else conversations[:10])
+        )
+        
+        try:
+            analysis = await self._cached_invoke(prompt, section='trl_analysis', ttl=86400, scope=metadata['title'])
+            if not isinstance(analysis, dict):
+                raise ValueError("expected a JSON object")
+            logger.info("✅ TRL analysis completed")
+            return analysis
+            
+        except Exception as e:
+            logger.error(f"Error writing TRL analysis: {e}")
+            return self._create_fallback_trl_analysis(metadata)
+    
+    async def _write_conclusion(self, cluster_reports: Dict, metadata: Dict, market_analysis: Dict = None, trl_analysis: Dict = None) -> Dict[str, Any]:
+        """Write final conclusion and verdict with market and TRL context"""
+        
+        score = metadata['overall_score']
+        
+        market_context = ""
+        if market_analysis:
+            market_context = _CONCLUSION_MARKET_TMPL.substitute(
+                tam=market_analysis.get('tam', {}).get('size', 'N/A'),
+                sam=market_analysis.get('sam', {}).get('size', 'N/A'),
+                som=market_analysis.get('som', {}).get('size', 'N/A')
+            )
+        
+        trl_context = ""
+        if trl_analysis:
+            trl_context = _CONCLUSION_TRL_TMPL.substitute(
+                trl=trl_analysis.get('current_trl', {}).get('level', 'N/A'),
+                time_to_market=trl_analysis.get('timeline', {}).get('time_to_market', 'N/A')
+            )
+        
+        prompt = _CONCLUSION_PROMPT_TMPL.substitute(
+            title=metadata['title'],
+            score=f"{score:.1f}",
+            cluster_scores=self._format_cluster_scores(cluster_reports),
+            market_context=market_context,
+            trl_context=trl_context
+        )
+        
+        try:
+            conclusion = await self._cached_invoke(prompt, section='conclusion', ttl=86400, scope=metadata['title'])
             conclusion['investment_decision'] = self._get_investment_decision(score)
             
             return conclusion
@@ -749,45 +1311,35 @@ Return JSON:
     
     def _format_items_for_prompt(self, items: List[Dict]) -> str:
         """Format items for LLM prompt"""
-        lines = []
-        for item in items:
-            lines.append(f"• [{item['score']:.0f}/100] {item['area']}: {item['text']}")
-        return "\n".join(lines) if lines else "None identified"
+        return "\n".join(
+            f"• [{item['score']:.0f}/100] {item['area']}: {item['text']}" for item in items
+        ) or "None identified"
     
     def _format_cluster_scores(self, cluster_reports: Dict) -> str:
         """Format cluster scores for prompt"""
-        lines = []
-        for name, report in cluster_reports.items():
-            score = report.get('cluster_score', 0)
-            lines.append(f"• {name}: {score:.1f}/100")
-        return "\n".join(lines) if lines else "No cluster data"
+        return "\n".join(
+            f"• {name}: {report.get('cluster_score', 0):.1f}/100" for name, report in cluster_reports.items()
+        ) or "No cluster data"
     
     def _get_investment_decision(self, score: float) -> str:
         """Get investment recommendation - strict evaluation based on expert consensus"""
-        if score >= 75:
-            return "STRONG YES - Recommended for investment"
-        elif score >= 65:
-            return "YES WITH CONDITIONS - Proceed with improvements"
-        elif score >= 50:
-            return "MAYBE - Significant concerns to address"
-        else:
-            return "NO - NOT RECOMMENDED - Fundamental issues present"
+        return _DECISIONS[bisect.bisect_right(_DECISION_THRESHOLDS, score)]
     
     def _create_fallback_cluster_report(self, cluster_name: str, conversations: List[Dict]) -> Dict:
         """Create fallback report if AI writing fails"""
-        parameters = []
-        for conv in conversations:
-            parameters.append({
+        parameters = [
+            {
                 'name': conv.get('sub_parameter', 'Unknown'),
                 'score': conv.get('score', 0),
                 'findings': [conv.get('explanation', '')],
                 'strengths': conv.get('strengths', []),
                 'weaknesses': conv.get('weaknesses', []),
                 'recommendations': conv.get('recommendations', [])
-            })
+            }
+            for conv in conversations
+        ]
         
-        scores = [p['score'] for p in parameters]
-        avg_score = sum(scores) / len(scores) if scores else 0
+        avg_score = fmean(p['score'] for p in parameters) if parameters else 0
         
         return {
             'cluster_name': cluster_name,
@@ -810,76 +1362,28 @@ Return JSON:
     
     def _create_fallback_conclusion(self, score: float, metadata: Dict) -> Dict:
         """Create fallback conclusion"""
-        return {
+        conclusion = {
             'investment_decision': self._get_investment_decision(score),
-            'final_verdict': [f"Validation score: {score:.1f}/100"],
-            'path_forward': ["Review detailed recommendations in each category"],
-            'success_factors': ["Address identified weaknesses", "Leverage existing strengths"],
-            'risk_mitigation': ["Monitor areas scoring below 50/100"],
-            'market_assessment': ["Review market analysis section for detailed TAM/SAM/SOM"]
+            'final_verdict': [f"Validation score: {score:.1f}/100"]
         }
+        conclusion.update(copy.deepcopy(_FALLBACK_CONCLUSION))
+        return conclusion
     
     def _format_weaknesses_for_prompt(self, weaknesses: List[Dict]) -> str:
         """Format weaknesses for LLM prompt"""
-        lines = []
-        for w in weaknesses:
-            lines.append(f"• [{w['severity']}] [{w['score']:.0f}/100] {w['area']} ({w['cluster']}): {w['text']}")
-        return "\n".join(lines) if lines else "None identified"
+        if not weaknesses:
+            return "None identified"
+        return "\n".join(
+            f"• [{w['severity']}] [{w['score']:.0f}/100] {w['area']} ({w['cluster']}): {w['text']}" for w in weaknesses
+        )
     
     def _create_fallback_market_analysis(self, metadata: Dict) -> Dict:
         """Create fallback market analysis"""
-        return {
-            'tam': {
-                'definition': 'Total Addressable Market - Global market size',
-                'size': 'To be determined based on market research',
-                'growth_rate': 'N/A',
-                'assumptions': ['Market size requires detailed research', 'Growth rate depends on industry trends'],
-                'trends': ['Market trends to be analyzed']
-            },
-            'sam': {
-                'definition': 'Serviceable Available Market - Addressable market segment',
-                'size': 'To be determined',
-                'geographic_focus': 'Primary markets to be identified',
-                'accessibility_factors': ['Market accessibility requires analysis'],
-                'demographics': ['Target demographics to be defined']
-            },
-            'som': {
-                'definition': 'Serviceable Obtainable Market - Realistic market share',
-                'size': 'To be determined',
-                'market_share': 'Target market share to be calculated',
-                'competitive_landscape': ['Competitive analysis required'],
-                'capture_strategy': ['Market capture strategy to be developed']
-            },
-            'opportunity_summary': ['Market analysis requires detailed research and validation']
-        }
+        return copy.deepcopy(_FALLBACK_MARKET_ANALYSIS)
     
     def _create_fallback_trl_analysis(self, metadata: Dict) -> Dict:
         """Create fallback TRL analysis"""
-        return {
-            'current_trl': {
-                'level': 3,
-                'justification': ['Technology readiness requires technical assessment'],
-                'components_status': ['Component status to be evaluated']
-            },
-            'timeline': {
-                'trl_1_3': {
-                    'timeframe': 'To be determined',
-                    'milestones': ['Initial milestones to be defined']
-                },
-                'trl_4_6': {
-                    'timeframe': 'To be determined',
-                    'milestones': ['Development milestones to be planned']
-                },
-                'trl_7_9': {
-                    'timeframe': 'To be determined',
-                    'milestones': ['Market readiness milestones to be established']
-                },
-                'time_to_market': 'To be determined based on TRL progression'
-            },
-            'risks': ['Technology risks require detailed assessment'],
-            'strengths': ['Technology strengths to be identified'],
-            'recommendations': ['TRL advancement recommendations require technical review']
-        }
+        return copy.deepcopy(_FALLBACK_TRL_ANALYSIS)
     
     def _create_fallback_pros_cons(self, pros: List[Dict], cons: List[Dict]) -> Dict:
         """Create fallback pros/cons analysis"""
@@ -889,12 +1393,8 @@ Return JSON:
             'balanced_assessment': ['Balanced assessment requires comprehensive review']
         }
     
-    def _create_fallback_weaknesses(self, weaknesses: List[Dict]) -> Dict:
-        """Create fallback weaknesses analysis"""
-        critical = [w for w in weaknesses if w['severity'] == 'Critical']
-        high = [w for w in weaknesses if w['severity'] == 'High']
-        moderate = [w for w in weaknesses if w['severity'] == 'Moderate']
-        
+    def _create_fallback_weaknesses(self, critical: List[Dict], high: List[Dict], moderate: List[Dict]) -> Dict:
+        """Create fallback weaknesses analysis from the severity buckets built by _aggregate_conversations"""
         return {
             'critical': [
                 {'weakness': w['text'], 'impact': f"Score: {w['score']:.1f}/100", 'action': 'Immediate attention required'}
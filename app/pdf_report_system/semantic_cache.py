@@ -0,0 +1,89 @@
+"""
+Semantic Cache - Embedding-based response cache for report section prompts
+Near-identical prompts (re-runs, small edits) are answered from the cache
+instead of paying for another LLM call
+"""
+
+from typing import List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Chroma-backed cache keyed on prompt embeddings
+    
+    Each report section gets its own collection (namespace) so an
+    executive-summary prompt can never match a TRL prompt.
+    """
+    
+    def __init__(self, persist_dir: str, threshold: float = 0.97,
+                 embedding_model: str = "text-embedding-3-small"):
+        """
+        Initialize Semantic Cache
+        
+        Args:
+            persist_dir: Directory for the Chroma database
+            threshold: Minimum cosine similarity for a cache hit
+            embedding_model: OpenAI embedding model used for prompts
+        """
+        try:
+            import chromadb
+        except ImportError:
+            raise ImportError("chromadb is required for SemanticCache. Install chromadb.")
+        
+        from langchain_openai import OpenAIEmbeddings
+        
+        self.threshold = threshold
+        self._client = chromadb.PersistentClient(path=persist_dir)
+        self._embeddings = OpenAIEmbeddings(model=embedding_model)
+        self._collections = {}
+    
+    def _collection(self, namespace: str):
+        """Get (or create) the collection for a section namespace"""
+        if namespace not in self._collections:
+            self._collections[namespace] = self._client.get_or_create_collection(
+                name=f"report_{namespace}",
+                metadata={"hnsw:space": "cosine"}
+            )
+        return self._collections[namespace]
+    
+    async def lookup(self, prompt: str, namespace: str, scope: str = None) -> Tuple[Optional[str], List[float]]:
+        """
+        Find a cached response for a semantically equivalent prompt
+        
+        Only entries stored with the same `scope` (e.g. the idea title) can match.
+        
+        Returns:
+            (cached content or None, prompt embedding for a later store())
+        """
+        embedding = await self._embeddings.aembed_query(prompt)
+        result = await asyncio.to_thread(
+            self._collection(namespace).query,
+            query_embeddings=[embedding],
+            n_results=1,
+            where={"$and": [
+                {"expires_at": {"$gt": time.time()}},
+                {"scope": {"$eq": scope or ""}}
+            ]}
+        )
+        
+        distances = result.get('distances') or [[]]
+        if distances[0] and 1 - distances[0][0] >= self.threshold:
+            return result['metadatas'][0][0]['content'], embedding
+        return None, embedding
+    
+    async def store(self, prompt: str, namespace: str, embedding: List[float], content: str,
+                    ttl: int = 86400, scope: str = None):
+        """Store a response under the prompt embedding and scope for `ttl` seconds"""
+        scope = scope or ""
+        await asyncio.to_thread(
+            self._collection(namespace).upsert,
+            ids=[hashlib.blake2b(f"{scope}\0{prompt}".encode('utf-8'), digest_size=16).hexdigest()],
+            embeddings=[embedding],
+            metadatas=[{"content": content, "expires_at": time.time() + ttl, "scope": scope}]
+        )
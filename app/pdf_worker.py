@@ -0,0 +1,78 @@
+"""
+PDF Worker Processes
+Process pools for PDF generation and the task their workers run
+
+multiprocessing re-runs the parent's __main__ script in every spawn or
+forkserver child (as __mp_main__). For a server started with
+`python app/app_v3.py` that would boot the whole Flask app, CrewAI and the
+other generators once per worker, so children are started with __main__
+hidden and only import this module (preloaded into the forkserver).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import logging
+import multiprocessing
+import sys
+import threading
+import types
+
+from pdf_report_system import generate_validation_report
+
+logger = logging.getLogger(__name__)
+
+# Modules imported once in the forkserver, so forked workers start with them loaded
+_PRELOAD = ['pdf_worker']
+
+_main_lock = threading.RLock()
+
+
+def get_mp_context():
+    """forkserver (a clean, single-threaded parent) where available, spawn otherwise"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(_PRELOAD)
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+@contextmanager
+def main_script_hidden():
+    """
+    Hide the parent's __main__ while child processes are started
+    
+    Children then skip re-running the main script. Workers are started
+    lazily by submit() and map(), so those calls go through this too.
+    """
+    with _main_lock:
+        main = sys.modules['__main__']
+        sys.modules['__main__'] = types.ModuleType('__main__')
+        try:
+            yield
+        finally:
+            sys.modules['__main__'] = main
+
+
+def create_pool(max_workers: int, **kwargs) -> ProcessPoolExecutor:
+    """ProcessPoolExecutor on the worker context (submit/map inside main_script_hidden)"""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=get_mp_context(), **kwargs)
+
+
+def create_manager():
+    """Started multiprocessing Manager on the worker context, for cross-process queues"""
+    with main_script_hidden():
+        return get_mp_context().Manager()
+
+
+def render_pdf_task(report, progress_queue) -> bytes:
+    """Worker-process entry point: generate the PDF, forwarding progress to progress_queue"""
+    def progress_callback(message: str, progress: float):
+        try:
+            progress_queue.put({
+                'message': message,
+                'progress': progress
+            })
+        except Exception as e:
+            logger.error(f"Error sending progress: {e}")
+    
+    return generate_validation_report(report, progress_callback=progress_callback).getvalue()
@@ -4,23 +4,215 @@ Returns structured JSON data - UI will handle presentation
 """
 
 import logging
-from flask import jsonify, request, send_file, Response, stream_with_context, render_template, send_from_directory
+from flask import g, jsonify, request, send_file, Response, stream_with_context, render_template, send_from_directory
 from database_manager import get_database_manager
 from pdf_report_system import generate_validation_report
 from pdf_report_system.report_writer import AIReportWriter
 from pdf_report_system.data_processor import AgentDataProcessor
-from datetime import datetime
+import pdf_worker
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import Future
+import hashlib
 import json
 import queue
 import threading
+import time
 from io import BytesIO
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Seconds between SSE keepalives while a PDF is being generated
+SSE_HEARTBEAT_INTERVAL = 15
+
+# Longest an SSE download waits for its PDF before reporting an error
+SSE_PDF_TIMEOUT = int(os.getenv('PDF_SSE_TIMEOUT', '600'))
+
+
+class _TTLCache:
+    """
+    Small thread-safe LRU cache with per-entry expiry
+    
+    Flask's threaded server handles requests concurrently, so every
+    access goes through a lock.
+    """
+    
+    def __init__(self, maxsize: int = 512, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+# Process-local cache in front of MongoDB for AI reports, so the report
+# view can poll /generate without a database round trip per request
+_ai_report_cache = _TTLCache(maxsize=512, ttl=300)
+
+# Rendered PDFs keyed by report_id -> (pdf bytes, filename). The SSE
+# /download endpoint renders the PDF and /download-pdf-file, which the
+# client calls right after, serves it from here instead of rendering again
+_pdf_cache = _TTLCache(maxsize=32, ttl=600)
+
+# Validation reports by id. Short TTL: the SSE download and the file
+# download that follows it fetch the same report seconds apart
+_report_cache = _TTLCache(maxsize=256, ttl=60)
+
+# Serialized JSON bodies for /api/report/<id>, so a large report is
+# walked by the JSON encoder once instead of on every read
+_report_json_cache = _TTLCache(maxsize=128, ttl=60)
+
+
+def _get_report_cached(db_manager, report_id: str):
+    """
+    Get a validation report by id without repeating the MongoDB lookup
+    
+    Checks the per-request cache on flask.g first, then the process-wide
+    TTL cache. Callers must treat the returned report as read-only.
+    """
+    request_cache = g.setdefault('report_cache', {})
+    report = request_cache.get(report_id)
+    if report is None:
+        report = _report_cache.get(report_id)
+        if report is None:
+            report = db_manager.get_report_by_id(report_id)
+            if report:
+                _report_cache.set(report_id, report)
+        request_cache[report_id] = report
+    return report
+
+
+def _get_ai_report_cached(db_manager, report_id: str):
+    """Get the stored AI report for report_id, from the in-process cache if possible"""
+    cached = _ai_report_cache.get(report_id)
+    if cached is None:
+        cached = db_manager.get_ai_report(report_id)
+        if cached:
+            _ai_report_cache.set(report_id, cached)
+    return cached
+
+
+def _ai_report_etag(report_id: str, generated_at) -> str:
+    """ETag for a stored AI report; changes whenever the report is regenerated"""
+    return hashlib.blake2b(f"{report_id}:{generated_at.isoformat()}".encode('utf-8'), digest_size=16).hexdigest()
+
+
+# In-flight AI report generations keyed by report_id ("singleflight"):
+# concurrent requests for the same uncached report wait for the first one
+# instead of paying for a second LLM run
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _singleflight(key: str, fn):
+    """Run fn once per key across concurrent callers; the others wait for its result"""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = _inflight[key] = Future()
+    
+    if not is_leader:
+        logger.info(f"⏳ Waiting for in-flight generation of {key}")
+        return future.result()
+    
+    try:
+        result = fn()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _sse_event(payload: dict) -> bytes:
+    """Encode one SSE data frame (orjson when available)"""
+    if orjson is not None:
+        return b"data: " + orjson.dumps(payload) + b"\n\n"
+    return f"data: {json.dumps(payload)}\n\n".encode('utf-8')
+
+
+# Spaces become underscores; characters that are invalid in filenames or
+# would break the Content-Disposition header are dropped
+_FILENAME_TRANSLATION = str.maketrans({' ': '_', **{c: None for c in '/\\:*?"<>|\r\n'}})
+
+
+@lru_cache(maxsize=1024)
+def _safe_title(title: str) -> str:
+    """Sanitized report title for use in a download filename"""
+    return title.translate(_FILENAME_TRANSLATION)
+
+
+def _pdf_filename(report) -> str:
+    """Download filename for a report's PDF, stamped with the current local time"""
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
+    return f"validation_report_{_safe_title(report.get('title', 'report'))}_{timestamp}.pdf"
+
+
+# PDF generation (LLM report writing + ReportLab rendering) runs in worker
+# processes so it does not hold the GIL of the Flask worker serving other
+# requests. The pool and its Manager are created on first use. Each worker
+# holds a full report build in memory, so keep the default small.
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', 2))
+_pdf_executor = None
+_mp_manager = None
+_pdf_executor_lock = threading.Lock()
+
+# Admission control: at most this many PDFs are built at once (SSE jobs in
+# the worker pool plus direct downloads rendered on the request thread);
+# further requests get a 503 instead of queueing behind them.
+PDF_MAX_PENDING = int(os.getenv('PDF_MAX_PENDING', PDF_WORKERS))
+_pdf_slots = threading.BoundedSemaphore(PDF_MAX_PENDING)
+
+
+def _get_pdf_executor():
+    """Process pool for PDF generation plus the manager used for cross-process progress queues"""
+    global _pdf_executor, _mp_manager
+    with _pdf_executor_lock:
+        if _pdf_executor is None:
+            _mp_manager = pdf_worker.create_manager()
+            _pdf_executor = pdf_worker.create_pool(PDF_WORKERS)
+        return _pdf_executor, _mp_manager
+
 
 def register_report_endpoints(app):
-    """Register report management endpoints with Flask app"""
+    """Register report management endpoints with Flask app (once per app)"""
+    if app.extensions.get('report_endpoints'):
+        logger.warning("Report endpoints already registered, skipping")
+        return
+    app.extensions['report_endpoints'] = True
     
     @app.route('/api/reports/<user_id>', methods=['GET'])
     def get_user_reports(user_id):
@@ -32,13 +224,16 @@ def register_report_endpoints(app):
                     "error": "Database not available"
                 }), 503
             
-            limit = request.args.get('limit', 10, type=int)
-            reports = db_manager.get_user_reports(user_id, limit)
+            limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+            offset = max(0, request.args.get('offset', 0, type=int))
+            reports = db_manager.get_user_reports(user_id, limit, offset=offset)
             
             return jsonify({
                 "user_id": user_id,
                 "reports": reports,
-                "count": len(reports)
+                "count": len(reports),
+                "offset": offset,
+                "limit": limit
             })
             
         except Exception as e:
@@ -47,25 +242,32 @@ def register_report_endpoints(app):
                 "error": "Failed to retrieve reports",
                 "details": str(e)
             }), 500
-
+    
     @app.route('/api/report/<report_id>', methods=['GET'])
     def get_report_data(report_id):
         """Get specific report data by ID (full detailed analysis)"""
         try:
+            body = _report_json_cache.get(report_id)
+            if body is not None:
+                return Response(body, mimetype='application/json')
+            
             db_manager = get_database_manager()
             if not db_manager:
                 return jsonify({
                     "error": "Database not available"
                 }), 503
             
-            report = db_manager.get_report_by_id(report_id)
+            report = _get_report_cached(db_manager, report_id)
             
             if not report:
                 return jsonify({
                     "error": "Report not found"
                 }), 404
             
-            return jsonify(report)
+            # Serialize with Flask's JSON provider so the output (e.g. datetime format) matches jsonify
+            body = jsonify(report).get_data()
+            _report_json_cache.set(report_id, body)
+            return Response(body, mimetype='application/json')
             
         except Exception as e:
             logger.error(f"Failed to get report: {e}")
@@ -73,7 +275,7 @@ def register_report_endpoints(app):
                 "error": "Failed to retrieve report",
                 "details": str(e)
             }), 500
-
+    
     @app.route('/report/<report_id>', methods=['GET'])
     def get_report_for_display(report_id):
         """
@@ -88,7 +290,7 @@ def register_report_endpoints(app):
                     "error": "Database not available"
                 }), 503
             
-            report = db_manager.get_report_by_id(report_id)
+            report = _get_report_cached(db_manager, report_id)
             
             if not report:
                 return jsonify({
@@ -121,19 +323,31 @@ def register_report_endpoints(app):
                 }), 503
             
             # Check if cached AI report exists
-            cached_report = db_manager.get_ai_report(report_id)
+            cached_report = _get_ai_report_cached(db_manager, report_id)
             if cached_report:
+                generated_at = cached_report.get("generated_at")
+                etag = _ai_report_etag(report_id, generated_at) if generated_at else None
+                
+                # Unchanged since the client's last poll: skip serializing the report
+                if etag and request.if_none_match.contains(etag):
+                    return Response(status=304, headers={'ETag': f'"{etag}"'})
+                
                 logger.info(f"✅ Returning cached AI report for {report_id}")
-                return jsonify({
+                response = jsonify({
                     "success": True,
                     "report_id": report_id,
                     "ai_report": cached_report["ai_report"],
                     "cached": True,
-                    "generated_at": cached_report["generated_at"].isoformat() if cached_report.get("generated_at") else None
+                    "generated_at": generated_at.isoformat() if generated_at else None
                 })
+                if etag:
+                    response.set_etag(etag)
+                    response.last_modified = generated_at
+                    response.headers['Cache-Control'] = 'private, max-age=60'
+                return response
             
             # No cached report - need to generate
-            report = db_manager.get_report_by_id(report_id)
+            report = _get_report_cached(db_manager, report_id)
             
             if not report:
                 return jsonify({
@@ -146,9 +360,10 @@ def register_report_endpoints(app):
             
             if not processed_data or not processed_data.get('all_conversations'):
                 # Debug: Check what data is available
+                raw = report.get('raw_validation_result') or {}
                 has_evaluated_data = bool(report.get('evaluated_data'))
-                has_raw_result = bool(report.get('raw_validation_result'))
-                has_raw_evaluated = bool(report.get('raw_validation_result', {}).get('evaluated_data'))
+                has_raw_result = bool(raw)
+                has_raw_evaluated = isinstance(raw, dict) and bool(raw.get('evaluated_data'))
                 
                 logger.warning(f"Report {report_id} - evaluated_data: {has_evaluated_data}, raw_result: {has_raw_result}, raw_evaluated: {has_raw_evaluated}")
                 
@@ -162,35 +377,47 @@ def register_report_endpoints(app):
                     }
                 }), 404
             
-            # Generate AI-written report using gpt-4.1-mini
-            logger.info(f"🔄 Generating new AI report for {report_id} using {len(processed_data['all_conversations'])} conversations")
-            
-            writer = AIReportWriter(progress_callback=None)
-            ai_report = writer.write_comprehensive_report(
-                processed_data['all_conversations'],
-                processed_data['metadata']
-            )
-            
-            # Save to MongoDB for caching
-            save_success = db_manager.save_ai_report(report_id, ai_report)
-            if save_success:
-                logger.info(f"✅ AI report generated and cached for {report_id}")
-            else:
-                logger.warning(f"⚠️ AI report generated but failed to cache for {report_id}")
+            def generate_and_save():
+                # A caller that finished just before this one became leader has already saved it
+                stored = _get_ai_report_cached(db_manager, report_id)
+                if stored:
+                    logger.info(f"✅ AI report for {report_id} was generated meanwhile")
+                    return stored["ai_report"], True, True
+                
+                # Generate AI-written report using gpt-4.1-mini
+                logger.info(f"🔄 Generating new AI report for {report_id} using {len(processed_data['all_conversations'])} conversations")
+                
+                writer = AIReportWriter(progress_callback=None)
+                ai_report = writer.write_comprehensive_report(
+                    processed_data['all_conversations'],
+                    processed_data['metadata']
+                )
+                
+                # Save to MongoDB for caching
+                save_success = db_manager.save_ai_report(report_id, ai_report)
+                _ai_report_cache.pop(report_id)
+                _pdf_cache.pop(report_id)
+                _report_cache.pop(report_id)
+                _report_json_cache.pop(report_id)
+                if save_success:
+                    logger.info(f"✅ AI report generated and cached for {report_id}")
+                else:
+                    logger.warning(f"⚠️ AI report generated but failed to cache for {report_id}")
+                return ai_report, save_success, False
+            
+            ai_report, save_success, cached = _singleflight(report_id, generate_and_save)
             
             return jsonify({
                 "success": True,
                 "report_id": report_id,
                 "ai_report": ai_report,
                 "conversations_used": len(processed_data['all_conversations']),
-                "cached": False,
+                "cached": cached,
                 "saved_to_db": save_success
             })
             
         except Exception as e:
-            logger.error(f"Failed to generate AI report: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Failed to generate AI report")
             return jsonify({
                 "error": "Failed to generate AI report",
                 "details": str(e)
@@ -209,78 +436,98 @@ def register_report_endpoints(app):
                     "error": "Database not available"
                 }), 503
             
-            report = db_manager.get_report_by_id(report_id)
+            report = _get_report_cached(db_manager, report_id)
             
             if not report:
                 return jsonify({
                     "error": "Report not found"
                 }), 404
             
-            # Create a queue for progress updates
-            progress_queue = queue.Queue()
-            pdf_result = {'buffer': None, 'error': None, 'filename': None}
-            
-            def progress_callback(message: str, progress: float):
-                """Callback to send progress updates"""
-                try:
-                    progress_queue.put({
-                        'message': message,
-                        'progress': progress
-                    })
-                except Exception as e:
-                    logger.error(f"Error sending progress: {e}")
-            
-            def generate_pdf():
-                """Generate PDF in background thread"""
+            # Create a queue for progress updates (shared with the worker process)
+            executor, manager = _get_pdf_executor()
+            progress_queue = manager.Queue()
+            done = threading.Event()
+            
+            def schedule_heartbeat():
+                """Queue a heartbeat every 15s until generation finishes"""
+                timer = threading.Timer(SSE_HEARTBEAT_INTERVAL, heartbeat)
+                timer.daemon = True
+                timer.start()
+            
+            def heartbeat():
+                if not done.is_set():
+                    progress_queue.put({'type': 'heartbeat'})
+                    schedule_heartbeat()
+            
+            def on_pdf_done(future):
+                """Runs when the worker process finishes; caches the PDF and ends the stream"""
+                done.set()
+                _pdf_slots.release()
                 try:
-                    # Generate PDF with progress callback
-                    pdf_buffer = generate_validation_report(report, progress_callback=progress_callback)
-                    
-                    # Create filename
-                    title = report.get('title', 'report').replace(' ', '_')
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    filename = f"validation_report_{title}_{timestamp}.pdf"
+                    pdf_bytes = future.result()
                     
-                    pdf_result['buffer'] = pdf_buffer
-                    pdf_result['filename'] = filename
+                    filename = _pdf_filename(report)
+                    _pdf_cache.set(report_id, (pdf_bytes, filename))
                     progress_queue.put({'type': 'complete'})
                 except Exception as e:
                     logger.error(f"Failed to generate PDF: {e}")
-                    pdf_result['error'] = str(e)
                     progress_queue.put({'type': 'error', 'error': str(e)})
             
-            # Start PDF generation in background thread
-            pdf_thread = threading.Thread(target=generate_pdf, daemon=True)
-            pdf_thread.start()
+            if not _pdf_slots.acquire(blocking=False):
+                return jsonify({
+                    "error": "PDF generation is busy, please retry shortly"
+                }), 503
+            
+            # Start PDF generation in a worker process
+            try:
+                with pdf_worker.main_script_hidden():
+                    pdf_future = executor.submit(pdf_worker.render_pdf_task, report, progress_queue)
+            except Exception:
+                _pdf_slots.release()
+                raise
+            pdf_future.add_done_callback(on_pdf_done)
+            schedule_heartbeat()
             
             def generate():
                 """Generator function for SSE streaming"""
+                deadline = time.monotonic() + SSE_PDF_TIMEOUT
                 try:
                     while True:
+                        if time.monotonic() > deadline:
+                            yield _sse_event({'message': 'Error: PDF generation timed out', 'progress': 0, 'error': True})
+                            break
+                        
+                        # Wait for the next progress update or heartbeat; a silent queue
+                        # means the worker or the manager died
                         try:
-                            # Get progress update (with timeout)
-                            item = progress_queue.get(timeout=1)
-                            
-                            if item.get('type') == 'complete':
-                                # PDF generation complete, send final message
-                                yield f"data: {json.dumps({'message': 'PDF ready!', 'progress': 100, 'complete': True})}\n\n"
-                                break
-                            elif item.get('type') == 'error':
-                                # Error occurred
-                                error_msg = item.get('error', 'Unknown error')
-                                yield f"data: {json.dumps({'message': f'Error: {error_msg}', 'progress': 0, 'error': True})}\n\n"
-                                break
-                            else:
-                                # Progress update
-                                yield f"data: {json.dumps({'message': item.get('message', ''), 'progress': item.get('progress', 0)})}\n\n"
-                                
+                            item = progress_queue.get(timeout=SSE_HEARTBEAT_INTERVAL * 2)
                         except queue.Empty:
-                            # Send keepalive
-                            yield f"data: {json.dumps({'message': 'Processing...', 'progress': -1})}\n\n"
+                            if pdf_future.done():
+                                yield _sse_event({'message': 'Error: PDF generation ended without a result',
+                                                  'progress': 0, 'error': True})
+                                break
+                            yield b": heartbeat\n\n"
+                            continue
+                        
+                        if item.get('type') == 'complete':
+                            # PDF generation complete, send final message
+                            yield _sse_event({'message': 'PDF ready!', 'progress': 100, 'complete': True})
+                            break
+                        elif item.get('type') == 'error':
+                            # Error occurred
+                            error_msg = item.get('error', 'Unknown error')
+                            yield _sse_event({'message': f'Error: {error_msg}', 'progress': 0, 'error': True})
+                            break
+                        elif item.get('type') == 'heartbeat':
+                            # SSE comment line: keeps proxies from closing the connection, ignored by EventSource
+                            yield b": heartbeat\n\n"
+                        else:
+                            # Progress update
+                            yield _sse_event({'message': item.get('message', ''), 'progress': item.get('progress', 0)})
                             
                 except Exception as e:
                     logger.error(f"Error in SSE stream: {e}")
-                    yield f"data: {json.dumps({'message': f'Error: {str(e)}', 'progress': 0, 'error': True})}\n\n"
+                    yield _sse_event({'message': f'Error: {str(e)}', 'progress': 0, 'error': True})
             
             # Return SSE response
             return Response(
@@ -306,33 +553,48 @@ def register_report_endpoints(app):
         Called after progress streaming is complete
         """
         try:
+            # Serve the PDF rendered by the preceding /download call if we have it
+            cached_pdf = _pdf_cache.get(report_id)
+            if cached_pdf:
+                pdf_bytes, filename = cached_pdf
+                logger.info(f"✅ Serving cached PDF for {report_id}")
+                return send_file(
+                    BytesIO(pdf_bytes),
+                    mimetype='application/pdf',
+                    as_attachment=True,
+                    download_name=filename
+                )
+            
             db_manager = get_database_manager()
             if not db_manager:
                 return jsonify({
                     "error": "Database not available"
                 }), 503
             
-            report = db_manager.get_report_by_id(report_id)
+            report = _get_report_cached(db_manager, report_id)
             
             if not report:
                 return jsonify({
                     "error": "Report not found"
                 }), 404
             
-            # Generate PDF (without progress for direct download)
-            pdf_buffer = generate_validation_report(report)
+            if not _pdf_slots.acquire(blocking=False):
+                return jsonify({
+                    "error": "PDF generation is busy, please retry shortly"
+                }), 503
             
-            # Create filename
-            title = report.get('title', 'report').replace(' ', '_')
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"validation_report_{title}_{timestamp}.pdf"
+            try:
+                # Generate PDF (without progress for direct download)
+                pdf_buffer = generate_validation_report(report)
+            finally:
+                _pdf_slots.release()
             
             # Send PDF file
             return send_file(
                 pdf_buffer,
                 mimetype='application/pdf',
                 as_attachment=True,
-                download_name=filename
+                download_name=_pdf_filename(report)
             )
             
         except Exception as e:
@@ -1,41 +1,202 @@
 """
 Enhanced PDF Report Generator for Validation Reports
 Generates detailed, professional PDF reports
+
+Note: the first ReportPDFGenerator patches reportlab's
+PDFStreamFilterZCompress.encode process-wide so builds can pick a zlib level
+(see _compress_stream). Threads that never set a level get reportlab's
+original encode, which stays reachable as _compress_stream.__wrapped__.
 """
 
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.colors import HexColor, black, white
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, 
-    PageBreak, KeepTogether, Image
-)
-from reportlab.pdfgen import canvas
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache, partial
+from xml.sax.saxutils import escape
 import io
 import logging
+import os
+import threading
+import zlib
+
+import pdf_worker
 
 logger = logging.getLogger(__name__)
 
+_SCORE_BAND_BOUNDS = (80, 60, 40)
+
+
+@lru_cache(maxsize=101)
+def _score_band(score: int) -> int:
+    """Index of the score band (0 = best) for an integer score"""
+    for i, bound in enumerate(_SCORE_BAND_BOUNDS):
+        if score >= bound:
+            return i
+    return len(_SCORE_BAND_BOUNDS)
+
+
+def _escape_strings(value):
+    """
+    Copy of report data with every string XML-escaped for Paragraph markup
+    
+    Done once per report so the section builders can drop user text into
+    markup as-is and paraparser never sees a stray & or <.
+    """
+    if isinstance(value, str):
+        return escape(value)
+    if isinstance(value, dict):
+        return {key: _escape_strings(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_escape_strings(item) for item in value]
+    return value
+
+
+# The parts of a report the platypus sections render; everything else in the
+# stored document (raw_validation_result, evaluation blobs) is never escaped
+_STORY_FIELDS = ('overall_score', 'validation_outcome')
+_STORY_SECTIONS = ('executive_summary', 'performance_analysis', 'cluster_analyses',
+                   'detailed_recommendations', 'next_steps')
+
+
+def _story_data(report_data):
+    """Escaped copy of just the fields and detailed_analysis sections the story reads"""
+    detailed_analysis = report_data.get('detailed_analysis') or {}
+    story_data = {key: _escape_strings(report_data[key]) for key in _STORY_FIELDS if key in report_data}
+    story_data['detailed_analysis'] = {
+        key: _escape_strings(detailed_analysis[key]) for key in _STORY_SECTIONS if key in detailed_analysis
+    }
+    return story_data
+
+
+def _truncate_markup(text, limit):
+    """
+    Cut escaped text to `limit` visible characters without splitting an entity
+    
+    Returns:
+        (text, whether anything was cut off)
+    """
+    end = 0
+    for _ in range(limit):
+        if end >= len(text):
+            return text, False
+        end = text.index(';', end) + 1 if text[end] == '&' else end + 1
+    return text[:end], end < len(text)
+
+
+def _bullet_text(items, prefix="• "):
+    """Paragraph markup for already-escaped items as <br/>-separated bullets"""
+    return "<br/>".join(f"{prefix}{item}" for item in items)
+
+
+# Parameter marker and status text per score band
+_PARAM_BAND_LABELS = (
+    ("✓✓", "Excellent"),
+    ("✓", "Good"),
+    ("✗", "Needs Improvement"),
+    ("✗", "Needs Improvement"),
+)
+
+
+class _LazyStory(list):
+    """
+    Story list that pulls flowables from an iterator as platypus consumes them
+    
+    BaseDocTemplate.build() only reads len() and the front of the list
+    (plus a short keep-with-next lookahead), so keeping a small window
+    buffered is enough; the rest of the report is generated on demand.
+    """
+    
+    WINDOW = 16
+    
+    def __init__(self, source):
+        super().__init__()
+        self._source = iter(source)
+    
+    def _fill(self, n):
+        """Buffer at least n flowables, or all that remain"""
+        while self._source is not None and super().__len__() < n:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+    
+    def __len__(self):
+        self._fill(self.WINDOW)
+        return super().__len__()
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop if index.stop is not None and index.stop >= 0 else float('inf'))
+        elif index >= 0:
+            self._fill(index + 1)
+        else:
+            self._fill(float('inf'))
+        return super().__getitem__(index)
+
+
+# zlib level for content streams built on this thread (unset = reportlab's own
+# encode); reportlab has no setting for it, see _compress_stream
+_compression = threading.local()
+
+
+def _compress_stream(self, text):
+    """Wrapper for reportlab's Flate filter encode() that honours _compression.level"""
+    level = getattr(_compression, 'level', None)
+    if level is None:
+        return _compress_stream.__wrapped__(self, text)
+    if isinstance(text, str):
+        text = text.encode('utf8')
+    return zlib.compress(text, level)
+
+
+@contextmanager
+def _build_settings(compression_level=None):
+    """
+    Apply the zlib compression level for streams written by this thread,
+    restoring the previous level afterwards
+    """
+    previous_level = getattr(_compression, 'level', None)
+    if compression_level is not None:
+        _compression.level = compression_level
+    try:
+        yield
+    finally:
+        _compression.level = previous_level
+
 
 class ReportPDFGenerator:
     """Generate detailed PDF reports for idea validation"""
     
-    # Color scheme
-    PRIMARY_COLOR = HexColor('#4F46E5')  # Indigo
-    SECONDARY_COLOR = HexColor('#06B6D4')  # Cyan
-    SUCCESS_COLOR = HexColor('#10B981')  # Green
-    WARNING_COLOR = HexColor('#F59E0B')  # Amber
-    DANGER_COLOR = HexColor('#EF4444')  # Red
-    BACKGROUND_LIGHT = HexColor('#F8FAFC')
-    TEXT_PRIMARY = HexColor('#1E293B')
-    TEXT_SECONDARY = HexColor('#64748B')
+    # Color scheme (the HexColor attributes are attached by _lazy_init)
+    PRIMARY_HEX = '#4F46E5'  # Indigo
+    SECONDARY_HEX = '#06B6D4'  # Cyan
+    SUCCESS_HEX = '#10B981'  # Green
+    WARNING_HEX = '#F59E0B'  # Amber
+    DANGER_HEX = '#EF4444'  # Red
+    BACKGROUND_LIGHT_HEX = '#F8FAFC'
+    TEXT_PRIMARY_HEX = '#1E293B'
+    TEXT_SECONDARY_HEX = '#64748B'
+    
+    # Score bands (lower bound, best first) and their colors; SCORE_BUCKET_HEX
+    # holds (markup hex, color) per band so callers never format hexval() per item
+    SCORE_BUCKETS = _SCORE_BAND_BOUNDS + (0,)
+    SCORE_BUCKET_HEXES = (SUCCESS_HEX, SECONDARY_HEX, WARNING_HEX, DANGER_HEX)
+    
+    # Stylesheet shared by all instances; built once on first use
+    _STYLES = None
+    _STYLES_LOCK = threading.Lock()
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._create_custom_styles()
+        _lazy_init()
+        if ReportPDFGenerator._STYLES is None:
+            with ReportPDFGenerator._STYLES_LOCK:
+                if ReportPDFGenerator._STYLES is None:
+                    self.styles = getSampleStyleSheet()
+                    self._create_custom_styles()
+                    ReportPDFGenerator._SCORE_STYLES = tuple(
+                        self.styles[f'CriterionScore{bound}'] for bound in self.SCORE_BUCKETS
+                    )
+                    ReportPDFGenerator._STYLES = self.styles
+        self.styles = ReportPDFGenerator._STYLES
     
     def _create_custom_styles(self):
         """Create custom paragraph styles"""
@@ -88,6 +249,13 @@ class ReportPDFGenerator:
             leading=14
         ))
         
+        # Bold body text for labels (instead of <b> markup)
+        self.styles.add(ParagraphStyle(
+            name='BodyBold',
+            parent=self.styles['CustomBody'],
+            fontName='Helvetica-Bold'
+        ))
+        
         # Score display
         self.styles.add(ParagraphStyle(
             name='ScoreText',
@@ -106,17 +274,53 @@ class ReportPDFGenerator:
             alignment=TA_LEFT,
             spaceAfter=4
         ))
+        
+        # Cluster/criterion header cells (name, score per bucket, status)
+        self.styles.add(ParagraphStyle(
+            name='CriterionName',
+            parent=self.styles['SubsectionHeader'],
+            textColor=self.PRIMARY_COLOR,
+            spaceBefore=0,
+            spaceAfter=0
+        ))
+        self.styles.add(ParagraphStyle(
+            name='CriterionStatus',
+            parent=self.styles['CriterionName'],
+            textColor=self.TEXT_PRIMARY
+        ))
+        for bound, color in zip(self.SCORE_BUCKETS, self.SCORE_BUCKET_COLORS):
+            self.styles.add(ParagraphStyle(
+                name=f'CriterionScore{bound}',
+                parent=self.styles['CriterionName'],
+                textColor=color
+            ))
+    
+    def _score_header(self, name, score_text, score, status=None):
+        """
+        Header row for a cluster or criterion
+        
+        Name, score and status are plain-text cells with prebuilt styles, so
+        no per-row <font> markup has to be built and parsed.
+        """
+        row = [
+            Paragraph(name, self.styles['CriterionName']),
+            Paragraph(score_text, self._SCORE_STYLES[_score_band(int(score))])
+        ]
+        if status is not None:
+            row.append(Paragraph(status, self.styles['CriterionStatus']))
+        
+        return Table(
+            [row], colWidths=_HEADER_COL_WIDTHS[len(row)], style=_HEADER_TABLE_STYLE,
+            hAlign='LEFT', spaceBefore=12, spaceAfter=8
+        )
+    
+    def _bullet_list(self, items, prefix="• "):
+        """One Paragraph holding every (already-escaped) item as a <br/>-separated bullet"""
+        return Paragraph(_bullet_text(items, prefix), self.styles['CustomBody'])
     
     def _get_score_color(self, score):
-        """Get color based on score value"""
-        if score >= 80:
-            return self.SUCCESS_COLOR
-        elif score >= 60:
-            return self.SECONDARY_COLOR
-        elif score >= 40:
-            return self.WARNING_COLOR
-        else:
-            return self.DANGER_COLOR
+        """Get (hex string, color) based on score value"""
+        return self.SCORE_BUCKET_HEX[_score_band(int(score))]
     
     def _create_header_footer(self, canvas_obj, doc):
         """Add header and footer to each page"""
@@ -128,7 +332,7 @@ class ReportPDFGenerator:
         canvas_obj.drawString(
             inch, 
             0.5 * inch, 
-            f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
+            doc.footer_text
         )
         canvas_obj.drawRightString(
             letter[0] - inch, 
@@ -138,12 +342,14 @@ class ReportPDFGenerator:
         
         canvas_obj.restoreState()
     
-    def generate_pdf(self, report_data):
+    def generate_pdf(self, report_data, compression_level=None):
         """
         Generate PDF from report data
         
         Args:
             report_data: Dictionary containing report information
+            compression_level: zlib level 0-9 for page streams (0 = uncompressed,
+                1 = fastest); None keeps reportlab's default
             
         Returns:
             BytesIO object containing PDF data
@@ -165,59 +371,42 @@ class ReportPDFGenerator:
             buffer = io.BytesIO()
             
             # Create PDF document
-            doc = SimpleDocTemplate(
+            doc = BaseDocTemplate(
                 buffer,
                 pagesize=letter,
                 rightMargin=72,
                 leftMargin=72,
                 topMargin=72,
-                bottomMargin=72
+                bottomMargin=72,
+                pageCompression=0 if compression_level == 0 else None
             )
+            # One timestamp for every page, formatted once; kept on the doc since
+            # the generator instance is shared between concurrent builds
+            doc.footer_text = f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
+            frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
             
-            # Build document content
-            story = []
-            
-            # Title page
-            logger.info("Creating title page...")
-            title_elements = self._create_title_page(report_data)
-            if title_elements:
-                story.extend(title_elements)
-                story.append(PageBreak())
-            else:
-                logger.error("Title page creation returned empty!")
+            def draw_title_page(canvas_obj, doc):
+                self._render_title_page_direct(canvas_obj, report_data)
+                self._create_header_footer(canvas_obj, doc)
             
-            # Executive Summary
-            logger.info("Creating executive summary...")
-            summary_elements = self._create_executive_summary(report_data)
-            if summary_elements:
-                story.extend(summary_elements)
-                story.append(PageBreak())
-            else:
-                logger.warning("Executive summary is empty")
-            
-            # Detailed Analysis
-            logger.info("Creating detailed analysis...")
-            analysis_elements = self._create_detailed_analysis(report_data)
-            if analysis_elements:
-                story.extend(analysis_elements)
-            else:
-                logger.warning("Detailed analysis is empty")
+            # The fixed-layout title page is drawn straight onto page 1; only
+            # the variable-length sections go through platypus
+            doc.addPageTemplates([
+                PageTemplate(id='title', frames=[frame], onPage=draw_title_page),
+                PageTemplate(id='body', frames=[frame], onPage=self._create_header_footer)
+            ])
             
-            # Recommendations
-            if detailed_analysis.get('detailed_recommendations') or detailed_analysis.get('next_steps'):
-                logger.info("Creating recommendations...")
-                story.append(PageBreak())
-                story.extend(self._create_recommendations(report_data))
+            # Build document content lazily, starting on the page after the title page.
+            # The sections embed user text in Paragraph markup, so it is escaped once here
+            # (the title page is drawn as plain canvas text and keeps the raw values)
+            story_data = _story_data(report_data)
+            story = _LazyStory(self._iter_story(story_data, story_data['detailed_analysis']))
             
-            # Ensure we have content
-            if not story:
-                raise ValueError("No content generated for PDF. Story is empty!")
-            
-            logger.info(f"Story has {len(story)} elements. Building PDF...")
+            logger.info("Building PDF...")
             
             # Build PDF
-            doc.build(story, onFirstPage=self._create_header_footer, 
-                     onLaterPages=self._create_header_footer)
+            with _build_settings(compression_level):
+                doc.build(story)
             
             buffer.seek(0)
             logger.info(f"PDF generated successfully. Buffer size: {buffer.getbuffer().nbytes} bytes")
@@ -228,101 +417,108 @@ class ReportPDFGenerator:
             # Create a minimal error PDF instead of raising
             return self._create_error_pdf(str(e))
     
-    def _create_title_page(self, report_data):
-        """Create title page elements"""
-        elements = []
+    def _iter_story(self, report_data, detailed_analysis):
+        """Flowables for everything after the title page, produced as platypus consumes them"""
+        # Page 1 is the canvas-drawn title page; switch to the body template for the rest
+        yield NextPageTemplate('body')
+        yield PageBreak()
+        
+        # Executive Summary
+        logger.info("Creating executive summary...")
+        summary_elements = self._create_executive_summary(report_data)
+        if summary_elements:
+            yield from summary_elements
+            yield PageBreak()
+        else:
+            logger.warning("Executive summary is empty")
+        
+        # Detailed Analysis
+        logger.info("Creating detailed analysis...")
+        yield from self._create_detailed_analysis(report_data)
+        
+        # Recommendations
+        if detailed_analysis.get('detailed_recommendations') or detailed_analysis.get('next_steps'):
+            logger.info("Creating recommendations...")
+            yield PageBreak()
+            yield from self._create_recommendations(report_data)
+    
+    def generate_pdf_bytes(self, report_data, compression_level=None) -> bytes:
+        """Generate PDF and return its bytes"""
+        return self.generate_pdf(report_data, compression_level).getvalue()
+    
+    def _render_title_page_direct(self, canvas_obj, report_data):
+        """
+        Draw the title page straight onto the canvas
+        
+        Its geometry is fixed, so the platypus measure/wrap/place pass is
+        skipped; only the idea title may wrap onto several lines.
+        """
+        page_width, page_height = letter
+        center = page_width / 2
+        canvas_obj.saveState()
         
         try:
-            # Add spacing
-            elements.append(Spacer(1, 1.5 * inch))
-            
             # Main title
-            title = Paragraph(
-                "IDEA VALIDATION REPORT",
-                self.styles['CustomTitle']
-            )
-            elements.append(title)
-            elements.append(Spacer(1, 0.3 * inch))
-            
-            # Idea title
-            idea_title = report_data.get('title', report_data.get('idea_name', 'Untitled Idea'))
-            title_para = Paragraph(
-                f"<b>{idea_title}</b>",
-                ParagraphStyle(
-                    'IdeaTitle',
-                    parent=self.styles['Heading2'],
-                    fontSize=18,
-                    textColor=self.TEXT_PRIMARY,
-                    alignment=TA_CENTER,
-                    spaceAfter=20
-                )
-            )
-            elements.append(title_para)
-            
-            # Overall score with colored background
-            score = report_data.get('overall_score', 0)
-            # If score is still in 5.0 format, convert
-            if score <= 5.0 and score > 0:
-                score = score * 20
-            score_color = self._get_score_color(score)
-            
-            score_data = [[
-                Paragraph(
-                    f"<b>Overall Score</b><br/><font size='36' color='#{score_color.hexval()}'>{score:.1f}/100</font>",
-                    ParagraphStyle(
-                        'ScoreDisplay',
-                        alignment=TA_CENTER,
-                        fontSize=12,
-                        spaceAfter=10
-                    )
-                )
-            ]]
-            
-            score_table = Table(score_data, colWidths=[4 * inch])
-            score_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BACKGROUND', (0, 0), (-1, -1), self.BACKGROUND_LIGHT),
-                ('BOX', (0, 0), (-1, -1), 2, score_color),
-                ('TOPPADDING', (0, 0), (-1, -1), 20),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
-            ]))
-            
-            elements.append(score_table)
-            elements.append(Spacer(1, 0.5 * inch))
-            
-            # Metadata table
-            metadata = [
-                ['Report ID:', report_data.get('_id', 'N/A')],
-                ['User ID:', report_data.get('user_id', 'N/A')],
-                ['Generated:', report_data.get('created_at', datetime.now().isoformat())],
-            ]
-            
-            metadata_table = Table(metadata, colWidths=[1.5 * inch, 3 * inch])
-            metadata_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                ('TEXTCOLOR', (0, 0), (0, -1), self.TEXT_SECONDARY),
-                ('TEXTCOLOR', (1, 0), (1, -1), self.TEXT_PRIMARY),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ]))
+            y = page_height - 72 - 1.5 * inch - 30
+            canvas_obj.setFont('Helvetica-Bold', 24)
+            canvas_obj.setFillColor(self.PRIMARY_COLOR)
+            canvas_obj.drawCentredString(center, y, "IDEA VALIDATION REPORT")
+            y -= 30 + 0.3 * inch + 28
             
-            elements.append(metadata_table)
-            
-            return elements
-        except Exception as e:
-            logger.error(f"Error creating title page: {e}")
-            # Return minimal title page
-            return [
-                Spacer(1, 2 * inch),
-                Paragraph("IDEA VALIDATION REPORT", self.styles['CustomTitle']),
-                Spacer(1, 0.5 * inch),
-                Paragraph("Error loading report details", self.styles['CustomBody'])
-            ]
+            try:
+                # Idea title
+                idea_title = str(report_data.get('title', report_data.get('idea_name', 'Untitled Idea')))
+                canvas_obj.setFont('Helvetica-Bold', 18)
+                canvas_obj.setFillColor(self.TEXT_PRIMARY)
+                for line in simpleSplit(idea_title, 'Helvetica-Bold', 18, page_width - 2 * 72):
+                    canvas_obj.drawCentredString(center, y, line)
+                    y -= 22
+                y -= 20
+                
+                # Overall score with colored background
+                score = report_data.get('overall_score', 0)
+                # If score is still in 5.0 format, convert
+                if score <= 5.0 and score > 0:
+                    score = score * 20
+                score_hex, score_color = self._get_score_color(score)
+                
+                box_width, box_height = 4 * inch, 100
+                canvas_obj.setFillColor(self.BACKGROUND_LIGHT)
+                canvas_obj.setStrokeColor(score_color)
+                canvas_obj.setLineWidth(2)
+                canvas_obj.rect(center - box_width / 2, y - box_height, box_width, box_height, stroke=1, fill=1)
+                
+                canvas_obj.setFillColor(black)
+                canvas_obj.setFont('Helvetica-Bold', 12)
+                canvas_obj.drawCentredString(center, y - 32, "Overall Score")
+                canvas_obj.setFillColor(score_color)
+                canvas_obj.setFont('Helvetica', 36)
+                canvas_obj.drawCentredString(center, y - 76, f"{score:.1f}/100")
+                y -= box_height + 0.5 * inch + 9
+                
+                # Metadata rows (right-aligned labels, left-aligned values)
+                metadata = [
+                    ('Report ID:', report_data.get('_id', 'N/A')),
+                    ('User ID:', report_data.get('user_id', 'N/A')),
+                    ('Generated:', report_data.get('created_at', datetime.now().isoformat())),
+                ]
+                label_x = center - 2.25 * inch + 1.5 * inch - 6
+                value_x = label_x + 12
+                for label, value in metadata:
+                    canvas_obj.setFont('Helvetica-Bold', 9)
+                    canvas_obj.setFillColor(self.TEXT_SECONDARY)
+                    canvas_obj.drawRightString(label_x, y, label)
+                    canvas_obj.setFont('Helvetica', 9)
+                    canvas_obj.setFillColor(self.TEXT_PRIMARY)
+                    canvas_obj.drawString(value_x, y, str(value))
+                    y -= 20
+            except Exception as e:
+                logger.error(f"Error creating title page: {e}")
+                canvas_obj.setFont('Helvetica', 10)
+                canvas_obj.setFillColor(self.TEXT_PRIMARY)
+                canvas_obj.drawCentredString(center, y, "Error loading report details")
+        finally:
+            canvas_obj.restoreState()
     
     def _create_executive_summary(self, report_data):
         """Create executive summary section"""
@@ -350,9 +546,8 @@ class ReportPDFGenerator:
             # Summary points
             summary_points = exec_summary.get('summary_points', [])
             if summary_points:
-                elements.append(Paragraph("<b>Key Findings:</b>", self.styles['SubsectionHeader']))
-                for point in summary_points:
-                    elements.append(Paragraph(f"• {point}", self.styles['CustomBody']))
+                elements.append(Paragraph("Key Findings:", self.styles['SubsectionHeader']))
+                elements.append(self._bullet_list(summary_points))
                 elements.append(Spacer(1, 0.15 * inch))
             
             # Validation outcome
@@ -365,18 +560,17 @@ class ReportPDFGenerator:
             performance_analysis = detailed_analysis.get('performance_analysis', {})
             good_areas = performance_analysis.get('good_areas', [])
             if good_areas:
-                elements.append(Paragraph("<b>Key Strengths:</b>", self.styles['SubsectionHeader']))
-                for area in good_areas[:3]:
-                    elements.append(Paragraph(
-                        f"• <b>{area['cluster']}</b> ({area['score']:.1f}/100): {area['reason']}", 
-                        self.styles['CustomBody']
-                    ))
+                elements.append(Paragraph("Key Strengths:", self.styles['SubsectionHeader']))
+                elements.append(Paragraph("<br/>".join(
+                    f"• <b>{area['cluster']}</b> ({area['score']:.1f}/100): {area['reason']}"
+                    for area in good_areas[:3]
+                ), self.styles['CustomBody']))
                 elements.append(Spacer(1, 0.15 * inch))
             
             # Areas for improvement from weak parameters - SHOW MORE
             weak_parameters = performance_analysis.get('weak_parameters', [])
             if weak_parameters:
-                elements.append(Paragraph("<b>Critical Areas for Improvement:</b>", self.styles['SubsectionHeader']))
+                elements.append(Paragraph("Critical Areas for Improvement:", self.styles['SubsectionHeader']))
                 
                 # Group by severity
                 critical = [p for p in weak_parameters if p['severity'] == 'Critical']
@@ -384,29 +578,25 @@ class ReportPDFGenerator:
                 moderate = [p for p in weak_parameters if p['severity'] == 'Moderate']
                 
                 if critical:
-                    elements.append(Paragraph(f"<b>🚨 Critical Issues ({len(critical)}):</b>", self.styles['CustomBody']))
+                    elements.append(Paragraph(f"🚨 Critical Issues ({len(critical)}):", self.styles['BodyBold']))
+                    lines = []
                     for param in critical[:10]:  # Show up to 10 critical
                         weaknesses = param.get('weaknesses', [])
                         if weaknesses:
-                            elements.append(Paragraph(f"• <b>{param['parameter']}</b> ({param['score']:.1f}/100):", self.styles['CustomBody']))
-                            for weakness in weaknesses[:2]:
-                                elements.append(Paragraph(f"  └─ {weakness}", self.styles['CustomBody']))
+                            lines.append(f"• <b>{param['parameter']}</b> ({param['score']:.1f}/100):")
+                            lines.extend(f"  └─ {weakness}" for weakness in weaknesses[:2])
                         else:
-                            elements.append(Paragraph(
-                                f"• {param['parameter']} ({param['score']:.1f}/100)", 
-                                self.styles['CustomBody']
-                            ))
+                            lines.append(f"• {param['parameter']} ({param['score']:.1f}/100)")
+                    elements.append(Paragraph("<br/>".join(lines), self.styles['CustomBody']))
                 
                 if high:
-                    elements.append(Paragraph(f"<b>⚠️ High Priority ({len(high)}):</b>", self.styles['CustomBody']))
-                    for param in high[:8]:  # Show up to 8 high priority
-                        elements.append(Paragraph(
-                            f"• {param['parameter']} ({param['score']:.1f}/100)", 
-                            self.styles['CustomBody']
-                        ))
+                    elements.append(Paragraph(f"⚠️ High Priority ({len(high)}):", self.styles['BodyBold']))
+                    elements.append(self._bullet_list(
+                        f"{param['parameter']} ({param['score']:.1f}/100)" for param in high[:8]  # Show up to 8 high priority
+                    ))
                 
                 if moderate:
-                    elements.append(Paragraph(f"<b>⚡ Moderate Priority ({len(moderate)} items)</b>", self.styles['CustomBody']))
+                    elements.append(Paragraph(f"⚡ Moderate Priority ({len(moderate)} items)", self.styles['BodyBold']))
                 
                 elements.append(Spacer(1, 0.15 * inch))
             
@@ -419,47 +609,52 @@ class ReportPDFGenerator:
             ]
     
     def _create_detailed_analysis(self, report_data):
-        """Create detailed analysis section - ALL 7 clusters with parameters"""
-        elements = []
+        """
+        Create detailed analysis section - ALL 7 clusters with parameters
         
+        Yields flowables cluster by cluster so they are built just ahead of
+        layout instead of all being held before the build starts.
+        """
         try:
-            elements.append(Paragraph("Detailed Analysis by Cluster", self.styles['SectionHeader']))
-            elements.append(Spacer(1, 0.1 * inch))
+            header = [
+                Paragraph("Detailed Analysis by Cluster", self.styles['SectionHeader']),
+                Spacer(1, 0.1 * inch)
+            ]
             
             # Get cluster analyses
             detailed_analysis = report_data.get('detailed_analysis', {})
             cluster_analyses = detailed_analysis.get('cluster_analyses', {})
-            
-            if not cluster_analyses:
-                logger.warning("No cluster_analyses found in detailed_analysis")
-                elements.append(Paragraph("Detailed analysis data is being processed. Please generate a new report.", self.styles['CustomBody']))
-                return elements
-            
-            # Ensure all 7 clusters are covered
-            all_clusters = [
-                "Core Idea", "Market Opportunity", "Execution", 
-                "Business Model", "Team", "Compliance", "Risk & Strategy"
-            ]
-            
-            # Create detailed analysis for each cluster
-            for cluster_name in all_clusters:
-                cluster_data = cluster_analyses.get(cluster_name, {})
-                if cluster_data:
-                    try:
-                        cluster_elements = self._create_cluster_analysis_section(cluster_name, cluster_data)
-                        elements.extend(cluster_elements)
-                        elements.append(Spacer(1, 0.2 * inch))
-                    except Exception as cluster_error:
-                        logger.error(f"Error creating cluster section for {cluster_name}: {cluster_error}")
-                        elements.append(Paragraph(f"<b>{cluster_name}:</b> Data unavailable", self.styles['CustomBody']))
-            
-            return elements
         except Exception as e:
             logger.error(f"Error creating detailed analysis: {e}")
-            return [
-                Paragraph("Detailed Analysis", self.styles['SectionHeader']),
-                Paragraph("Error loading detailed analysis", self.styles['CustomBody'])
-            ]
+            yield Paragraph("Detailed Analysis", self.styles['SectionHeader'])
+            yield Paragraph("Error loading detailed analysis", self.styles['CustomBody'])
+            return
+        
+        yield from header
+        
+        if not cluster_analyses:
+            logger.warning("No cluster_analyses found in detailed_analysis")
+            yield Paragraph("Detailed analysis data is being processed. Please generate a new report.", self.styles['CustomBody'])
+            return
+        
+        # Ensure all 7 clusters are covered
+        all_clusters = [
+            "Core Idea", "Market Opportunity", "Execution", 
+            "Business Model", "Team", "Compliance", "Risk & Strategy"
+        ]
+        
+        # Create detailed analysis for each cluster
+        for cluster_name in all_clusters:
+            cluster_data = cluster_analyses.get(cluster_name, {})
+            if cluster_data:
+                try:
+                    cluster_elements = self._create_cluster_analysis_section(cluster_name, cluster_data)
+                except Exception as cluster_error:
+                    logger.error(f"Error creating cluster section for {cluster_name}: {cluster_error}")
+                    yield Paragraph(f"<b>{cluster_name}:</b> Data unavailable", self.styles['CustomBody'])
+                    continue
+                yield from cluster_elements
+                yield Spacer(1, 0.2 * inch)
     
     def _create_cluster_analysis_section(self, cluster_name, cluster_data):
         """Create COMPREHENSIVE section for a cluster with ALL parameters and agent insights"""
@@ -469,16 +664,12 @@ class ReportPDFGenerator:
         status = cluster_data.get('status', 'Unknown')
         
         # Cluster header with score
-        score_color = self._get_score_color(score)
-        header_text = f"<font color='#{self.PRIMARY_COLOR.hexval()}'><b>{cluster_name}</b></font> - <font color='#{score_color.hexval()}'><b>{score:.1f}/100</b></font> - {status}"
-        
-        elements.append(Paragraph(header_text, self.styles['SubsectionHeader']))
+        elements.append(self._score_header(cluster_name, f"{score:.1f}/100", score, status))
         
         # Summary points
         summary_points = cluster_data.get('summary_points', [])
         if summary_points:
-            for point in summary_points:
-                elements.append(Paragraph(f"• {point}", self.styles['CustomBody']))
+            elements.append(self._bullet_list(summary_points))
             elements.append(Spacer(1, 0.08 * inch))
         
         # Parameters breakdown - SHOW ALL PARAMETERS
@@ -486,7 +677,7 @@ class ReportPDFGenerator:
         all_params = parameters.get('strong', []) + parameters.get('moderate', []) + parameters.get('weak', [])
         
         if all_params:
-            elements.append(Paragraph(f"<b>Detailed Parameter Analysis ({len(all_params)} parameters evaluated):</b>", self.styles['CustomBody']))
+            elements.append(Paragraph(f"Detailed Parameter Analysis ({len(all_params)} parameters evaluated):", self.styles['BodyBold']))
             elements.append(Spacer(1, 0.06 * inch))
             
             for param in all_params:
@@ -494,15 +685,7 @@ class ReportPDFGenerator:
                 param_name = param.get('name', 'Unknown')
                 
                 # Color code by score
-                if param_score >= 80:
-                    marker = "✓✓"
-                    status_text = "Excellent"
-                elif param_score >= 60:
-                    marker = "✓"
-                    status_text = "Good"
-                else:
-                    marker = "✗"
-                    status_text = "Needs Improvement"
+                marker, status_text = _PARAM_BAND_LABELS[_score_band(int(param_score))]
                 
                 # Parameter header
                 elements.append(Paragraph(
@@ -513,67 +696,35 @@ class ReportPDFGenerator:
                 # Explanation
                 explanation = param.get('explanation', '')
                 if explanation:
-                    elements.append(Paragraph(f"  └─ {explanation[:150]}{'...' if len(explanation) > 150 else ''}", self.styles['CustomBody']))
+                    explanation, cut = _truncate_markup(explanation, 150)
+                    elements.append(Paragraph(f"  └─ {explanation}{'...' if cut else ''}", self.styles['CustomBody']))
                 
                 # Agent strengths (if any)
                 strengths = param.get('strengths', [])
                 if strengths:
-                    elements.append(Paragraph("  <b>Strengths:</b>", self.styles['CustomBody']))
-                    for strength in strengths:
-                        elements.append(Paragraph(f"    • {strength}", self.styles['CustomBody']))
+                    elements.append(Paragraph("Strengths:", self.styles['BodyBold']))
+                    elements.append(self._bullet_list(strengths, prefix="    • "))
                 
                 # Agent weaknesses (if any)
                 weaknesses = param.get('weaknesses', [])
                 if weaknesses:
-                    elements.append(Paragraph("  <b>Weaknesses:</b>", self.styles['CustomBody']))
-                    for weakness in weaknesses:
-                        elements.append(Paragraph(f"    • {weakness}", self.styles['CustomBody']))
+                    elements.append(Paragraph("Weaknesses:", self.styles['BodyBold']))
+                    elements.append(self._bullet_list(weaknesses, prefix="    • "))
                 
                 # Key insights (if any)
                 insights = param.get('key_insights', [])
                 if insights:
-                    for insight in insights[:2]:  # Top 2 insights
-                        elements.append(Paragraph(f"  💡 {insight}", self.styles['CustomBody']))
+                    elements.append(self._bullet_list(insights[:2], prefix="  💡 "))  # Top 2 insights
                 
                 # Recommendations (if any)
                 recommendations = param.get('recommendations', [])
                 if recommendations:
-                    for rec in recommendations[:2]:  # Top 2 recommendations
-                        elements.append(Paragraph(f"  → {rec}", self.styles['CustomBody']))
+                    elements.append(self._bullet_list(recommendations[:2], prefix="  → "))  # Top 2 recommendations
                 
                 elements.append(Spacer(1, 0.08 * inch))
         
         return elements
     
-    def _create_criterion_section(self, criterion_data):
-        """Create section for a single criterion (legacy support)"""
-        elements = []
-        
-        criterion_name = criterion_data.get('criterion', 'Unknown Criterion')
-        score = criterion_data.get('score', 0)
-        
-        # Criterion header with score
-        score_color = self._get_score_color(score)
-        header_text = f"<font color='#{self.PRIMARY_COLOR.hexval()}'><b>{criterion_name}</b></font> - <font color='#{score_color.hexval()}'><b>{score}/100</b></font>"
-        
-        elements.append(Paragraph(header_text, self.styles['SubsectionHeader']))
-        
-        # Reasoning
-        reasoning = criterion_data.get('reasoning', '')
-        if reasoning:
-            elements.append(Paragraph("<b>Analysis:</b>", self.styles['CustomBody']))
-            elements.append(Paragraph(reasoning, self.styles['CustomBody']))
-            elements.append(Spacer(1, 0.08 * inch))
-        
-        # Suggestions
-        suggestions = criterion_data.get('suggestions', [])
-        if suggestions:
-            elements.append(Paragraph("<b>Suggestions:</b>", self.styles['CustomBody']))
-            for suggestion in suggestions:
-                elements.append(Paragraph(f"• {suggestion}", self.styles['CustomBody']))
-        
-        return elements
-    
     def _create_recommendations(self, report_data):
         """Create recommendations section"""
         elements = []
@@ -599,22 +750,21 @@ class ReportPDFGenerator:
                 action_items = rec.get('action_items', [])
                 
                 # Priority color coding
-                priority_color = self.DANGER_COLOR if priority in ['Critical', 'Urgent'] else self.WARNING_COLOR if priority == 'High' else self.PRIMARY_COLOR
+                priority_hex = self.DANGER_HEX if priority in ['Critical', 'Urgent'] else self.WARNING_HEX if priority == 'High' else self.PRIMARY_HEX
                 
                 elements.append(Paragraph(
-                    f"<font color='#{priority_color.hexval()}'><b>[{priority}]</b></font> <b>{category}:</b> {recommendation}",
+                    f"<font color='{priority_hex}'><b>[{priority}]</b></font> <b>{category}:</b> {recommendation}",
                     self.styles['CustomBody']
                 ))
                 
                 if action_items:
-                    for item in action_items[:5]:  # Limit to 5 items per recommendation
-                        elements.append(Paragraph(f"  • {item}", self.styles['CustomBody']))
+                    elements.append(self._bullet_list(action_items[:5], prefix="  • "))  # Limit to 5 items per recommendation
                 
                 elements.append(Spacer(1, 0.1 * inch))
         
         # Next steps
         if next_steps:
-            elements.append(Paragraph("<b>Immediate Next Steps:</b>", self.styles['SubsectionHeader']))
+            elements.append(Paragraph("Immediate Next Steps:", self.styles['SubsectionHeader']))
             for i, step in enumerate(next_steps[:10], 1):  # Top 10 steps
                 step_text = f"<b>{i}.</b> {step}"
                 elements.append(Paragraph(step_text, self.styles['CustomBody']))
@@ -634,7 +784,7 @@ class ReportPDFGenerator:
             story.append(Spacer(1, 0.5 * inch))
             story.append(Paragraph(f"An error occurred while generating the report:", self.styles['CustomBody']))
             story.append(Spacer(1, 0.2 * inch))
-            story.append(Paragraph(f"Error: {error_message}", self.styles['CustomBody']))
+            story.append(Paragraph(f"Error: {escape(error_message)}", self.styles['CustomBody']))
             story.append(Spacer(1, 0.2 * inch))
             story.append(Paragraph("Please check the server logs for more details.", self.styles['CustomBody']))
             
@@ -649,16 +799,365 @@ class ReportPDFGenerator:
             return buffer
 
 
-def generate_report_pdf(report_data):
+_reportlab_loaded = False
+_reportlab_lock = threading.Lock()
+
+
+def _lazy_init():
+    """
+    Import reportlab on first use
+    
+    Importing this module stays cheap (e.g. for pool workers that never
+    render); the reportlab names, colors and shared table style below are
+    bound when the first ReportPDFGenerator is created.
+    """
+    global _reportlab_loaded, _HEADER_TABLE_STYLE, _HEADER_COL_WIDTHS
+    global letter, getSampleStyleSheet, ParagraphStyle, inch, HexColor, black
+    global TA_LEFT, TA_CENTER, simpleSplit
+    global BaseDocTemplate, SimpleDocTemplate, Frame, PageTemplate, Paragraph, Spacer, Table, TableStyle
+    global PageBreak, NextPageTemplate
+    
+    if _reportlab_loaded:
+        return
+    with _reportlab_lock:
+        if _reportlab_loaded:
+            return
+        
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.lib.colors import HexColor, black
+        from reportlab.lib.enums import TA_LEFT, TA_CENTER
+        from reportlab.lib.utils import simpleSplit
+        from reportlab.platypus import (
+            BaseDocTemplate, SimpleDocTemplate, Frame, PageTemplate, Paragraph, Spacer, Table, TableStyle,
+            PageBreak, NextPageTemplate
+        )
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.pdfdoc import PDFStreamFilterZCompress
+        
+        if PDFStreamFilterZCompress.encode is not _compress_stream:
+            _compress_stream.__wrapped__ = PDFStreamFilterZCompress.encode
+            PDFStreamFilterZCompress.encode = _compress_stream
+        
+        # Only the standard Helvetica faces are used: register them up front so
+        # no font lookup happens mid-build
+        if 'Helvetica-Bold' not in pdfmetrics.getRegisteredFontNames():
+            for face in ('Helvetica', 'Helvetica-Bold'):
+                pdfmetrics.registerFont(pdfmetrics.Font(face, face, pdfmetrics.defaultEncoding))
+        
+        cls = ReportPDFGenerator
+        for name in ('PRIMARY', 'SECONDARY', 'SUCCESS', 'WARNING', 'DANGER'):
+            setattr(cls, f'{name}_COLOR', HexColor(getattr(cls, f'{name}_HEX')))
+        cls.BACKGROUND_LIGHT = HexColor(cls.BACKGROUND_LIGHT_HEX)
+        cls.TEXT_PRIMARY = HexColor(cls.TEXT_PRIMARY_HEX)
+        cls.TEXT_SECONDARY = HexColor(cls.TEXT_SECONDARY_HEX)
+        cls.SCORE_BUCKET_COLORS = tuple(HexColor(h) for h in cls.SCORE_BUCKET_HEXES)
+        cls.SCORE_BUCKET_HEX = tuple(zip(cls.SCORE_BUCKET_HEXES, cls.SCORE_BUCKET_COLORS))
+        
+        # Cluster/criterion header rows: cells flush left, vertically centred
+        _HEADER_TABLE_STYLE = TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (0, -1), 0),
+            ('TOPPADDING', (0, 0), (-1, -1), 0),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+        ])
+        # Header row column widths keyed by cell count (name+score, name+score+status)
+        _HEADER_COL_WIDTHS = {
+            2: (5.25 * inch, 1.25 * inch),
+            3: (3.5 * inch, 1.25 * inch, 1.75 * inch),
+        }
+        
+        _reportlab_loaded = True
+
+
+# HTML rendering of the whole report for the WeasyPrint backend (see generate_report_pdf)
+_REPORT_HTML_SOURCE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>
+@page {
+    size: letter;
+    margin: 1in;
+    @bottom-left { content: "Generated on {{ generated_on }}"; font: 8pt Helvetica; color: {{ c.TEXT_SECONDARY_HEX }}; }
+    @bottom-right { content: "Page " counter(page); font: 8pt Helvetica; color: {{ c.TEXT_SECONDARY_HEX }}; }
+}
+body { font: 10pt/14pt Helvetica, Arial, sans-serif; color: {{ c.TEXT_PRIMARY_HEX }}; }
+h1 { font-size: 24pt; color: {{ c.PRIMARY_HEX }}; text-align: center; margin: 1.5in 0 0.3in; }
+h2 { font-size: 16pt; color: {{ c.PRIMARY_HEX }}; margin: 20pt 0 12pt; }
+h3 { font-size: 13pt; margin: 12pt 0 8pt; }
+p { margin: 0 0 6pt; }
+ul { margin: 0 0 6pt; padding-left: 12pt; }
+.idea { font-size: 18pt; font-weight: bold; text-align: center; }
+.score-box { width: 4in; margin: 20pt auto 0.5in; padding: 16pt 0; text-align: center;
+             background: {{ c.BACKGROUND_LIGHT_HEX }}; border: 2pt solid {{ score_hex }}; }
+.score-box b { display: block; font-size: 12pt; }
+.score-box span { font-size: 36pt; line-height: 44pt; color: {{ score_hex }}; }
+.meta { margin: 0 auto; font-size: 9pt; }
+.meta th { text-align: right; color: {{ c.TEXT_SECONDARY_HEX }}; padding-right: 12pt; }
+.section { page-break-before: always; }
+.cluster { display: flex; font-size: 13pt; font-weight: bold; color: {{ c.PRIMARY_HEX }}; margin: 12pt 0 8pt;
+           padding: 8pt; background: {{ c.BACKGROUND_LIGHT_HEX }}; border: 1pt solid {{ c.PRIMARY_HEX }}; }
+.cluster span { width: 1.25in; }
+.cluster span:first-child { flex: 1; }
+.label { font-weight: bold; margin-bottom: 0; }
+</style>
+</head>
+<body>
+<h1>IDEA VALIDATION REPORT</h1>
+<p class="idea">{{ report.get('title', report.get('idea_name', 'Untitled Idea')) }}</p>
+<div class="score-box"><b>Overall Score</b><span>{{ '%.1f'|format(score) }}/100</span></div>
+<table class="meta">
+<tr><th>Report ID:</th><td>{{ report.get('_id', 'N/A') }}</td></tr>
+<tr><th>User ID:</th><td>{{ report.get('user_id', 'N/A') }}</td></tr>
+<tr><th>Generated:</th><td>{{ report.get('created_at', generated_at) }}</td></tr>
+</table>
+
+{% set exec_summary = analysis.get('executive_summary', {}) %}
+{% set performance = analysis.get('performance_analysis', {}) %}
+<div class="section">
+<h2>Executive Summary</h2>
+{% if not exec_summary %}
+<p><b>Overall Score:</b> {{ '%.1f'|format(score) }}/100</p>
+<p><b>Outcome:</b> {{ report.get('validation_outcome', 'N/A') }}</p>
+{% else %}
+{% if exec_summary.get('summary_points') %}
+<h3>Key Findings:</h3>
+<ul>{% for point in exec_summary['summary_points'] %}<li>{{ point }}</li>{% endfor %}</ul>
+{% endif %}
+{% if exec_summary.get('outcome') %}<p><b>Validation Outcome:</b> {{ exec_summary['outcome'] }}</p>{% endif %}
+{% if performance.get('good_areas') %}
+<h3>Key Strengths:</h3>
+<ul>{% for area in performance['good_areas'][:3] %}<li><b>{{ area['cluster'] }}</b> ({{ '%.1f'|format(area['score']) }}/100): {{ area['reason'] }}</li>{% endfor %}</ul>
+{% endif %}
+{% set weak = performance.get('weak_parameters', []) %}
+{% if weak %}
+<h3>Critical Areas for Improvement:</h3>
+{% set critical = weak|selectattr('severity', 'equalto', 'Critical')|list %}
+{% set high = weak|selectattr('severity', 'equalto', 'High')|list %}
+{% set moderate = weak|selectattr('severity', 'equalto', 'Moderate')|list %}
+{% if critical %}
+<p class="label">🚨 Critical Issues ({{ critical|length }}):</p>
+<ul>{% for param in critical[:10] %}<li>{{ param['parameter'] }} ({{ '%.1f'|format(param['score']) }}/100){% for weakness in param.get('weaknesses', [])[:2] %}<br>└─ {{ weakness }}{% endfor %}</li>{% endfor %}</ul>
+{% endif %}
+{% if high %}
+<p class="label">⚠️ High Priority ({{ high|length }}):</p>
+<ul>{% for param in high[:8] %}<li>{{ param['parameter'] }} ({{ '%.1f'|format(param['score']) }}/100)</li>{% endfor %}</ul>
+{% endif %}
+{% if moderate %}<p class="label">⚡ Moderate Priority ({{ moderate|length }} items)</p>{% endif %}
+{% endif %}
+{% endif %}
+</div>
+
+{% set clusters = analysis.get('cluster_analyses', {}) %}
+<div class="section">
+<h2>Detailed Analysis by Cluster</h2>
+{% if not clusters %}
+<p>Detailed analysis data is being processed. Please generate a new report.</p>
+{% endif %}
+{% for name in cluster_names if clusters.get(name) %}
+{% set cluster = clusters[name] %}
+{% set parameters = cluster.get('parameters', {}) %}
+{% set params = parameters.get('strong', []) + parameters.get('moderate', []) + parameters.get('weak', []) %}
+<div class="cluster"><span>{{ name }}</span>
+<span style="color: {{ band_hexes[band(cluster.get('score', 0)|int)] }}">{{ '%.1f'|format(cluster.get('score', 0)) }}/100</span>
+<span style="color: {{ c.TEXT_PRIMARY_HEX }}">{{ cluster.get('status', 'Unknown') }}</span></div>
+{% if cluster.get('summary_points') %}<ul>{% for point in cluster['summary_points'] %}<li>{{ point }}</li>{% endfor %}</ul>{% endif %}
+{% if params %}
+<p class="label">Detailed Parameter Analysis ({{ params|length }} parameters evaluated):</p>
+{% for param in params %}
+{% set marker, status_text = band_labels[band(param.get('score', 0)|int)] %}
+<p><b>{{ marker }} {{ param.get('name', 'Unknown') }}: {{ '%.1f'|format(param.get('score', 0)) }}/100</b> - {{ status_text }}</p>
+{% if param.get('explanation') %}<p>└─ {{ param['explanation']|truncate(153, True, '...', 0) }}</p>{% endif %}
+{% if param.get('strengths') %}<p class="label">Strengths:</p><ul>{% for item in param['strengths'] %}<li>{{ item }}</li>{% endfor %}</ul>{% endif %}
+{% if param.get('weaknesses') %}<p class="label">Weaknesses:</p><ul>{% for item in param['weaknesses'] %}<li>{{ item }}</li>{% endfor %}</ul>{% endif %}
+{% for item in param.get('key_insights', [])[:2] %}<p>💡 {{ item }}</p>{% endfor %}
+{% for item in param.get('recommendations', [])[:2] %}<p>→ {{ item }}</p>{% endfor %}
+{% endfor %}
+{% endif %}
+{% endfor %}
+</div>
+
+{% if analysis.get('detailed_recommendations') or analysis.get('next_steps') %}
+<div class="section">
+<h2>Recommendations &amp; Next Steps</h2>
+{% for rec in analysis.get('detailed_recommendations', []) %}
+{% set priority = rec.get('priority', 'Medium') %}
+<p><b style="color: {{ c.DANGER_HEX if priority in ['Critical', 'Urgent'] else c.WARNING_HEX if priority == 'High' else c.PRIMARY_HEX }}">[{{ priority }}]</b>
+<b>{{ rec.get('category', 'General') }}:</b> {{ rec.get('recommendation', '') }}</p>
+{% if rec.get('action_items') %}<ul>{% for item in rec['action_items'][:5] %}<li>{{ item }}</li>{% endfor %}</ul>{% endif %}
+{% endfor %}
+{% if analysis.get('next_steps') %}
+<h3>Immediate Next Steps:</h3>
+{% for step in analysis['next_steps'][:10] %}<p><b>{{ loop.index }}.</b> {{ step }}</p>{% endfor %}
+{% endif %}
+</div>
+{% endif %}
+</body>
+</html>
+"""
+
+_CLUSTER_NAMES = (
+    "Core Idea", "Market Opportunity", "Execution",
+    "Business Model", "Team", "Compliance", "Risk & Strategy"
+)
+
+_html_template = None
+_html_template_lock = threading.Lock()
+
+
+def _get_html_template():
+    """
+    The compiled report HTML template, built on first use
+    
+    jinja2 is imported here rather than at module import, like reportlab in
+    _lazy_init; the template never changes at runtime, so it is compiled once.
+    """
+    global _html_template
+    if _html_template is None:
+        with _html_template_lock:
+            if _html_template is None:
+                try:
+                    import jinja2
+                except ImportError:
+                    raise ImportError("jinja2 is required for HTML report rendering. Install jinja2.")
+                
+                env = jinja2.Environment(
+                    autoescape=True, auto_reload=False, cache_size=-1, trim_blocks=True, lstrip_blocks=True
+                )
+                env.globals.update(
+                    c=ReportPDFGenerator,
+                    band=_score_band,
+                    band_hexes=ReportPDFGenerator.SCORE_BUCKET_HEXES,
+                    band_labels=_PARAM_BAND_LABELS,
+                    cluster_names=_CLUSTER_NAMES
+                )
+                _html_template = env.from_string(_REPORT_HTML_SOURCE)
+    return _html_template
+
+
+def render_report_html(report_data) -> str:
+    """Render report data as a standalone HTML document (the WeasyPrint backend's input)"""
+    template = _get_html_template()
+    
+    score = report_data.get('overall_score', 0)
+    # If score is still in 5.0 format, convert
+    if score <= 5.0 and score > 0:
+        score = score * 20
+    now = datetime.now()
+    
+    return template.render(
+        report=report_data,
+        analysis=report_data.get('detailed_analysis', {}),
+        score=score,
+        score_hex=ReportPDFGenerator.SCORE_BUCKET_HEXES[_score_band(int(score))],
+        generated_at=now.isoformat(),
+        generated_on=now.strftime('%B %d, %Y at %I:%M %p')
+    )
+
+
+def _generate_weasyprint_pdf_bytes(report_data) -> bytes:
+    """Render the report through the HTML template and WeasyPrint"""
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        raise ImportError("weasyprint is required for backend='weasyprint'. Install weasyprint.")
+    
+    return HTML(string=render_report_html(report_data)).write_pdf()
+
+
+_PDF_BACKENDS = ('reportlab', 'weasyprint')
+
+
+def _check_backend(backend):
+    if backend not in _PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}; expected one of {_PDF_BACKENDS}")
+
+
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def _get_generator():
+    """Shared ReportPDFGenerator instance, created on first use"""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = ReportPDFGenerator()
+    return _generator
+
+
+def generate_report_pdf(report_data, compression_level=None, backend='reportlab'):
     """
     Utility function to generate PDF report
     
     Args:
         report_data: Dictionary containing report information
+        compression_level: zlib level 0-9 for page streams; None keeps the default (6)
+            (reportlab backend only)
+        backend: 'reportlab' (default) or 'weasyprint', which renders the
+            precompiled HTML template instead of laying out flowables
         
     Returns:
         BytesIO object containing PDF data
     """
-    generator = ReportPDFGenerator()
-    return generator.generate_pdf(report_data)
+    _check_backend(backend)
+    if backend == 'weasyprint':
+        return io.BytesIO(_generate_weasyprint_pdf_bytes(report_data))
+    return _get_generator().generate_pdf(report_data, compression_level)
+
 
+def generate_report_pdf_bytes(report_data, compression_level=None, backend='reportlab') -> bytes:
+    """
+    Utility function to generate PDF report as bytes
+    
+    Args:
+        report_data: Dictionary containing report information
+        compression_level: zlib level 0-9 for page streams; None keeps the default (6)
+            (reportlab backend only)
+        backend: 'reportlab' (default) or 'weasyprint'
+        
+    Returns:
+        PDF data
+    """
+    _check_backend(backend)
+    if backend == 'weasyprint':
+        return _generate_weasyprint_pdf_bytes(report_data)
+    return _get_generator().generate_pdf_bytes(report_data, compression_level)
+
+
+def _init_pdf_worker():
+    """Process pool initializer: build the shared generator (and its styles) once per worker"""
+    _get_generator()
+
+
+def generate_report_pdfs(report_data_list, max_workers=None, compression_level=1):
+    """
+    Generate many PDF reports in parallel worker processes
+    
+    Rendering is CPU-bound Python, so processes rather than threads. Workers
+    are started like the endpoints' PDF pool (see pdf_worker), not forked
+    from a possibly multi-threaded parent.
+    
+    Args:
+        report_data_list: Dictionaries containing report information
+        max_workers: Worker processes (defaults to the CPU count)
+        compression_level: zlib level for page streams; batch runs default
+            to 1 (fastest) since throughput matters more than size here
+        
+    Returns:
+        List of PDF bytes, in the same order as report_data_list
+    """
+    report_data_list = list(report_data_list)
+    if not report_data_list:
+        return []
+    
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(report_data_list) // (4 * workers))
+    with pdf_worker.create_pool(workers, initializer=_init_pdf_worker) as executor:
+        render = partial(generate_report_pdf_bytes, compression_level=compression_level)
+        with pdf_worker.main_script_hidden():
+            results = executor.map(render, report_data_list, chunksize=chunksize)
+        return list(results)
@@ -0,0 +1,172 @@
+"""
+Unit tests for the agent conversation extraction in pdf_report_system.data_processor
+Run with: python -m pytest -q test_data_processor_units.py
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from pdf_report_system.data_processor import AgentDataProcessor, _get_extractor, _unique_top
+
+
+SNAKE_EVALUATION = {
+    'assigned_score': '72',
+    'explanation': 'Solid core idea',
+    'strengths': ['Clear problem'],
+    'weaknesses': ['Thin moat'],
+    'key_insights': ['Niche market'],
+    'recommendations': ['Talk to users'],
+    'risk_factors': ['Competition'],
+    'assumptions': ['Farmers own phones'],
+    'agent_id': 'agent-1',
+}
+
+CAMEL_EVALUATION = {
+    'assignedScore': 41,
+    'Explanation': 'Unclear channel',
+    'Strengths': ['Cheap hardware'],
+    'Weaknesses': ['No distribution'],
+    'keyInsights': ['Needs partners'],
+    'Recommendations': ['Pilot with a co-op'],
+    'riskFactors': ['Seasonality'],
+    'Assumptions': [],
+    'agentId': 'agent-2',
+}
+
+
+def _conversation(cluster='Core Idea', sub='sub', score=50, **fields):
+    conversation = {
+        'cluster': cluster, 'parameter': 'param', 'sub_parameter': sub, 'score': score,
+        'strengths': [], 'weaknesses': [], 'key_insights': [], 'recommendations': [],
+    }
+    conversation.update(fields)
+    return conversation
+
+
+# ---------------------------------------------------------------------------
+# Extractor resolved per key set
+# ---------------------------------------------------------------------------
+
+def test_extractor_reads_snake_case_fields():
+    conversation = _get_extractor(SNAKE_EVALUATION)(SNAKE_EVALUATION, 'Core Idea', 'Problem', 'Clarity')
+
+    assert conversation['cluster'] == 'Core Idea'
+    assert conversation['parameter'] == 'Problem'
+    assert conversation['sub_parameter'] == 'Clarity'
+    assert conversation['score'] == 72.0
+    assert conversation['explanation'] == 'Solid core idea'
+    assert conversation['key_insights'] == ['Niche market']
+    assert conversation['risk_factors'] == ['Competition']
+    assert conversation['agent_id'] == 'agent-1'
+
+
+def test_extractor_reads_camel_case_fields():
+    conversation = _get_extractor(CAMEL_EVALUATION)(CAMEL_EVALUATION, 'Market', 'GTM', 'Channels')
+
+    assert conversation['score'] == 41.0
+    assert conversation['explanation'] == 'Unclear channel'
+    assert conversation['strengths'] == ['Cheap hardware']
+    assert conversation['key_insights'] == ['Needs partners']
+    assert conversation['risk_factors'] == ['Seasonality']
+    assert conversation['agent_id'] == 'agent-2'
+
+
+def test_extractor_defaults_missing_fields_and_bad_scores():
+    evaluation = {'score': 'n/a', 'strengths': None}
+    conversation = _get_extractor(evaluation)(evaluation, 'C', 'P', 'S')
+
+    assert conversation['score'] == 0
+    assert conversation['strengths'] == []
+    assert conversation['weaknesses'] == []
+    assert conversation['explanation'] == ''
+    assert conversation['agent_id'] == ''
+
+
+def test_mixed_schemas_are_resolved_per_row():
+    processor = AgentDataProcessor({'evaluated_data': {
+        'Core Idea': {'Problem': {'Clarity': SNAKE_EVALUATION}},
+        'Market': {'GTM': {'Channels': CAMEL_EVALUATION, 'Bad': 'not an evaluation'}},
+    }})
+
+    conversations = processor.extract_all_agent_conversations()
+
+    assert [(c['cluster'], c['score'], c['explanation']) for c in conversations] == [
+        ('Core Idea', 72.0, 'Solid core idea'),
+        ('Market', 41.0, 'Unclear channel'),
+    ]
+
+
+def test_raw_json_result_is_stream_parsed():
+    raw = json.dumps({'evaluatedData': {'Core Idea': {'Problem': {'Clarity': SNAKE_EVALUATION}}}})
+
+    conversations = AgentDataProcessor({'raw_validation_result': raw}).extract_all_agent_conversations()
+
+    assert len(conversations) == 1
+    assert conversations[0]['score'] == 72.0
+
+
+def test_malformed_raw_json_raises():
+    raw = json.dumps({'evaluated_data': {'Core Idea': {'Problem': {'Clarity': SNAKE_EVALUATION}}}})
+
+    with pytest.raises(Exception):
+        AgentDataProcessor({'raw_validation_result': raw[:-10]}).extract_all_agent_conversations()
+
+
+# ---------------------------------------------------------------------------
+# Deduplication
+# ---------------------------------------------------------------------------
+
+def test_unique_top_skips_normalized_duplicates():
+    items = ['Strong team', ' strong TEAM ', 'Good market', 'Strong team', 'Clear pricing']
+
+    assert _unique_top(items, 5) == ['Strong team', 'Good market', 'Clear pricing']
+    assert _unique_top(items, 2) == ['Strong team', 'Good market']
+
+
+def test_duplicate_strengths_keep_highest_score_and_weaknesses_lowest():
+    processor = AgentDataProcessor({})
+    conversations = [
+        _conversation(sub='a', score=75, strengths=['Great UX']),
+        _conversation(sub='b', score=90, strengths=['great ux ']),
+        _conversation(sub='c', score=55, weaknesses=['No moat']),
+        _conversation(sub='d', score=20, weaknesses=['NO MOAT']),
+    ]
+
+    result = processor.extract_strengths_and_weaknesses(conversations)
+
+    assert [(s['text'], s['score'], s['parameter']) for s in result['strengths']] == [('great ux ', 90, 'b')]
+    assert [(w['score'], w['severity']) for w in result['weaknesses']] == [(20, 'Critical')]
+
+
+def test_duplicate_recommendations_keep_highest_priority():
+    processor = AgentDataProcessor({})
+    conversations = [
+        _conversation(sub='a', score=80, recommendations=['Run a pilot']),
+        _conversation(sub='b', score=30, recommendations=['run a pilot']),
+        _conversation(sub='c', score=65, recommendations=['Hire sales']),
+    ]
+
+    recommendations = processor.extract_recommendations(conversations)
+
+    assert [(r['text'], r['priority']) for r in recommendations] == [
+        ('run a pilot', 'High'),
+        ('Hire sales', 'Medium'),
+    ]
+
+
+def test_cluster_summary_lists_are_unique_and_capped():
+    processor = AgentDataProcessor({})
+    conversations = [
+        _conversation(sub=str(i), score=80, strengths=['Same strength', f'Strength {i}'], key_insights=['Same insight'])
+        for i in range(6)
+    ]
+
+    summary = processor.generate_cluster_summary('Core Idea', conversations)
+
+    assert summary['strengths'] == ['Same strength', 'Strength 0', 'Strength 1', 'Strength 2', 'Strength 3']
+    assert summary['key_insights'] == ['Same insight']
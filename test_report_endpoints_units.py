@@ -0,0 +1,461 @@
+"""
+Unit tests for the report endpoints, run against an in-memory stand-in
+for the MongoDB DatabaseManager
+Run with: python -m pytest -q test_report_endpoints_units.py
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+import types
+from concurrent.futures import Future
+from datetime import datetime, timezone
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+try:
+    import database_manager  # noqa: F401
+except ImportError:
+    # pymongo is not installed: the endpoints only need get_database_manager,
+    # which every test replaces with FakeDB below
+    sys.modules['database_manager'] = types.SimpleNamespace(get_database_manager=lambda: None)
+
+import report_endpoints
+
+
+class FakeDB:
+    """In-memory DatabaseManager exposing the calls the report endpoints make"""
+
+    def __init__(self):
+        self.calls = []
+        self.reports = {}
+        self.ai_reports = {}
+
+    def get_report_by_id(self, report_id):
+        self.calls.append(('get_report_by_id', report_id))
+        return self.reports.get(report_id)
+
+    def get_user_reports(self, user_id, limit=10, offset=0, projection=None):
+        self.calls.append(('get_user_reports', user_id, limit, offset))
+        return [{'_id': str(i)} for i in range(offset, offset + min(limit, 3))]
+
+    def get_ai_report(self, report_id):
+        self.calls.append(('get_ai_report', report_id))
+        return self.ai_reports.get(report_id)
+
+    def save_ai_report(self, report_id, ai_report):
+        self.calls.append(('save_ai_report', report_id))
+        self.ai_reports[report_id] = {
+            'ai_report': ai_report,
+            'generated_at': datetime(2024, 2, 1, tzinfo=timezone.utc),
+        }
+        return True
+
+    def count(self, name):
+        return sum(1 for call in self.calls if call[0] == name)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake_db = FakeDB()
+    monkeypatch.setattr(report_endpoints, 'get_database_manager', lambda: fake_db)
+    for cache in (report_endpoints._ai_report_cache, report_endpoints._pdf_cache,
+                  report_endpoints._report_cache, report_endpoints._report_json_cache):
+        monkeypatch.setattr(cache, '_data', type(cache._data)())
+    return fake_db
+
+
+@pytest.fixture
+def client(db):
+    app = Flask(__name__)
+    report_endpoints.register_report_endpoints(app)
+    return app.test_client()
+
+
+def _stored_ai_report(generated_at=datetime(2024, 1, 1, tzinfo=timezone.utc)):
+    return {'ai_report': {'executive_summary': {'key_findings': ['k']}}, 'generated_at': generated_at}
+
+
+# ---------------------------------------------------------------------------
+# Report caches
+# ---------------------------------------------------------------------------
+
+def test_report_json_body_is_served_from_cache(client, db):
+    db.reports['r1'] = {'_id': 'r1', 'title': 'Idea', 'created_at': datetime(2024, 1, 1)}
+
+    first = client.get('/api/report/r1')
+    second = client.get('/api/report/r1')
+
+    assert first.status_code == second.status_code == 200
+    assert first.get_json()['title'] == 'Idea'
+    assert second.get_data() == first.get_data()
+    assert db.count('get_report_by_id') == 1
+
+
+def test_missing_report_is_not_cached(client, db):
+    assert client.get('/api/report/missing').status_code == 404
+    assert client.get('/api/report/missing').status_code == 404
+    assert db.count('get_report_by_id') == 2
+
+
+def test_report_lookup_is_shared_across_endpoints(client, db, monkeypatch):
+    db.reports['r1'] = {'_id': 'r1', 'title': 'Idea'}
+    monkeypatch.setattr(report_endpoints, 'send_from_directory', lambda directory, name: 'page')
+
+    client.get('/report/r1')
+    client.get('/api/report/r1')
+
+    assert db.count('get_report_by_id') == 1
+
+
+def test_stored_ai_report_is_cached_in_process(client, db):
+    db.ai_reports['r1'] = _stored_ai_report()
+
+    for _ in range(3):
+        response = client.get('/api/report/r1/generate')
+        assert response.get_json()['cached'] is True
+
+    assert db.count('get_ai_report') == 1
+
+
+def test_generating_an_ai_report_invalidates_the_caches(client, db, monkeypatch):
+    db.reports['r1'] = {'_id': 'r1', 'title': 'Idea', 'evaluated_data': {
+        'Core Idea': {'Problem': {'Clarity': {'assigned_score': 70, 'strengths': ['s']}}}
+    }}
+    client.get('/api/report/r1')
+
+    class FakeWriter:
+        def __init__(self, progress_callback=None):
+            pass
+
+        def write_comprehensive_report(self, conversations, metadata):
+            return {'conversations': len(conversations)}
+
+    monkeypatch.setattr(report_endpoints, 'AIReportWriter', FakeWriter)
+
+    generated = client.get('/api/report/r1/generate').get_json()
+    assert generated['cached'] is False
+    assert generated['ai_report'] == {'conversations': 1}
+    assert report_endpoints._report_json_cache.get('r1') is None
+
+    cached = client.get('/api/report/r1/generate').get_json()
+    assert cached['cached'] is True
+    assert cached['ai_report'] == {'conversations': 1}
+
+
+# ---------------------------------------------------------------------------
+# Singleflight
+# ---------------------------------------------------------------------------
+
+def test_singleflight_runs_concurrent_calls_once():
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'report'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(report_endpoints._singleflight('k1', work)))
+    leader.start()
+    started.wait(5)
+    followers = [
+        threading.Thread(target=lambda: results.append(report_endpoints._singleflight('k1', work)))
+        for _ in range(3)
+    ]
+    for follower in followers:
+        follower.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ['report'] * 4
+    assert 'k1' not in report_endpoints._inflight
+
+
+def test_singleflight_shares_the_error_and_then_allows_a_retry():
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError('LLM down')
+
+    def call():
+        try:
+            report_endpoints._singleflight('k2', failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert errors == ['LLM down', 'LLM down']
+    assert report_endpoints._singleflight('k2', lambda: 'ok') == 'ok'
+
+
+def test_singleflight_leader_rechecks_for_a_report_saved_meanwhile(client, db, monkeypatch):
+    db.reports['r1'] = {'_id': 'r1', 'title': 'Idea', 'evaluated_data': {
+        'Core Idea': {'Problem': {'Clarity': {'assigned_score': 70, 'strengths': ['s']}}}
+    }}
+    writes = []
+
+    class FakeWriter:
+        def __init__(self, progress_callback=None):
+            pass
+
+        def write_comprehensive_report(self, conversations, metadata):
+            writes.append(1)
+            return {'conversations': len(conversations)}
+
+    monkeypatch.setattr(report_endpoints, 'AIReportWriter', FakeWriter)
+
+    # The first caller misses the cache, then stalls until the second has generated and saved
+    paused = threading.Event()
+    resume = threading.Event()
+    get_report = report_endpoints._get_report_cached
+
+    def stalled_get_report(db_manager, report_id):
+        if not paused.is_set():
+            paused.set()
+            resume.wait(5)
+        return get_report(db_manager, report_id)
+
+    monkeypatch.setattr(report_endpoints, '_get_report_cached', stalled_get_report)
+
+    results = {}
+    first = threading.Thread(target=lambda: results.setdefault(
+        'first', client.application.test_client().get('/api/report/r1/generate').get_json()))
+    first.start()
+    paused.wait(5)
+    results['second'] = client.get('/api/report/r1/generate').get_json()
+    resume.set()
+    first.join(5)
+
+    assert writes == [1]
+    assert results['second']['cached'] is False
+    assert results['first']['cached'] is True
+    assert results['first']['ai_report'] == results['second']['ai_report']
+
+
+# ---------------------------------------------------------------------------
+# Pagination
+# ---------------------------------------------------------------------------
+
+def test_user_reports_are_paginated(client, db):
+    body = client.get('/api/reports/u1?limit=2&offset=4').get_json()
+
+    assert db.calls[-1] == ('get_user_reports', 'u1', 2, 4)
+    assert body['offset'] == 4
+    assert body['limit'] == 2
+    assert body['count'] == len(body['reports']) == 2
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('', (10, 0)),
+    ('?limit=0&offset=-5', (1, 0)),
+    ('?limit=1000', (100, 0)),
+    ('?limit=abc&offset=xyz', (10, 0)),
+])
+def test_user_reports_clamp_limit_and_offset(client, db, query, expected):
+    client.get(f'/api/reports/u1{query}')
+
+    assert db.calls[-1][2:] == expected
+
+
+# ---------------------------------------------------------------------------
+# ETag / 304
+# ---------------------------------------------------------------------------
+
+def test_unchanged_ai_report_answers_304(client, db):
+    db.ai_reports['r1'] = _stored_ai_report()
+
+    first = client.get('/api/report/r1/generate')
+    etag = first.headers['ETag']
+    second = client.get('/api/report/r1/generate', headers={'If-None-Match': etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers['ETag'] == etag
+    assert second.get_data() == b''
+
+
+def test_regenerated_ai_report_gets_a_new_etag(client, db):
+    db.ai_reports['r1'] = _stored_ai_report()
+    etag = client.get('/api/report/r1/generate').headers['ETag']
+
+    db.ai_reports['r1'] = _stored_ai_report(datetime(2024, 3, 1, tzinfo=timezone.utc))
+    report_endpoints._ai_report_cache.pop('r1')
+    response = client.get('/api/report/r1/generate', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.get_json()['generated_at'] == '2024-03-01T00:00:00+00:00'
+
+
+# ---------------------------------------------------------------------------
+# SSE download progress
+# ---------------------------------------------------------------------------
+
+class _NoCallbackFuture(Future):
+    """A future whose done callbacks never run, as if on_pdf_done itself failed"""
+
+    def add_done_callback(self, fn):
+        pass
+
+
+class _FakePool:
+    def __init__(self, future):
+        self.future = future
+
+    def submit(self, fn, *args):
+        return self.future
+
+
+class _SilentQueue(queue.Queue):
+    """A progress queue that drops everything, as if the manager process died"""
+
+    def put(self, item, *args, **kwargs):
+        pass
+
+
+def _stream(client, monkeypatch, future, progress_queue=None, timeout=600):
+    monkeypatch.setattr(report_endpoints, 'SSE_HEARTBEAT_INTERVAL', 0.05)
+    monkeypatch.setattr(report_endpoints, 'SSE_PDF_TIMEOUT', timeout)
+    manager = types.SimpleNamespace(Queue=lambda: progress_queue or queue.Queue())
+    monkeypatch.setattr(report_endpoints, '_get_pdf_executor', lambda: (_FakePool(future), manager))
+    response = client.get('/api/report/r1/download')
+    try:
+        return response.get_data()
+    finally:
+        response.close()
+
+
+def test_sse_download_reports_completion(client, db, monkeypatch):
+    db.reports['r1'] = {'_id': 'r1', 'title': 'Idea'}
+    future = Future()
+    future.set_result(b'%PDF')
+
+    body = _stream(client, monkeypatch, future)
+
+    assert body.endswith(b'"complete":true}\n\n')
+    assert report_endpoints._pdf_cache.get('r1')[0] == b'%PDF'
+
+
+def test_sse_download_ends_when_the_job_finished_without_a_result(client, db, monkeypatch):
+    db.reports['r1'] = {'_id': 'r1', 'title': 'Idea'}
+    future = _NoCallbackFuture()
+    future.set_result(b'%PDF')
+
+    body = _stream(client, monkeypatch, future, progress_queue=_SilentQueue())
+
+    assert b'PDF generation ended without a result' in body
+    # on_pdf_done never ran, so its slot is still taken
+    report_endpoints._pdf_slots.release()
+
+
+def test_sse_download_times_out_with_heartbeats(client, db, monkeypatch):
+    db.reports['r1'] = {'_id': 'r1', 'title': 'Idea'}
+    slots = report_endpoints._pdf_slots._value
+
+    started = time.monotonic()
+    body = _stream(client, monkeypatch, Future(), timeout=0.3)
+
+    assert time.monotonic() - started < 5
+    assert b': heartbeat' in body
+    assert body.endswith(b'PDF generation timed out","progress":0,"error":true}\n\n')
+    # The unfinished job keeps its slot until it completes
+    assert report_endpoints._pdf_slots._value == slots - 1
+    report_endpoints._pdf_slots.release()
+
+
+@pytest.fixture
+def pdf_pool():
+    yield
+    executor, manager = report_endpoints._pdf_executor, report_endpoints._mp_manager
+    report_endpoints._pdf_executor = report_endpoints._mp_manager = None
+    if executor is not None:
+        executor.shutdown()
+        manager.shutdown()
+
+
+def test_sse_download_renders_in_worker_process(client, db, pdf_pool):
+    # No agent conversations, so the worker renders the stored analysis without an LLM call
+    db.reports['r1'] = {'_id': 'r1', 'title': 'Idea', 'detailed_analysis': {}}
+
+    body = client.get('/api/report/r1/download').get_data()
+    pdf = client.get('/api/report/r1/download-pdf-file')
+
+    assert b'"complete":true' in body
+    assert pdf.status_code == 200
+    assert pdf.get_data().startswith(b'%PDF')
+    assert db.count('get_report_by_id') == 1
+
+
+def _booted():
+    return getattr(sys.modules['__mp_main__'], 'BOOTED', False)
+
+
+def test_pdf_workers_do_not_rerun_the_main_script(pdf_pool, monkeypatch, tmp_path):
+    # Stand in for `python app/app_v3.py`: a main script that must boot only in the parent
+    script = tmp_path / 'server.py'
+    script.write_text('BOOTED = True\n')
+    main = types.ModuleType('__main__')
+    main.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, '__main__', main)
+
+    executor, _ = report_endpoints._get_pdf_executor()
+    with report_endpoints.pdf_worker.main_script_hidden():
+        booted = executor.submit(_booted).result(timeout=60)
+
+    assert booted is False
+
+
+# ---------------------------------------------------------------------------
+# Direct download
+# ---------------------------------------------------------------------------
+
+def test_direct_download_renders_on_the_request_thread(client, db):
+    db.reports['r1'] = {'_id': 'r1', 'title': 'Idea', 'detailed_analysis': {}}
+    slots = report_endpoints._pdf_slots._value
+
+    response = client.get('/api/report/r1/download-pdf-file')
+
+    assert response.status_code == 200
+    assert response.get_data().startswith(b'%PDF')
+    assert report_endpoints._pdf_slots._value == slots
+
+
+def test_direct_download_is_refused_when_all_slots_are_taken(client, db):
+    db.reports['r1'] = {'_id': 'r1', 'title': 'Idea', 'detailed_analysis': {}}
+    taken = 0
+    while report_endpoints._pdf_slots.acquire(blocking=False):
+        taken += 1
+
+    try:
+        response = client.get('/api/report/r1/download-pdf-file')
+    finally:
+        for _ in range(taken):
+            report_endpoints._pdf_slots.release()
+
+    assert taken == report_endpoints.PDF_MAX_PENDING
+    assert response.status_code == 503
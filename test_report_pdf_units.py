@@ -0,0 +1,223 @@
+"""
+Unit tests for report_pdf_generator
+Run with: python -m pytest -q test_report_pdf_units.py
+"""
+
+import os
+import sys
+import threading
+import zlib
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pdf_worker
+import report_pdf_generator
+from report_pdf_generator import _bullet_text, _escape_strings, _story_data, _truncate_markup
+
+
+def _report(**detailed_analysis):
+    return {
+        '_id': 'r1',
+        'title': 'Fish & Chips <Express>',
+        'overall_score': 72,
+        'validation_outcome': 'GOOD & <promising>',
+        'raw_validation_result': {'evaluated_data': {'blob': '<not rendered>'}},
+        'detailed_analysis': detailed_analysis,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Escaping
+# ---------------------------------------------------------------------------
+
+def test_escape_strings_escapes_nested_text_only():
+    data = {'a': 'x < y & z', 'b': [1, 'tom & jerry', ('<b>',)], 'c': {'d': None, 'e': 2.5}}
+
+    assert _escape_strings(data) == {
+        'a': 'x &lt; y &amp; z',
+        'b': [1, 'tom &amp; jerry', ['&lt;b&gt;']],
+        'c': {'d': None, 'e': 2.5},
+    }
+    assert data['a'] == 'x < y & z'
+
+
+def test_story_data_escapes_only_rendered_sections():
+    report = _report(
+        executive_summary={'summary_points': ['<b>bold</b>']},
+        next_steps=['R&D'],
+        evaluated_data={'big': '<raw>'},
+    )
+
+    story_data = _story_data(report)
+
+    assert set(story_data) == {'overall_score', 'validation_outcome', 'detailed_analysis'}
+    assert story_data['validation_outcome'] == 'GOOD &amp; &lt;promising&gt;'
+    assert story_data['detailed_analysis'] == {
+        'executive_summary': {'summary_points': ['&lt;b&gt;bold&lt;/b&gt;']},
+        'next_steps': ['R&amp;D'],
+    }
+    assert report['detailed_analysis']['next_steps'] == ['R&D']
+
+
+def test_story_data_tolerates_missing_analysis():
+    assert _story_data({'title': 'x'}) == {'detailed_analysis': {}}
+    assert _story_data({'detailed_analysis': None}) == {'detailed_analysis': {}}
+
+
+# ---------------------------------------------------------------------------
+# Truncation
+# ---------------------------------------------------------------------------
+
+def test_truncate_markup_keeps_short_text():
+    assert _truncate_markup('short', 10) == ('short', False)
+    assert _truncate_markup('exactly10!', 10) == ('exactly10!', False)
+
+
+def test_truncate_markup_counts_entities_as_one_character():
+    text = _escape_strings('a&b<c>d')
+
+    assert _truncate_markup(text, 3) == ('a&amp;b', True)
+    assert _truncate_markup(text, 4) == ('a&amp;b&lt;', True)
+    assert _truncate_markup(text, 7) == (text, False)
+
+
+def test_truncate_markup_never_splits_an_entity():
+    text = _escape_strings('&' * 5)
+
+    for limit in range(6):
+        cut, _ = _truncate_markup(text, limit)
+        assert cut == '&amp;' * limit
+
+
+def test_bullet_text_joins_escaped_items():
+    assert _bullet_text(['a &amp; b', 'c']) == '• a &amp; b<br/>• c'
+    assert _bullet_text(['x'], prefix='  → ') == '  → x'
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def test_report_with_markup_characters_renders(monkeypatch):
+    def fail(self, error_message):
+        raise AssertionError(f'fell back to the error PDF: {error_message}')
+
+    monkeypatch.setattr(report_pdf_generator.ReportPDFGenerator, '_create_error_pdf', fail)
+
+    long_explanation = 'R&D <heavy> ' * 40
+    report = _report(
+        executive_summary={'summary_points': ['Profit & loss <b>unclosed']},
+        cluster_analyses={'Core Idea': {'score': 70, 'parameters': {'strong': [
+            {'name': 'A & B', 'score': 85, 'explanation': long_explanation, 'strengths': ['<i>x']}
+        ]}}},
+        next_steps=['Check <this> & that'],
+    )
+
+    # Uncompressed, so the text drawn on each page can be checked in the output
+    pdf = report_pdf_generator.generate_report_pdf_bytes(report, compression_level=0)
+
+    assert pdf.startswith(b'%PDF')
+    assert b'unclosed' in pdf
+    assert b'Data unavailable' not in pdf
+    assert b'that' in pdf
+    # 150 visible characters of the explanation: 12 whole repeats, then the cut
+    assert pdf.count(b'heavy') == 12
+    assert b'(h...)' in pdf
+
+
+# ---------------------------------------------------------------------------
+# Compression level
+# ---------------------------------------------------------------------------
+
+def _encode(data):
+    from reportlab.pdfbase.pdfdoc import PDFStreamFilterZCompress
+
+    return PDFStreamFilterZCompress().encode(data)
+
+
+def test_build_settings_sets_the_zlib_level_for_this_thread_only():
+    report_pdf_generator._get_generator()  # installs the encode wrapper
+    data = b'BT /F1 12 Tf (stream text) Tj ET\n' * 200
+    default = _encode(data)
+    other_thread = []
+
+    with report_pdf_generator._build_settings(1):
+        fast = _encode(data)
+        thread = threading.Thread(target=lambda: other_thread.append(_encode(data)))
+        thread.start()
+        thread.join()
+        with report_pdf_generator._build_settings(9):
+            assert _encode(data) == zlib.compress(data, 9)
+        assert _encode(data) == fast
+
+    assert fast == zlib.compress(data, 1)
+    assert other_thread == [default]
+    assert _encode(data) == default
+    assert report_pdf_generator._compress_stream.__wrapped__(None, data) == default
+
+
+def test_compression_level_zero_writes_uncompressed_pages():
+    report = _report(next_steps=['Interview ten farmers'] * 40)
+
+    plain = report_pdf_generator.generate_report_pdf_bytes(report, compression_level=0)
+    fast = report_pdf_generator.generate_report_pdf_bytes(report, compression_level=1)
+    default = report_pdf_generator.generate_report_pdf_bytes(report)
+
+    assert b'Interview ten farmers' in plain
+    assert b'/FlateDecode' not in plain
+    assert b'Interview ten farmers' not in fast
+    assert len(plain) > len(fast) >= len(default)
+
+
+# ---------------------------------------------------------------------------
+# HTML template
+# ---------------------------------------------------------------------------
+
+def test_html_template_escapes_report_text():
+    pytest.importorskip('jinja2')
+    report = _report(
+        executive_summary={'summary_points': ['margin < cost & falling']},
+        next_steps=['<script>alert(1)</script>'],
+    )
+
+    html = report_pdf_generator.render_report_html(report)
+
+    assert 'Fish &amp; Chips &lt;Express&gt;' in html
+    assert 'margin &lt; cost &amp; falling' in html
+    assert '&lt;script&gt;alert(1)&lt;/script&gt;' in html
+    assert '<script>' not in html
+    assert '<Express>' not in html
+
+
+# ---------------------------------------------------------------------------
+# Batch rendering
+# ---------------------------------------------------------------------------
+
+def test_batch_renders_in_order_on_the_worker_context(monkeypatch):
+    pools = []
+    create_pool = pdf_worker.create_pool
+
+    def recording_create_pool(max_workers, **kwargs):
+        pool = create_pool(max_workers, **kwargs)
+        pools.append(pool)
+        return pool
+
+    monkeypatch.setattr(pdf_worker, 'create_pool', recording_create_pool)
+    reports = [_report(next_steps=[f'step number {i}']) for i in range(3)]
+
+    pdfs = report_pdf_generator.generate_report_pdfs(reports, max_workers=2, compression_level=0)
+
+    (pool,) = pools
+    assert pool._mp_context.get_start_method() == pdf_worker.get_mp_context().get_start_method() != 'fork'
+    assert len(pdfs) == 3
+    for i, pdf in enumerate(pdfs):
+        assert pdf.startswith(b'%PDF')
+        assert f'step number {i}'.encode() in pdf
+
+
+def test_batch_of_nothing_starts_no_workers(monkeypatch):
+    monkeypatch.setattr(pdf_worker, 'create_pool', None)
+
+    assert report_pdf_generator.generate_report_pdfs([]) == []
@@ -0,0 +1,501 @@
+"""
+Unit tests for the LLM section writers in pdf_report_system.report_writer,
+with the LLM faked out
+Run with: python -m pytest -q test_report_writer_units.py
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from pdf_report_system import report_writer
+from pdf_report_system.report_writer import AIReportWriter, AgentConv, _BatchCollector
+
+
+METADATA = {'title': 'Smart Farming', 'validation_outcome': 'GOOD', 'overall_score': 61.0}
+
+
+class FakeDiskCache:
+    """dict-backed stand-in for diskcache.Cache"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, expire=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class FakeSemanticCache:
+    """Exact-match stand-in for SemanticCache that records what it is asked"""
+
+    def __init__(self):
+        self.entries = {}
+        self.lookups = []
+
+    async def lookup(self, prompt, namespace, scope=None):
+        self.lookups.append((prompt, namespace, scope))
+        return self.entries.get((prompt, namespace, scope or '')), [0.1, 0.2]
+
+    async def store(self, prompt, namespace, embedding, content, ttl=86400, scope=None):
+        self.entries[(prompt, namespace, scope or '')] = content
+
+
+def _conversations(clusters=('Core Idea', 'Team')):
+    return [
+        {
+            'cluster': cluster, 'parameter': 'P', 'sub_parameter': f'{cluster} {i}', 'score': score,
+            'explanation': 'e', 'strengths': [f'strength {i}'], 'weaknesses': [f'weakness {i}'],
+            'key_insights': ['insight'], 'recommendations': ['rec'], 'risk_factors': ['risk'],
+            'assumptions': [], 'agent_id': ''
+        }
+        for cluster in clusters
+        for i, score in enumerate((80, 40))
+    ]
+
+
+def _cluster_reply(names, score=70):
+    return json.dumps({
+        name: {'overview': ['o'], 'parameters': [{'name': 'p', 'score': score}], 'cluster_summary': ['s']}
+        for name in names
+    })
+
+
+def _writer(replies, disk_cache=None, semantic_cache=None):
+    """Writer whose LLM answers each call with the next item of `replies`"""
+    writer = AIReportWriter(semantic_cache=semantic_cache)
+    writer._disk_cache = disk_cache
+    writer.prompts = []
+    replies = iter(replies)
+
+    async def fake_ainvoke(prompt, section, max_tokens=None):
+        writer.prompts.append(prompt)
+        return SimpleNamespace(content=next(replies))
+
+    writer._ainvoke = fake_ainvoke
+    return writer
+
+
+def _write_clusters(writer, clusters=('Core Idea', 'Team')):
+    batch = writer._group_by_cluster(_conversations(clusters))
+    return asyncio.run(writer._write_cluster_batch(batch, METADATA))
+
+
+def _write_combined(writer):
+    conversations = _conversations()
+    stats = writer._aggregate_conversations([AgentConv.from_dict(c) for c in conversations])
+    return asyncio.run(writer._write_combined_analysis({}, stats, METADATA))
+
+
+# ---------------------------------------------------------------------------
+# Section fan-out and progress
+# ---------------------------------------------------------------------------
+
+def _fan_out_writer(progress):
+    """Writer whose fake LLM logs when each section call starts and ends"""
+    writer = AIReportWriter(progress_callback=lambda message, value: progress.append(value),
+                            use_prompt_cache=False, cluster_batch_size=1)
+    writer.events = []
+
+    async def fake_ainvoke(prompt, section, max_tokens=None):
+        writer.events.append(('start', section))
+        await asyncio.sleep(0.01)
+        writer.events.append(('end', section))
+        if section == 'cluster_report':
+            return SimpleNamespace(content=_cluster_reply(re.findall(r'### CLUSTER: (.+)', prompt)))
+        return SimpleNamespace(content='{}')
+
+    writer._ainvoke = fake_ainvoke
+    return writer
+
+
+def test_independent_sections_are_written_concurrently():
+    writer = _fan_out_writer([])
+
+    report = writer.write_comprehensive_report(_conversations(('Core Idea', 'Team', 'Market')), METADATA)
+
+    first_end = writer.events.index(next(e for e in writer.events if e[0] == 'end'))
+    assert sorted(section for _, section in writer.events[:first_end]) == [
+        'cluster_report', 'cluster_report', 'cluster_report', 'market_analysis', 'trl_analysis'
+    ]
+    # The combined analysis waits for the clusters, the conclusion for market and TRL
+    assert writer.events.index(('start', 'combined_analysis')) > max(
+        i for i, event in enumerate(writer.events) if event == ('end', 'cluster_report'))
+    assert writer.events.index(('start', 'conclusion')) > max(
+        writer.events.index(('end', 'market_analysis')), writer.events.index(('end', 'trl_analysis')))
+    assert list(report['cluster_reports']) == ['Core Idea', 'Team', 'Market']
+
+
+def test_progress_counts_every_section_once():
+    progress = []
+    writer = _fan_out_writer(progress)
+
+    writer.write_comprehensive_report(_conversations(('Core Idea', 'Team', 'Market')), METADATA)
+
+    assert writer._total_steps == 5 + 3
+    assert writer._current_step == writer._total_steps
+    assert progress == sorted(progress)
+    assert progress[-2:] == [100, 100]
+
+
+# ---------------------------------------------------------------------------
+# Batched cluster parsing and fallbacks
+# ---------------------------------------------------------------------------
+
+def test_cluster_batch_parses_each_cluster():
+    reports = _write_clusters(_writer([_cluster_reply(['Core Idea', 'Team'], score=64)]))
+
+    assert list(reports) == ['Core Idea', 'Team']
+    for name, report in reports.items():
+        assert report['cluster_name'] == name
+        assert report['cluster_score'] == 64
+        assert report['overview'] == ['o']
+
+
+@pytest.mark.parametrize('reply', ['[1, 2]', '"text"', '42', 'not json at all'])
+def test_cluster_batch_falls_back_when_reply_is_not_an_object(reply):
+    reports = _write_clusters(_writer([reply]))
+
+    for name, report in reports.items():
+        assert report['overview'] == ['Analysis based on 2 expert evaluations']
+        assert report['cluster_score'] == 60
+
+
+def test_cluster_batch_falls_back_per_malformed_cluster():
+    reply = json.dumps({
+        'Core Idea': ['not', 'a', 'report'],
+        'Team': {'parameters': ['junk', {'name': 'a', 'score': '7'}, {'name': 'b', 'score': 50}]},
+    })
+
+    reports = _write_clusters(_writer([reply]))
+
+    assert reports['Core Idea']['overview'] == ['Analysis based on 2 expert evaluations']
+    assert [p['name'] for p in reports['Team']['parameters']] == ['a', 'b']
+    assert reports['Team']['cluster_score'] == 50
+
+
+# ---------------------------------------------------------------------------
+# Combined analysis
+# ---------------------------------------------------------------------------
+
+def test_combined_analysis_uses_each_section_from_reply():
+    reply = json.dumps({
+        'executive_summary': {'key_findings': ['k']},
+        'pros_cons': {'advantages': ['a']},
+        'weaknesses_analysis': {'critical': []},
+    })
+
+    combined = _write_combined(_writer([reply]))
+
+    assert combined['executive_summary']['key_findings'] == ['k']
+    assert combined['executive_summary']['outcome'] == 'GOOD'
+    assert combined['pros_cons'] == {'advantages': ['a']}
+    assert combined['weaknesses_analysis'] == {'critical': []}
+
+
+@pytest.mark.parametrize('reply', ['[]', '7', '{"truncated": '])
+def test_combined_analysis_falls_back_on_all_sections(reply):
+    writer = _writer([reply])
+    fallback = _write_combined(_writer(['{}']))
+
+    combined = _write_combined(writer)
+
+    assert combined == fallback
+
+
+def test_combined_analysis_falls_back_per_missing_section():
+    reply = json.dumps({'executive_summary': {'key_findings': ['k']}, 'pros_cons': ['bad']})
+    fallback = _write_combined(_writer(['{}']))
+
+    combined = _write_combined(_writer([reply]))
+
+    assert combined['executive_summary']['key_findings'] == ['k']
+    assert combined['pros_cons'] == fallback['pros_cons']
+    assert combined['weaknesses_analysis'] == fallback['weaknesses_analysis']
+
+
+# ---------------------------------------------------------------------------
+# Prompt caches
+# ---------------------------------------------------------------------------
+
+def test_disk_cache_replays_a_valid_response():
+    disk_cache = FakeDiskCache()
+    reply = '{"tam": {"size": "1B"}}'
+
+    first = _writer([reply], disk_cache=disk_cache)
+    asyncio.run(first._write_market_analysis(_conversations(), METADATA))
+    second = _writer([], disk_cache=disk_cache)
+    analysis = asyncio.run(second._write_market_analysis(_conversations(), METADATA))
+
+    assert analysis == {'tam': {'size': '1B'}}
+    assert second.prompts == []
+
+
+@pytest.mark.parametrize('reply', ['{"tam": ', '["tam"]'])
+def test_disk_cache_skips_unusable_responses(reply):
+    disk_cache = FakeDiskCache()
+
+    writer = _writer([reply], disk_cache=disk_cache)
+
+    analysis = asyncio.run(writer._write_market_analysis(_conversations(), METADATA))
+
+    assert analysis == writer._create_fallback_market_analysis(METADATA)
+    assert disk_cache.data == {}
+
+
+def test_partial_cluster_batch_is_not_cached():
+    disk_cache = FakeDiskCache()
+
+    reports = _write_clusters(_writer([_cluster_reply(['Core Idea'])], disk_cache=disk_cache))
+
+    assert reports['Core Idea']['cluster_score'] == 70
+    assert reports['Team']['overview'] == ['Analysis based on 2 expert evaluations']
+    assert disk_cache.data == {}
+
+
+@pytest.fixture
+def prompt_cache(monkeypatch):
+    monkeypatch.setattr(report_writer, '_prompt_cache', None)
+    yield
+    if report_writer._prompt_cache is not None:
+        report_writer._prompt_cache.close()
+
+
+def test_disk_cache_is_opt_in(prompt_cache, monkeypatch):
+    monkeypatch.delenv('REPORT_CACHE_DIR', raising=False)
+
+    assert AIReportWriter()._disk_cache is None
+
+
+def test_disk_cache_is_shared_by_all_writers(prompt_cache, monkeypatch, tmp_path):
+    pytest.importorskip('diskcache')
+    monkeypatch.setenv('REPORT_CACHE_DIR', str(tmp_path))
+
+    writers = [AIReportWriter() for _ in range(3)]
+
+    assert writers[0]._disk_cache is not None
+    assert all(writer._disk_cache is writers[0]._disk_cache for writer in writers)
+    assert AIReportWriter(use_prompt_cache=False)._disk_cache is None
+
+
+def test_prompt_cache_key_does_not_build_the_llm_clients():
+    writer = AIReportWriter()
+
+    main_key = writer._prompt_cache_key('prompt', 'market_analysis', 100)
+    cheap_key = writer._prompt_cache_key('prompt', 'conclusion', 100)
+
+    assert main_key != cheap_key
+    assert writer._llm is None and writer._llm_cheap is None
+
+
+def test_semantic_cache_embeds_report_data_scoped_by_idea():
+    semantic_cache = FakeSemanticCache()
+    writer = _writer(['{"tam": {"size": "1B"}}'], semantic_cache=semantic_cache)
+
+    asyncio.run(writer._write_market_analysis(_conversations(), METADATA))
+
+    (prompt, namespace, scope), = semantic_cache.lookups
+    assert namespace == 'market_analysis'
+    assert scope == 'Smart Farming'
+    assert writer.prompts[0].endswith(prompt)
+    assert not prompt.startswith('You are a market analyst')
+    assert list(semantic_cache.entries.values()) == ['{"tam": {"size": "1B"}}']
+
+
+def test_semantic_cache_does_not_store_invalid_json():
+    semantic_cache = FakeSemanticCache()
+
+    asyncio.run(_writer(['{"tam": '], semantic_cache=semantic_cache)._write_market_analysis(_conversations(), METADATA))
+
+    assert semantic_cache.entries == {}
+
+
+def test_semantic_cache_hit_is_not_shared_across_ideas():
+    semantic_cache = FakeSemanticCache()
+    prompt = 'same report data'
+
+    def invoke(writer, scope):
+        return asyncio.run(writer._cached_invoke(prompt, section='market_analysis', scope=scope))
+
+    invoke(_writer(['{"tam": {"size": "1B"}}'], semantic_cache=semantic_cache), 'Smart Farming')
+    same_idea = _writer([], semantic_cache=semantic_cache)
+    cached = invoke(same_idea, 'Smart Farming')
+    other_idea = _writer(['{"tam": {"size": "2B"}}'], semantic_cache=semantic_cache)
+    fresh = invoke(other_idea, 'Other idea')
+
+    assert (cached, same_idea.prompts) == ({'tam': {'size': '1B'}}, [])
+    assert (fresh, other_idea.prompts) == ({'tam': {'size': '2B'}}, [prompt])
+
+
+# ---------------------------------------------------------------------------
+# Retries and fallbacks
+# ---------------------------------------------------------------------------
+
+class FlakyLLM:
+    """Chat model stand-in that raises each of `errors` in turn, then answers `reply`"""
+
+    model_name = 'fake'
+    temperature = 0
+
+    def __init__(self, errors, reply='{"tam": {"size": "1B"}}'):
+        self.errors = list(errors)
+        self.reply = reply
+        self.calls = 0
+
+    def bind(self, **kwargs):
+        return self
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return SimpleNamespace(content=self.reply)
+
+
+def _rate_limit_error():
+    import httpx
+    from openai import RateLimitError
+
+    request = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+    return RateLimitError('rate limited', response=httpx.Response(429, request=request), body=None)
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    import tenacity
+
+    monkeypatch.setattr(tenacity, 'wait_exponential', lambda **kwargs: tenacity.wait_none())
+
+
+def _market_analysis(llm, max_retries=3):
+    writer = AIReportWriter(max_retries=max_retries, use_prompt_cache=False)
+    writer.llm = writer.llm_cheap = llm
+
+    async def run():
+        writer._semaphore = asyncio.Semaphore(1)
+        return await writer._write_market_analysis(_conversations(), METADATA)
+
+    return writer, asyncio.run(run())
+
+
+def test_rate_limited_call_is_retried(no_backoff):
+    llm = FlakyLLM([_rate_limit_error(), _rate_limit_error()])
+
+    _, analysis = _market_analysis(llm)
+
+    assert analysis == {'tam': {'size': '1B'}}
+    assert llm.calls == 3
+
+
+def test_section_falls_back_once_retries_are_exhausted(no_backoff):
+    llm = FlakyLLM([_rate_limit_error()] * 3)
+
+    writer, analysis = _market_analysis(llm)
+
+    assert analysis == writer._create_fallback_market_analysis(METADATA)
+    assert llm.calls == 3
+
+
+def test_non_retryable_error_falls_back_immediately(no_backoff):
+    llm = FlakyLLM([ValueError('bad request')])
+
+    writer, analysis = _market_analysis(llm)
+
+    assert analysis == writer._create_fallback_market_analysis(METADATA)
+    assert llm.calls == 1
+
+
+def test_openai_client_does_not_retry_on_its_own(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+    writer = AIReportWriter()
+
+    assert writer.llm.max_retries == 0
+    assert writer.llm_cheap.max_retries == 0
+
+
+# ---------------------------------------------------------------------------
+# Investment decision
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize('score, decision', [
+    (0, 'NO - NOT RECOMMENDED'),
+    (49.9, 'NO - NOT RECOMMENDED'),
+    (50, 'MAYBE'),
+    (64.9, 'MAYBE'),
+    (65, 'YES WITH CONDITIONS'),
+    (74.9, 'YES WITH CONDITIONS'),
+    (75, 'STRONG YES'),
+    (100, 'STRONG YES'),
+])
+def test_investment_decision_bands(score, decision):
+    assert AIReportWriter(use_prompt_cache=False)._get_investment_decision(score).startswith(decision + ' - ')
+
+
+# ---------------------------------------------------------------------------
+# Batch API
+# ---------------------------------------------------------------------------
+
+def test_batch_collector_submits_one_job_per_model():
+    jobs = []
+
+    def submit(requests):
+        jobs.append(sorted(body['model'] for body in requests.values()))
+        return {custom_id: f"{body['model']} reply" for custom_id, body in requests.items()}
+
+    async def run():
+        collector = _BatchCollector(submit, window=0.01)
+        futures = [collector.submit(section, {'model': model})
+                   for section, model in (('a', 'main'), ('b', 'cheap'), ('c', 'main'))]
+        results = await asyncio.gather(*futures)
+        await asyncio.sleep(0)
+        return collector, results
+
+    collector, results = asyncio.run(run())
+
+    assert results == ['main reply', 'cheap reply', 'main reply']
+    assert sorted(jobs) == [['cheap'], ['main', 'main']]
+    assert collector._tasks == set()
+
+
+class FakeBatchClient:
+    """OpenAI client stand-in whose batch job never leaves in_progress"""
+
+    def __init__(self):
+        self.cancelled = []
+        self.files = SimpleNamespace(create=lambda **kwargs: SimpleNamespace(id='file-1'))
+        self.batches = SimpleNamespace(
+            create=lambda **kwargs: SimpleNamespace(id='batch-1', status='in_progress'),
+            retrieve=lambda batch_id: SimpleNamespace(id=batch_id, status='in_progress'),
+            cancel=self.cancelled.append,
+        )
+
+
+def test_batch_job_is_cancelled_after_the_timeout(monkeypatch):
+    import openai
+
+    client = FakeBatchClient()
+    monkeypatch.setattr(openai, 'OpenAI', lambda: client)
+    writer = AIReportWriter(use_batch_api=True, batch_poll_interval=0.01, batch_timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        writer._run_openai_batch({'market_analysis-1': {'model': 'fake'}})
+
+    assert client.cancelled == ['batch-1']
+
+
+def test_batch_timeout_defaults_from_env(monkeypatch):
+    monkeypatch.setenv('REPORT_BATCH_TIMEOUT', '120')
+
+    assert AIReportWriter(use_batch_api=True).batch_timeout == 120